@@ -0,0 +1,97 @@
+# Headless batch runner for the Trader Network model (no Solara / visualisation)
+
+# Run by Typing "python main.py --num_nodes 1000 --steps 500 --output data/run.csv" into the terminal
+# or "python main.py --sweep sweep.json --output data/sweep.csv" for a parallel parameter sweep
+# or "python main.py --replicas 100 --num_nodes 100 --steps 500" for a lockstep Monte Carlo ensemble
+
+import argparse
+import json
+from test_src.runner.headless import (
+    load_params,
+    run,
+    run_ensemble
+)
+from test_src.model.topology import (
+    TOPOLOGIES
+)
+from test_src.runner.sweep import (
+    tasks_from_config,
+    run_sweep
+)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Trader Network model headless and save its DataCollector output.")
+    parser.add_argument("--config", help="JSON file with model parameters (command-line flags override it)")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--start_price", type=float)
+    parser.add_argument("--volatility", type=float)
+    parser.add_argument("--generocity_rate", type=float)
+    parser.add_argument("--num_nodes", type=int)
+    parser.add_argument("--avg_node_degree", type=float)
+    parser.add_argument("--topology", choices=list(TOPOLOGIES), help="Network generator (extra parameters go in topology_params in --config)")
+    parser.add_argument("--steps", type=int)
+    parser.add_argument("--price_feed", help="Kline CSV (e.g. data/BTCUSDT_kline_1h_bt=180d.csv) replayed instead of GBM prices")
+    parser.add_argument("--barrier_mode", choices=["close", "ohlc"], help="With --price_feed, 'ohlc' checks the trade barriers against each bar's high/low")
+    parser.add_argument("--barrier_tie", choices=["open", "up", "down"], help="Barrier taken when one bar touches both (default: nearest to the open)")
+    parser.add_argument("--engine", choices=["agents", "vectorised"])
+    parser.add_argument("--update", choices=["simultaneous", "sequential"], help="Update semantics of the vectorised engine")
+    parser.add_argument("--output", help="Output file (default data/headless_run.csv, or data/sweep_results.csv for --sweep)")
+    parser.add_argument("--sweep", help="JSON sweep config with a 'grid' or 'random' design, run across a process pool")
+    parser.add_argument("--workers", type=int, help="Number of worker processes for --sweep (default: all cores)")
+    parser.add_argument("--replicas", type=int, help="Run this many seeds (spawned from --seed) in lockstep as one ensemble (vectorised engine, random strategy)")
+    parser.add_argument("--event_level", choices=["off", "debug", "info", "warning"], help="Record agent events: debug (trades), info (transfers), warning (bankruptcies)")
+    parser.add_argument("--events", help="File the recorded events are written to (.bin for raw binary records, NDJSON otherwise)")
+    parser.add_argument("--record_every", type=int, help="Record every agent's capital, win_rate and state every N steps")
+    parser.add_argument("--record_dtype", choices=["float64", "float32", "float16"], help="dtype of the recorded capital/win_rate")
+    parser.add_argument("--record_path", help="Directory the per-agent history is memory-mapped to (.npy per field)")
+    parser.add_argument("--checkpoint_every", type=int, help="Save a checkpoint every N steps")
+    parser.add_argument("--checkpoint_path", help="Checkpoint directory (default data/checkpoint)")
+    parser.add_argument("--resume", help="Checkpoint directory to continue a run from (up to --steps in total)")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    # Parameter sweep
+    if args.sweep is not None:
+        with open(args.sweep) as f:
+            tasks = tasks_from_config(json.load(f))
+        output = args.output or "data/sweep_results.csv"
+
+        wall_time = run_sweep(tasks, output, max_workers=args.workers)
+        print(f"Ran {len(tasks)} tasks in {wall_time:.3f}s ({len(tasks) / wall_time:.2f} tasks/s)")
+        print(f"Saved sweep results to {output}")
+        return
+
+    overrides = {name: value for name, value in vars(args).items() if name not in ("config", "output", "events", "sweep", "workers", "replicas")}
+    params = load_params(args.config, overrides)
+
+    # Lockstep ensemble of replicas
+    if args.replicas is not None:
+        output = args.output or "data/ensemble_results.csv"
+        summary = run_ensemble(params, args.replicas, output_path=output)
+        print(f"Built {args.replicas} replicas in {summary['build_time']:.3f}s")
+        print(f"Ran {summary['steps']} steps in {summary['wall_time']:.3f}s ({summary['steps_per_second']:.1f} steps/s)")
+        print(f"Saved ensemble results to {output}")
+        return
+
+    # Single run
+    if params.get("checkpoint_every") is not None:
+        params.setdefault("checkpoint_path", "data/checkpoint")
+    output = args.output or "data/headless_run.csv"
+
+    summary = run(params, output_path=output, events_path=args.events)
+
+    print(f"Built model with {summary['model'].network.csr.num_nodes} nodes in {summary['build_time']:.3f}s")
+    print(f"Ran {summary['steps']} steps in {summary['wall_time']:.3f}s ({summary['steps_per_second']:.1f} steps/s)")
+    print(f"Saved model data to {output}")
+    if args.events is not None:
+        print(f"Saved events to {args.events}")
+    if args.record_path is not None:
+        print(f"Saved agent history to {args.record_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,4 @@
 from mesa.discrete_space import FixedAgent
-import random
 from enum import Enum
 
 
@@ -9,54 +8,56 @@ class TraderState(Enum):
     HAS_CAPITAL = 1
 
 # Very basic strategy that just randomly chooses True (Buy Signal) or False (Sell Signal)
-def trader_strategy(price: float):
-    return random.choice([True, False])
+# from a uniform draw of the model's random streams
+def trader_strategy(price: float, draw: float):
+    return draw < 0.5
 
 
 class TraderAgent(FixedAgent):
     def __init__(self, model, capital, strategy, win_rate, market_prices, generocity_rate, cell):
         super().__init__(model)
+        self.index = self.unique_id - 1  # Row of the agent in the model's random streams
         self.capital = capital
         self.strategy = strategy  # Callable strategy function
         self.win_rate = win_rate  # Float (0 to 1)
-        self.market_prices = market_prices
-        self.price_memory = self.market_prices[0]
         self.generocity_rate = generocity_rate
         self.cell = cell
         self.state = TraderState.HAS_CAPITAL if capital > 0 else TraderState.ZERO_CAPITAL
 
+    @property
+    def market_prices(self):
+        # Zero-copy view of the remaining market prices, starting at the current market date
+        return self.model.prices[self.model.market_date:]
+
+    @property
+    def price_memory(self):
+        return self.model.prices[self.model.market_date]
+
     def trade_action(self):
         """
         Executes a trade action based on strategy decision.
         """
         # Strategy decides Buy (True) or Sell (False)
-        decision = self.strategy(self.price_memory)
+        decision = self.strategy(self.price_memory, self.model.streams.uniform("strategy", self.index))
 
-        index = 0
-        continue_flag = True
+        # First remaining market price that crosses either barrier
+        index, hit_up = self.model.barrier.first_hit(self.price_memory*1.001, self.price_memory*0.0090, start=self.model.market_date)
 
-        while index < len(self.market_prices) and continue_flag:
+        if index >= 0:
+            price = self.model.barrier.prices[index]
             if decision:
-                if self.price_memory*1.001 <= self.market_prices[index]:
-                    self.capital += (self.market_prices[index] - self.price_memory)
+                if hit_up:
+                    self.capital += (price - self.price_memory)
                     self.win_rate += 1
-                    continue_flag = False
-
-                elif self.price_memory*0.0090 >= self.market_prices[index]:
-                    self.capital -= (self.price_memory - self.market_prices[index])
-                    continue_flag = False
+                else:
+                    self.capital -= (self.price_memory - price)
 
             else:
-                if self.price_memory*1.001 <= self.market_prices[index]:
-                    self.capital -= (self.market_prices[index] - self.price_memory)
-                    continue_flag = False
-
-                elif self.price_memory*0.0090 >= self.market_prices[index]:
-                    self.capital += (self.price_memory - self.market_prices[index])
+                if hit_up:
+                    self.capital -= (price - self.price_memory)
+                else:
+                    self.capital += (self.price_memory - price)
                     self.win_rate += 1
-                    continue_flag = False
-
-            index += 1
             
         # Update state
         self.state = TraderState.HAS_CAPITAL if self.capital > 0 else TraderState.ZERO_CAPITAL
@@ -73,15 +74,13 @@ class TraderAgent(FixedAgent):
                 successful_agent = agent
 
         if successful_agent is not None and successful_agent is not self:
-            if self.random.random() < self.generocity_rate:
+            if self.model.streams.uniform("sharing", self.index) < self.generocity_rate:
                 if self.capital <= 1:
                     successful_agent.capital += self.capital
                     self.capital -= self.capital
-                    print(f"Agent {self.unique_id} just gave {self.capital} capital to {successful_agent.unique_id} with winrate: {successful_agent.win_rate}.")
                 else:
                     successful_agent.capital += self.capital*0.01
                     self.capital -= self.capital*0.01
-                    print(f"Agent {self.unique_id} just gave {self.capital*0.01} capital to {successful_agent.unique_id} with winrate: {successful_agent.win_rate}.")
 
         self.state = TraderState.HAS_CAPITAL if self.capital > 0 else TraderState.ZERO_CAPITAL
             
@@ -110,8 +109,5 @@ class TraderAgent(FixedAgent):
         if self.state is TraderState.HAS_CAPITAL:
             self.try_to_share_capital()
 
-        # A debug print (optional, can be commented out)
-        print(f"Agent {self.unique_id}: Capital = {self.capital}, State = {self.state}, Price Memory = {self.price_memory}")
-
 
 
@@ -23,6 +23,11 @@ from mesa.visualization import (
 import solara
 from matplotlib.figure import Figure
 
+## Price Data Cache
+from src.data_gathering.price_cache import (
+    PRICE_CACHE
+)
+
 
 
 """[0] Setting Up Environment"""
@@ -66,20 +71,9 @@ class GatheringData:
         it only needs to be imported once"""
         if custom_env == 1:
             try:
-                # Load CSV data
-                price_data = pd.read_csv("data/BTCUSDT_kline_1h_bt=180d.csv")
-
-                # Convert timestamp column to datetime format
-                price_data["timestamp"] = pd.to_datetime(price_data["timestamp"])
-
-                # Set timestamp as index and rename it to "date" (required by mplfinance)
-                price_data.set_index("timestamp", inplace=True)
-                price_data.index.name = "date"  # This is what mplfinance requires
-
-                
-
-                # Return the price data as a DataFrame (filtered for the current timestep)
-                return price_data
+                # Loaded once per process (date-indexed, as mplfinance requires) and shared by every
+                # component and session; call PRICE_CACHE.invalidate() to reload it
+                return PRICE_CACHE.get("data/BTCUSDT_kline_1h_bt=180d.csv")
 
             except Exception as e:
                 print(f"Error loading price data: {e}")
@@ -224,7 +218,7 @@ class visuals:
 
         # Import Price data
         if model.steps == 0:
-            price_data = GatheringData.get_price_data(model).iloc[[model.steps]]
+            price_data = GatheringData.get_price_data(model).iloc[0:1]
         else:
             price_data = GatheringData.get_price_data(model).iloc[0:model.steps]
 
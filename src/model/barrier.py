@@ -0,0 +1,63 @@
+import numpy as np
+
+
+class BarrierIndex():
+    # Segment tree of running max/min over a fixed price path, used to find the first price
+    # that crosses a take-profit (up) or stop (down) barrier in O(log n)
+    def __init__(self, prices):
+        prices = np.asarray(prices, dtype=float)
+        self.length = len(prices)
+        self.capacity = 1
+        while self.capacity < self.length:
+            self.capacity *= 2
+
+        # Node i covers the leaves of its children 2i and 2i+1; empty leaves can never be crossed
+        self.max_tree = np.full(2 * self.capacity, -np.inf)
+        self.min_tree = np.full(2 * self.capacity, np.inf)
+        self.max_tree[self.capacity:self.capacity + self.length] = prices
+        self.min_tree[self.capacity:self.capacity + self.length] = prices
+        self.rebuild()
+
+    def __len__(self):
+        return self.length
+
+    @property
+    def prices(self):
+        return self.max_tree[self.capacity:self.capacity + self.length]
+
+    def rebuild(self):
+        # Computes every internal node, one level at a time
+        low = self.capacity // 2
+        while low >= 1:
+            high = 2 * low
+            self.max_tree[low:high] = np.maximum(self.max_tree[2*low:2*high:2], self.max_tree[2*low+1:2*high:2])
+            self.min_tree[low:high] = np.minimum(self.min_tree[2*low:2*high:2], self.min_tree[2*low+1:2*high:2])
+            low //= 2
+
+    def crosses(self, node, up, down):
+        return self.max_tree[node] >= up or self.min_tree[node] <= down
+
+    def first_hit(self, up, down, start=0):
+        """
+        Returns (index, hit_up) of the first price at or after start with price >= up or
+        price <= down, or (-1, False) if neither barrier is ever crossed.
+        """
+        if start >= self.length:
+            return -1, False
+
+        # Walk right from the start leaf until a node's range contains a crossing
+        node = self.capacity + start
+        while not self.crosses(node, up, down):
+            while node & 1:
+                node //= 2
+            if node == 0:
+                return -1, False
+            node += 1
+
+        # Descend to the leftmost crossing leaf
+        while node < self.capacity:
+            node = 2 * node if self.crosses(2 * node, up, down) else 2 * node + 1
+
+        # The take-profit barrier is checked first, so it wins a tie
+        index = node - self.capacity
+        return index, bool(self.max_tree[node] >= up)
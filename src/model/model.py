@@ -7,22 +7,31 @@ from src.model.network_space import (
     NetworkSpace
 )
 from src.agent.trader import (
-    TraderState
+    TraderState,
+    TraderAgent,
+    trader_strategy
+)
+from src.model.barrier import (
+    BarrierIndex
+)
+from src.model.random_streams import (
+    RandomStreams
 )
 
 # Helper function to generate random prices that follow a geometric brownian motion
-def generate_prices(start_price, num_days, volatility, drift=0):
+def generate_prices(start_price, num_days, volatility, drift=0, rng=None):
+  if rng is None:
+    rng = np.random.default_rng()
   dt = 1 / 252  # 252 trading day assumption
   sqrt_dt = np.sqrt(dt)
-  random_returns = np.random.normal(loc=0, scale=sqrt_dt, size=num_days)
+  random_returns = rng.normal(loc=0, scale=sqrt_dt, size=num_days)
   returns = (drift - 0.5 * volatility ** 2) * dt + volatility * random_returns
 
-  prices = np.zeros(num_days + 1)
-  prices[0] = start_price
-  for i in range(1, num_days + 1):
-    prices[i] = prices[i - 1] * np.exp(returns[i - 1])
-
-  return prices
+  # Compounded in one pass: the log-price path is the running sum of the returns
+  prices = np.empty(num_days + 1)
+  prices[0] = 0
+  np.cumsum(returns, out=prices[1:])
+  return start_price * np.exp(prices)
 
 
 
@@ -50,13 +59,18 @@ class TraderNetwork(Model):
     ):
         super().__init__(seed=seed)
         
-        self.prices = prices
+        self.prices = np.array(prices, dtype=float)
+        self.prices.flags.writeable = False  # Agents read the prices through views of this array
         self.market_date = 0 #simulating the date that we are going to use to iterate through the market prices and provide the price information to the trader agents
+        self.barrier = BarrierIndex(prices) # first-passage lookup over the full price path, queried from market_date onwards
 
         # Create the network space and store it in the grid attribute of the Trader model class
         network_space = NetworkSpace(num_nodes, avg_node_degree, self.random)
         self.grid = network_space.get_network()
 
+        # Per-step blocks of every agent's random draws (strategy signal, sharing check)
+        self.streams = RandomStreams(seed, num_nodes)
+
 
         # The variables that will be calculated with each step and stored within the model for later visualisation
         self.datacollector = mesa.DataCollector(
@@ -84,12 +98,10 @@ class TraderNetwork(Model):
 
 
     def step(self):
-        if len(self.prices) > 1:
+        if len(self.prices) - self.market_date > 1:
+            self.streams.start_step(self.market_date)
             self.agents.shuffle_do("step")
             self.market_date+=1
-            self.prices = np.delete(self.prices, 0)
-            self.agents.set("price_memory", self.prices[0])
-            self.agents.set("market_prices", self.prices)
             # collect data after each step
             self.datacollector.collect(self)
         else:
@@ -0,0 +1,265 @@
+import numpy as np
+
+
+# Order sides (signed, so side*quantity is the signed order flow)
+BUY = 1
+SELL = -1
+
+# Each side of the book is one sorted int64 array of keys packing (priority price, order id): the price in
+# ticks in the high bits (negated for bids, so the best bid sorts first) and the order id in the low 32 bits.
+# Order ids increase with arrival, so sorting the keys gives price-time priority.
+ID_BITS = 32
+ID_MASK = (1 << ID_BITS) - 1
+
+FILL_DTYPE = np.dtype([
+    ("buy_id", np.int64),
+    ("sell_id", np.int64),
+    ("buyer", np.int64),
+    ("seller", np.int64),
+    ("price", np.float64),
+    ("quantity", np.int64),
+])
+
+
+def book_keys(side, ticks, order_ids):
+    return ((ticks if side == SELL else -ticks) << ID_BITS) | order_ids
+
+
+class LimitOrderBook():
+    # Limit order book with price-time priority. Orders are stored as columns indexed by order id;
+    # each side is a sorted array of keys (see book_keys). Orders submitted during a step are queued and
+    # inserted in one sorted merge by match(), which then matches the whole crossed part of the book
+    # in a single vectorised pass. Cancelling only zeroes the remaining quantity (O(1) per order);
+    # cancelled orders are skipped by the matching, dropped when they reach the top of the book and
+    # pruned once they make up half the book.
+    def __init__(self, tick_size=0.01, capacity=1024):
+        self.tick_size = tick_size
+        self.capacity = max(1, capacity)
+        self.count = 0  # Orders ever submitted, i.e. the next order id
+        self.side = np.zeros(self.capacity, dtype=np.int8)
+        self.ticks = np.zeros(self.capacity, dtype=np.int64)
+        self.remaining = np.zeros(self.capacity, dtype=np.int64)
+        self.owner = np.zeros(self.capacity, dtype=np.int64)
+        self.books = {BUY: np.empty(0, dtype=np.int64), SELL: np.empty(0, dtype=np.int64)}
+        self.pending = []  # Order id ranges submitted since the last match
+        self.inserted = 0  # Orders below this id have been inserted into the books (or dropped)
+        self.cancelled = 0  # Cancelled orders still in the books
+
+    def to_ticks(self, prices):
+        return np.rint(np.asarray(prices, dtype=float) / self.tick_size).astype(np.int64)
+
+    def grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name in ("side", "ticks", "remaining", "owner"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def submit(self, sides, prices, quantities, owners):
+        """
+        Queues limit orders (arrays, or scalars for a single order) for the next match().
+        Returns their order ids.
+        """
+        sides, ticks, quantities, owners = np.broadcast_arrays(
+            np.asarray(sides, dtype=np.int8), self.to_ticks(prices), np.asarray(quantities, dtype=np.int64), np.asarray(owners, dtype=np.int64)
+        )
+        num_orders = sides.size
+        if self.count + num_orders > ID_MASK:
+            raise OverflowError("Order ids exhausted")
+        if self.count + num_orders > self.capacity:
+            self.grow(self.count + num_orders)
+
+        first, last = self.count, self.count + num_orders
+        self.side[first:last] = sides.ravel()
+        self.ticks[first:last] = ticks.ravel()
+        self.remaining[first:last] = quantities.ravel()
+        self.owner[first:last] = owners.ravel()
+        self.count = last
+        self.pending.append((first, last))
+        return np.arange(first, last, dtype=np.int64)
+
+    def cancel(self, order_ids):
+        """
+        Cancels orders (resting or queued). Returns the quantity each one still had open.
+        """
+        order_ids = np.asarray(order_ids, dtype=np.int64)
+        open_quantity = self.remaining[order_ids].copy()
+        # Queued orders are not in the books yet (insert_pending skips them once cancelled)
+        resting = np.unique(order_ids[order_ids < self.inserted])
+        self.cancelled += int(np.count_nonzero(self.remaining[resting]))
+        self.remaining[order_ids] = 0
+        return open_quantity
+
+    def insert_pending(self):
+        if not self.pending:
+            return
+        ids = np.concatenate([np.arange(first, last, dtype=np.int64) for first, last in self.pending])
+        self.pending = []
+        self.inserted = self.count
+        ids = ids[self.remaining[ids] > 0]
+        for side, book in self.books.items():
+            side_ids = ids[self.side[ids] == side]
+            if len(side_ids) == 0:
+                continue
+            keys = np.sort(book_keys(side, self.ticks[side_ids], side_ids))
+            self.books[side] = np.insert(book, np.searchsorted(book, keys), keys)
+
+    def prune(self):
+        for side, book in self.books.items():
+            self.books[side] = book[self.remaining[book & ID_MASK] > 0]
+        self.cancelled = 0
+
+    def drop_cancelled_head(self, side):
+        # Removes the cancelled orders at the top of one side, so its first key is the live best quote
+        book = self.books[side]
+        if len(book) == 0 or self.remaining[book[0] & ID_MASK] > 0:
+            return
+        live = self.remaining[book & ID_MASK] > 0
+        first = int(np.argmax(live)) if live.any() else len(book)
+        self.books[side] = book[first:]
+        self.cancelled -= first
+
+    def match(self):
+        """
+        Inserts the queued orders and matches the crossed part of the book in price-time priority.
+        Each fill trades at the price of the earlier (resting) of the two orders.
+        Returns the fills as a FILL_DTYPE array, in matching order.
+        """
+        self.insert_pending()
+        if 2*self.cancelled > len(self):
+            self.prune()
+
+        best_bid, best_ask = self.best_bid_ticks(), self.best_ask_ticks()
+        if best_bid is None or best_ask is None or best_bid < best_ask:
+            return np.empty(0, dtype=FILL_DTYPE)
+        bids, asks = self.books[BUY], self.books[SELL]
+
+        # Only the orders priced through the opposite best quote can trade
+        bid_ids = bids[:np.searchsorted(bids, (-best_ask + 1) << ID_BITS)] & ID_MASK
+        ask_ids = asks[:np.searchsorted(asks, (best_bid + 1) << ID_BITS)] & ID_MASK
+        bid_cancelled = self.remaining[bid_ids] == 0
+        ask_cancelled = self.remaining[ask_ids] == 0
+        bid_cumulative = np.cumsum(self.remaining[bid_ids])
+        ask_cumulative = np.cumsum(self.remaining[ask_ids])
+
+        # Walking both sides in priority order, every change of bid or ask order starts a new fill;
+        # bid prices fall and ask prices rise along the walk, so the crossing fills are a prefix
+        ends = np.sort(np.concatenate([bid_cumulative, ask_cumulative]), kind="stable")  # Merges two sorted runs
+        ends = ends[(ends > np.concatenate([[0], ends[:-1]])) & (ends <= min(bid_cumulative[-1], ask_cumulative[-1]))]
+        if len(ends) == 0:
+            return np.empty(0, dtype=FILL_DTYPE)
+        starts = np.concatenate([[0], ends[:-1]])
+        bid_index = np.searchsorted(bid_cumulative, starts, side="right")
+        ask_index = np.searchsorted(ask_cumulative, starts, side="right")
+        buy_ids, sell_ids = bid_ids[bid_index], ask_ids[ask_index]
+        crossing = self.ticks[buy_ids] >= self.ticks[sell_ids]
+        num_fills = int(np.count_nonzero(crossing))
+
+        buy_ids, sell_ids = buy_ids[:num_fills], sell_ids[:num_fills]
+        quantity = (ends - starts)[:num_fills]
+        ticks = np.where(buy_ids < sell_ids, self.ticks[buy_ids], self.ticks[sell_ids])
+
+        fills = np.empty(num_fills, dtype=FILL_DTYPE)
+        fills["buy_id"], fills["sell_id"] = buy_ids, sell_ids
+        fills["buyer"], fills["seller"] = self.owner[buy_ids], self.owner[sell_ids]
+        fills["price"] = ticks * self.tick_size
+        fills["quantity"] = quantity
+
+        # An order can appear in several consecutive fills; subtract.at accumulates all of them
+        np.subtract.at(self.remaining, buy_ids, quantity)
+        np.subtract.at(self.remaining, sell_ids, quantity)
+
+        # Filled orders form a prefix of each side (only the last one may be partially filled), which
+        # also takes out the cancelled orders among them
+        for side, cancelled in ((BUY, bid_cancelled), (SELL, ask_cancelled)):
+            book = self.books[side]
+            open_orders = self.remaining[book[:len(cancelled)] & ID_MASK] > 0
+            filled = int(np.argmax(open_orders)) if open_orders.any() else len(open_orders)
+            self.books[side] = book[filled:]
+            self.cancelled -= int(np.count_nonzero(cancelled[:filled]))
+        return fills
+
+    def best_bid_ticks(self):
+        # Best quotes are taken from live orders only
+        self.drop_cancelled_head(BUY)
+        book = self.books[BUY]
+        return None if len(book) == 0 else int(-(book[0] >> ID_BITS))
+
+    def best_ask_ticks(self):
+        self.drop_cancelled_head(SELL)
+        book = self.books[SELL]
+        return None if len(book) == 0 else int(book[0] >> ID_BITS)
+
+    @property
+    def best_bid(self):
+        ticks = self.best_bid_ticks()
+        return None if ticks is None else ticks * self.tick_size
+
+    @property
+    def best_ask(self):
+        ticks = self.best_ask_ticks()
+        return None if ticks is None else ticks * self.tick_size
+
+    def depth(self, side, levels=10):
+        """
+        Returns (prices, quantities) of the best `levels` price levels of one side.
+        """
+        ids = self.books[side] & ID_MASK
+        ids = ids[self.remaining[ids] > 0]
+        ticks, first = np.unique(self.ticks[ids] * -side, return_index=True)
+        quantity = np.add.reduceat(self.remaining[ids], first) if len(ids) else np.empty(0, dtype=np.int64)
+        return (ticks[:levels] * -side) * self.tick_size, quantity[:levels]
+
+    def __len__(self):
+        # Orders resting in the book (including cancelled ones not yet pruned)
+        return len(self.books[BUY]) + len(self.books[SELL])
+
+
+class OrderBatch():
+    # Orders of one step in preallocated side/quantity/trader arrays (grown by doubling), for markets
+    # that clear all of a step's orders at once instead of keeping a book
+    def __init__(self, capacity=1024):
+        self.capacity = max(1, capacity)
+        self.count = 0
+        self.side = np.zeros(self.capacity, dtype=np.int8)
+        self.quantity = np.zeros(self.capacity, dtype=np.int64)
+        self.trader = np.zeros(self.capacity, dtype=np.int64)
+
+    def grow(self, needed):
+        capacity = self.capacity
+        while capacity < needed:
+            capacity *= 2
+        for name in ("side", "quantity", "trader"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:self.count] = old[:self.count]
+            setattr(self, name, new)
+        self.capacity = capacity
+
+    def add(self, sides, quantities, traders):
+        """
+        Appends orders (arrays, or scalars for a single order).
+        """
+        sides, quantities, traders = np.broadcast_arrays(np.asarray(sides), np.asarray(quantities), np.asarray(traders))
+        num_orders = sides.size
+        if self.count + num_orders > self.capacity:
+            self.grow(self.count + num_orders)
+        first, last = self.count, self.count + num_orders
+        self.side[first:last] = sides.ravel()
+        self.quantity[first:last] = quantities.ravel()
+        self.trader[first:last] = traders.ravel()
+        self.count = last
+
+    def orders(self):
+        # (side, quantity, trader) views of the queued orders
+        return self.side[:self.count], self.quantity[:self.count], self.trader[:self.count]
+
+    def clear(self):
+        self.count = 0
+
+    def __len__(self):
+        return self.count
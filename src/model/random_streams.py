@@ -0,0 +1,57 @@
+import numpy as np
+
+
+# Per-agent random draws of TraderAgent: "strategy" (random buy/sell signal) and "sharing" (generosity check)
+STREAM_NAMES = ("strategy", "sharing")
+
+# Spawn key prefix of the streams, kept apart from the model generator's own spawned children
+STREAM_KEY = 0x5354
+
+# Memory of one pre-drawn block per stream; the block covers as many steps as fit (at least one)
+BLOCK_BYTES = 8 * 2**20
+
+
+class RandomStreams():
+    # Named streams of per-agent uniforms drawn from a seeded PCG64 in blocks of block_steps steps,
+    # sized so one block of every stream stays within block_bytes however many agents there are.
+    # Block b of stream i comes from its own SeedSequence (spawn key (STREAM_KEY, i, b)), so any step's
+    # draws depend only on (seed, stream, step, agent) for a given block size: not on the order agents
+    # are stepped, on how they are split across processes, or on whether the run was resumed.
+    def __init__(self, seed, num_agents, names=STREAM_NAMES, block_bytes=BLOCK_BYTES):
+        self.seed_sequence = np.random.SeedSequence(seed)
+        self.num_agents = num_agents
+        self.names = tuple(names)
+        self.block_steps = max(1, block_bytes // (8 * max(num_agents, 1)))
+        self.blocks = {name: (None, None) for name in self.names}  # name -> (block number, (block_steps, num_agents) uniforms)
+        self.step = None
+        self.current = {}  # name -> this step's uniforms as a list (indexed by agent)
+
+    def generator(self, name, block):
+        sequence = np.random.SeedSequence(self.seed_sequence.entropy, spawn_key=(*self.seed_sequence.spawn_key, STREAM_KEY, self.names.index(name), block))
+        return np.random.Generator(np.random.PCG64(sequence))
+
+    def uniforms(self, name, step):
+        """
+        Returns the (num_agents,) uniforms of stream name at step.
+        """
+        block, row = divmod(step, self.block_steps)
+        drawn, values = self.blocks[name]
+        if drawn != block:
+            values = self.generator(name, block).random((self.block_steps, self.num_agents))
+            self.blocks[name] = (block, values)
+        return values[row]
+
+    def start_step(self, step):
+        # Makes step's draws the current ones (as lists, so agents index them without NumPy overhead)
+        if step == self.step:
+            return
+        self.step = step
+        self.current = {name: self.uniforms(name, step).tolist() for name in self.names}
+
+    def uniform(self, name, index):
+        """Returns the current step's uniform in [0, 1) of agent index."""
+        return self.current[name][index]
+
+    def boolean(self, name, index):
+        """Returns the current step's fair coin flip of agent index."""
+        return self.current[name][index] < 0.5
@@ -1,76 +1,208 @@
+import mesa
 from mesa import Agent, Model
-from mesa.time import RandomActivation
+from collections import deque
 import numpy as np
-import random
+from src.model.order_book import (
+    BUY,
+    SELL,
+    LimitOrderBook,
+    OrderBatch
+)
 
-# Doesn't Work
+
+# "book": orders are matched in a limit order book (price-time priority), the price is the last traded price
+# "auction": all of a step's orders fill at one clearing price moved by the square root of the order imbalance
+CLEARING_MODES = ("book", "auction")
+
+
+# Market whose price is set by its traders' orders, cleared every step by the chosen clearing mode
 class Simulated_Market(Model):
     """ [1] - Initialising Variables """
-    def __init__(self, trader_ID, model, initial_price=100, initial_liquidity: int=10000):
-        super().__init__(trader_ID, model)
-        self.price = initial_price  # Initial stock price
+    def __init__(
+        self,
+        num_traders=10,
+        initial_price=100,
+        initial_liquidity: int=10000,
+        initial_cash=1000,
+        initial_shares=10,
+        tick_size=0.01,
+        order_lifetime=5,
+        clearing="book",
+        impact_coefficient=0.02,
+        seed=None,
+    ):
+        super().__init__(seed=seed)
+        if clearing not in CLEARING_MODES:
+            raise ValueError(f"Unknown clearing mode: {clearing}. Expected one of {CLEARING_MODES}")
+        self.clearing = clearing
+        self.impact_coefficient = impact_coefficient
+        self.order_batch = OrderBatch(num_traders)  # Orders of the current step (auction clearing)
+        self.price = initial_price  # Last traded price
         self.liquidity = initial_liquidity
-        self.order_book = []  # (Side, Quantity, Trader)
-        
-    
-    """ [2] Match Buy/Sell Orders and adjust price based on order imbalance"""
+        self.volume = 0  # Shares traded in the last step
+        self.order_book = LimitOrderBook(tick_size)
+        self.order_lifetime = order_lifetime  # Unfilled orders are cancelled after this many steps
+        self.order_batches = deque()  # Order id range submitted in each of the last order_lifetime steps
+        self.batch_start = 0
+
+        # Cash and shares available to each trader (indexed by Trader.index); the cash of open buy
+        # orders and the shares of open sell orders are held back until they fill or are cancelled
+        self.cash = np.full(num_traders, float(initial_cash))
+        self.shares = np.full(num_traders, initial_shares, dtype=np.int64)
+
+        Trader.create_agents(self, num_traders, list(range(num_traders)))
+
+        self.datacollector = mesa.DataCollector({"Price": "price", "Volume": "volume"})
+        self.datacollector.collect(self)
+
+
+    """ [2] Order Submission: reserve cash (buys) or shares (sells) and queue the orders for matching """
+    def submit_orders(self, sides, prices, quantities, traders):
+        """
+        Queues the orders each trader can cover (taken in order per trader). Returns the accepted mask.
+        With auction clearing, orders are market orders (prices are ignored) capped at clearing time.
+        """
+        sides, prices, quantities, traders = np.broadcast_arrays(
+            np.asarray(sides), np.asarray(prices, dtype=float), np.asarray(quantities, dtype=np.int64), np.asarray(traders, dtype=np.int64)
+        )
+        if self.clearing == "auction":
+            accepted = quantities > 0
+            self.order_batch.add(sides[accepted], quantities[accepted], traders[accepted])
+            return accepted
+
+        limit = self.order_book.to_ticks(prices) * self.order_book.tick_size
+        buy = sides == BUY
+        cost = np.where(buy, limit*quantities, quantities)
+
+        # Running cost of each trader's buys (cash) and sells (shares) within the batch
+        group = traders*2 + buy
+        order = np.argsort(group, kind="stable")
+        running = np.cumsum(cost[order])
+        first = np.flatnonzero(np.r_[True, group[order][1:] != group[order][:-1]])
+        running -= np.repeat(running[first] - cost[order][first], np.diff(np.r_[first, len(order)]))
+        available = np.where(buy, self.cash[traders], self.shares[traders])
+        accepted = np.empty(len(order), dtype=bool)
+        accepted[order] = running <= available[order]
+        accepted &= quantities > 0
+
+        np.subtract.at(self.cash, traders[accepted & buy], cost[accepted & buy])
+        np.subtract.at(self.shares, traders[accepted & ~buy], quantities[accepted & ~buy])
+        self.order_book.submit(sides[accepted], prices[accepted], quantities[accepted], traders[accepted])
+        return accepted
+
+    def submit_order(self, side, quantity, price, trader):
+        # Single-order convenience used by Trader.step
+        return bool(self.submit_orders([side], [price], [quantity], [trader])[0])
+
+    def release(self, order_ids, quantities):
+        # Returns the held cash/shares of the given open quantities to their traders
+        book = self.order_book
+        buy = book.side[order_ids] == BUY
+        np.add.at(self.cash, book.owner[order_ids][buy], (book.ticks[order_ids][buy] * book.tick_size) * quantities[buy])
+        np.add.at(self.shares, book.owner[order_ids][~buy], quantities[~buy])
+
+    def expire_orders(self):
+        # Cancels what is left of the orders submitted order_lifetime steps ago
+        while len(self.order_batches) > self.order_lifetime:
+            first, last = self.order_batches.popleft()
+            order_ids = np.arange(first, last)
+            self.release(order_ids, self.order_book.cancel(order_ids))
+
+
+    """ [3] Match Buy/Sell Orders and settle the fills """
     def execute_orders(self):
-        # Initialising total buy and sell
-        total_buys = 0
-        total_sells = 0
-        
-        # Obtaining total stocks bought and sold
-        for side, qty, trader in self.order_book:
-            if side == 'buy':
-                total_buys += qty
-            elif side == "sell":
-                total_sells += qty
-
-        # Adjust price based on demand/supply
-        order_imbalance = total_buys - total_sells
-
-        if abs(order_imbalance) > 0:
-            impact_coefficient = 0.02
-            market_impact = np.sqrt(order_imbalance/self.liquidity)
-            price_change = market_impact * self.price * impact_coefficient
-
-            if order_imbalance > 0: # More Buyers than sellers
-                self.price += price_change # Price Increases
-            elif order_imbalance < 0: # More sellers than buyers
-                self.price -= price_change # Price Decreases
-        
-        # Clear order book after execution
-        self.order_book = []
-
-
-
-    """ [] Process all orders by agent and adjust stock price based on supply vs demand """
+        if self.clearing == "auction":
+            return self.clear_auction()
+        return self.match_book()
+
+    def match_book(self):
+        self.order_batches.append((self.batch_start, self.order_book.count))
+        self.batch_start = self.order_book.count
+        self.expire_orders()
+
+        fills = self.order_book.match()
+        self.volume = int(fills["quantity"].sum())
+        if len(fills) == 0:
+            return fills
+
+        # Buyers receive the shares plus the difference between their limit and the fill price;
+        # sellers receive the cash of the fill
+        book = self.order_book
+        limit = book.ticks[fills["buy_id"]] * book.tick_size
+        np.add.at(self.shares, fills["buyer"], fills["quantity"])
+        np.add.at(self.cash, fills["buyer"], (limit - fills["price"]) * fills["quantity"])
+        np.add.at(self.cash, fills["seller"], fills["price"] * fills["quantity"])
+
+        self.price = float(fills["price"][-1])
+        return fills
+
+    def clear_auction(self):
+        """
+        Clears the step's orders in one vectorised pass: the price moves by the square root of the
+        order imbalance (in either direction), then every order fills at that price as far as its
+        trader's cash (buys) or shares (sells) allow. Returns the filled quantity of each order.
+        """
+        sides, quantities, traders = self.order_batch.orders()
+        num_traders = len(self.cash)
+        buy = sides == BUY
+
+        # Square-root market impact, symmetric for net buying and net selling
+        order_imbalance = int(np.dot(sides, quantities))
+        market_impact = np.sqrt(abs(order_imbalance) / self.liquidity)
+        self.price = float(self.price + np.sign(order_imbalance) * market_impact * self.price * self.impact_coefficient)
+
+        # Each trader's buys are scaled down to what its cash affords at the clearing price,
+        # and its sells to the shares it holds
+        bought = np.bincount(traders[buy], weights=quantities[buy], minlength=num_traders)
+        sold = np.bincount(traders[~buy], weights=quantities[~buy], minlength=num_traders)
+        buy_scale = np.minimum(1, np.floor(np.maximum(self.cash, 0) / self.price) / np.maximum(bought, 1))
+        sell_scale = np.minimum(1, self.shares / np.maximum(sold, 1))
+        filled = np.floor(quantities * np.where(buy, buy_scale[traders], sell_scale[traders])).astype(np.int64)
+
+        net_bought = np.bincount(traders, weights=sides * filled, minlength=num_traders).astype(np.int64)
+        self.shares += net_bought
+        self.cash -= net_bought * self.price
+        self.volume = int(filled.sum())
+        self.order_batch.clear()
+        return filled
+
+
+    """ [4] Traders submit their orders, which are then matched and settled """
     def step(self):
+        self.agents.shuffle_do("step")
         self.execute_orders()
-    
+        self.datacollector.collect(self)
+
 
 
 
 class Trader(Agent):
-    def __init__(self, unique_id, model):
-        super().__init__(unique_id, model)
-        self.cash = 1000  # Initial cash
-        self.shares = 0  # Initially holds no stock
-    
+    def __init__(self, model, index, spread=0.01):
+        super().__init__(model)
+        self.index = index  # Row of this trader in the market's cash/shares arrays
+        self.spread = spread  # Limit prices are drawn within +/- spread of the last price
+
+    @property
+    def cash(self):
+        return self.model.cash[self.index]
+
+    @property
+    def shares(self):
+        return self.model.shares[self.index]
+
     def step(self):
-        """Trader makes a buy or sell decision each step."""
-        decision = random.choice(['buy', 'sell', 'hold'])
-        if decision == 'buy' and self.cash >= self.model.price:
-            self.model.order_book.append('buy')
-            self.cash -= self.model.price
-            self.shares += 1
+        """Trader places a buy or sell limit order for one share around the last price (or holds)."""
+        decision = self.random.choice(['buy', 'sell', 'hold'])
+        price = self.model.price * (1 + self.random.uniform(-self.spread, self.spread))
+        if decision == 'buy' and self.cash >= price:
+            self.model.submit_order(BUY, 1, price, self.index)
         elif decision == 'sell' and self.shares > 0:
-            self.model.order_book.append('sell')
-            self.cash += self.model.price
-            self.shares -= 1
+            self.model.submit_order(SELL, 1, price, self.index)
+
 
 # Run the simulation
-market = Simulated_Market(num_traders=10, initial_price=100)
-for _ in range(100):  # Simulate 100 time steps
-    market.step()
-    print(f"Time {_}: Price = {market.price:.2f}")
+if __name__ == "__main__":
+    market = Simulated_Market(num_traders=10, initial_price=100, seed=1)
+    for _ in range(100):  # Simulate 100 time steps
+        market.step()
+        print(f"Time {_}: Price = {market.price:.2f}")
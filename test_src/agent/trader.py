@@ -2,6 +2,9 @@ from mesa.discrete_space import FixedAgent
 import random
 from enum import Enum
 import numpy as np
+from test_src.model.event_log import (
+    EventType
+)
 
 
 # State class to indicate the state of each trader agent. "Broke" or "with some money".
@@ -11,28 +14,37 @@ class TraderState(Enum):
 
 """ Trade Strategies"""
 # Random Strategy
-def random_strategy(model):
-    # randomly chooses True (Buy Signal) or False (Sell Signal)
+def random_strategy(model, index=None):
+    # randomly chooses True (Buy Signal) or False (Sell Signal), from the agent's pre-drawn stream when given its index
+    if index is not None:
+        return model.streams.boolean("strategy", index)
     return model.random.choice([True, False])
 
 # RSI Strategy
-def rsi_strategy(prices, period=14, lower_threshold=30, upper_threshold=70):
-    # Checks to see if there is enough data to compute RSI
-    if len(prices) < period + 1:
-        return None 
+def rsi_strategy(prices, period=14, lower_threshold=30, upper_threshold=70, smoothing="simple", indicators=None):
+    # Reads the RSI from the model's rolling indicators when available
+    if indicators is not None:
+        rsi = indicators.rsi(period, smoothing)
+        if rsi is None:
+            return None
 
-    deltas = np.diff(prices[-(period+1):])
-    gains = np.where(deltas > 0, deltas, 0)
-    losses = np.where(deltas < 0, -deltas, 0)
-
-    avg_gain = np.mean(gains)
-    avg_loss = np.mean(losses)
-
-    if avg_loss == 0:
-        rsi = 100
     else:
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
+        # Checks to see if there is enough data to compute RSI
+        if len(prices) < period + 1:
+            return None 
+
+        deltas = np.diff(prices[-(period+1):])
+        gains = np.where(deltas > 0, deltas, 0)
+        losses = np.where(deltas < 0, -deltas, 0)
+
+        avg_gain = np.mean(gains)
+        avg_loss = np.mean(losses)
+
+        if avg_loss == 0:
+            rsi = 100
+        else:
+            rs = avg_gain / avg_loss
+            rsi = 100 - (100 / (1 + rs))
     
     # Signals
     if rsi < lower_threshold:
@@ -44,12 +56,20 @@ def rsi_strategy(prices, period=14, lower_threshold=30, upper_threshold=70):
 
 
 # SMA Strategy
-def sma_strategy(prices, period=28):
-    # Checks to see if there is enough data to compute SMA
-    if len(prices) < period + 1:
-        return None  
+def sma_strategy(prices, period=28, indicators=None):
+    # Reads the SMA from the model's rolling indicators when available
+    if indicators is not None:
+        sma = indicators.sma(period)
+        if sma is None:
+            return None
+
+    else:
+        # Checks to see if there is enough data to compute SMA
+        if len(prices) < period + 1:
+            return None  
+
+        sma = np.mean(prices[-(period+1):-1])  # Compute SMA from previous N prices
 
-    sma = np.mean(prices[-(period+1):-1])  # Compute SMA from previous N prices
     current_price = prices[-1]
     
     # Signals
@@ -61,17 +81,26 @@ def sma_strategy(prices, period=28):
         return None  # Hold
 
 # Bollinger Band Strategy -> Mean Reverting
-def bollinger_strategy(prices, period=20, num_std_dev=2):
-    # Checks to see if there is enough data to compute Bollinger Bands
-    if len(prices) < period:
-        return None  
+def bollinger_strategy(prices, period=20, num_std_dev=2, indicators=None):
+    # Reads the bands from the model's rolling indicators when available
+    if indicators is not None:
+        bands = indicators.bollinger(period, num_std_dev)
+        if bands is None:
+            return None
+        lower_band, upper_band = bands
 
-    recent_prices = prices[-period:]
-    sma = np.mean(recent_prices)
-    std = np.std(recent_prices)
+    else:
+        # Checks to see if there is enough data to compute Bollinger Bands
+        if len(prices) < period:
+            return None  
+
+        recent_prices = prices[-period:]
+        sma = np.mean(recent_prices)
+        std = np.std(recent_prices)
+
+        upper_band = sma + num_std_dev * std
+        lower_band = sma - num_std_dev * std
 
-    upper_band = sma + num_std_dev * std
-    lower_band = sma - num_std_dev * std
     current_price = prices[-1]
     
     # Signal
@@ -85,29 +114,60 @@ def bollinger_strategy(prices, period=20, num_std_dev=2):
 
 
 # Strategy Selector
-def trader_strategy(price_history=None, strategy_type="random", **kwargs):
+def trader_strategy(price_history=None, strategy_type="random", indicators=None, **kwargs):
     if strategy_type == "random":
         return random_strategy(**kwargs)
     elif strategy_type == "rsi":
-        return rsi_strategy(price_history, **kwargs)
+        return rsi_strategy(price_history, indicators=indicators, **kwargs)
     elif strategy_type == "sma":
-        return sma_strategy(price_history, **kwargs)
+        return sma_strategy(price_history, indicators=indicators, **kwargs)
     elif strategy_type == "bollinger":
-        return bollinger_strategy(price_history, **kwargs)
+        return bollinger_strategy(price_history, indicators=indicators, **kwargs)
 
 
 class TraderAgent(FixedAgent):
     def __init__(self, model, capital, strategy_type, win_rate, market_prices, generocity_rate, cell, strategy_params=None):
         super().__init__(model)
-        self.capital = capital
+        self.index = self.unique_id - 1  # Row of the agent in the model's per-agent arrays and random streams
+        self._capital = capital  # Set directly: the model's aggregates are initialised after the agents are created
         self.strategy_type = strategy_type  # Callable strategy function
         self.strategy_params = strategy_params or {}
         self.win_rate = win_rate  # Float (0 to 1)
-        self.market_prices = market_prices
-        self.price_memory = self.market_prices[0]
+        self.price_buffer = market_prices  # Model-owned PriceBuffer, shared by every agent
         self.generocity_rate = generocity_rate
         self.cell = cell
-        self.state = TraderState.HAS_CAPITAL if round(capital) >= 0 else TraderState.ZERO_CAPITAL
+        self._state = TraderState.HAS_CAPITAL if round(capital) >= 0 else TraderState.ZERO_CAPITAL
+
+    # Capital and state changes are forwarded to the model's incremental aggregates (state counts,
+    # total capital, ...) so the reporters never have to scan the agents
+    @property
+    def capital(self):
+        return self._capital
+
+    @capital.setter
+    def capital(self, value):
+        self.model.aggregates.capital_changed(self._capital, value)
+        self._capital = value
+
+    @property
+    def state(self):
+        return self._state
+
+    @state.setter
+    def state(self, value):
+        if value is not self._state:
+            self.model.aggregates.state_changed(self._state, value)
+            self._state = value
+
+    @property
+    def market_prices(self):
+        # Zero-copy read-only view of the model's price history
+        return self.price_buffer.view()
+
+    @property
+    def price_memory(self):
+        # Latest market price
+        return self.price_buffer.latest()
 
     def trade_action(self):
         """
@@ -118,41 +178,39 @@ class TraderAgent(FixedAgent):
             return
 
 
-        # Strategy decides Buy (True) or Sell (False)
-        decision = trader_strategy(self.market_prices, self.strategy_type, **self.strategy_params)
+        # Strategy decides Buy (True) or Sell (False), shared with agents using the same parameters
+        decision = self.model.signal_cache.get(self.strategy_type, self.strategy_params, index=self.index)
         
         # Hold - no action
         if decision is None:
             return  
 
-        index = 0
-        continue_flag = True
+        # First price in the history that crosses either barrier
+        price_memory = self.price_memory
+        index, hit_up, price = self.model.barrier_touch(price_memory, self.price_buffer.start)
 
-        while index < len(self.market_prices) and continue_flag:
+        if index >= 0:
+            capital_before = self.capital
             if decision:
-                if self.price_memory*1.001 <= self.market_prices[index]:
-                    self.capital += (self.market_prices[index] - self.price_memory)
+                if hit_up:
+                    self.capital += (price - price_memory)
                     self.win_rate += 1
-                    continue_flag = False
-
-                elif self.price_memory*0.0090 >= self.market_prices[index]:
-                    self.capital -= (self.price_memory - self.market_prices[index])
-                    continue_flag = False
+                else:
+                    self.capital -= (price_memory - price)
 
             else:
-                if self.price_memory*1.001 <= self.market_prices[index]:
-                    self.capital -= (self.market_prices[index] - self.price_memory)
-                    continue_flag = False
-
-                elif self.price_memory*0.0090 >= self.market_prices[index]:
-                    self.capital += (self.price_memory - self.market_prices[index])
+                if hit_up:
+                    self.capital -= (price - price_memory)
+                else:
+                    self.capital += (price_memory - price)
                     self.win_rate += 1
-                    continue_flag = False
 
-            index += 1
+            events = self.model.events
+            if events.trades:
+                events.record(EventType.TRADE, self.model.market_date, self.unique_id, amount=self.capital - capital_before, value=self.capital)
             
         # Update state
-        self.state = TraderState.HAS_CAPITAL if self.capital > 0 else TraderState.ZERO_CAPITAL
+        self.update_state()
 
 
     # Change function below to randomly give capital to the agent with the highest winrate
@@ -166,17 +224,19 @@ class TraderAgent(FixedAgent):
                 successful_agent = agent
 
         if successful_agent is not None and successful_agent is not self:
-            if self.random.random() < self.generocity_rate:
+            if self.model.streams.uniform("sharing", self.index) < self.generocity_rate:
                 if self.capital <= 1:
-                    successful_agent.capital += self.capital
-                    self.capital -= self.capital
-                    print(f"Agent {self.unique_id} just gave {self.capital} capital to {successful_agent.unique_id} with winrate: {successful_agent.win_rate}.")
+                    amount = self.capital
                 else:
-                    successful_agent.capital += self.capital*0.01
-                    self.capital -= self.capital*0.01
-                    print(f"Agent {self.unique_id} just gave {self.capital*0.01} capital to {successful_agent.unique_id} with winrate: {successful_agent.win_rate}.")
+                    amount = self.capital*0.01
+                successful_agent.capital += amount
+                self.capital -= amount
+
+                events = self.model.events
+                if events.transfers:
+                    events.record(EventType.TRANSFER, self.model.market_date, self.unique_id, successful_agent.unique_id, amount, self.capital)
 
-        self.state = TraderState.HAS_CAPITAL if self.capital > 0 else TraderState.ZERO_CAPITAL
+        self.update_state()
             
 
         
@@ -186,7 +246,16 @@ class TraderAgent(FixedAgent):
         Adjusts capital directly (e.g., for sharing mechanisms).
         """
         self.capital += amount
-        self.state = TraderState.HAS_CAPITAL if self.capital > 0 else TraderState.ZERO_CAPITAL
+        self.update_state()
+
+    def update_state(self):
+        """
+        Updates the agent's state from its capital, recording a bankruptcy when it runs out.
+        """
+        state = TraderState.HAS_CAPITAL if self.capital > 0 else TraderState.ZERO_CAPITAL
+        if state is TraderState.ZERO_CAPITAL and self.state is TraderState.HAS_CAPITAL and self.model.events.bankruptcies:
+            self.model.events.record(EventType.BANKRUPTCY, self.model.market_date, self.unique_id, value=self.capital)
+        self.state = state
 
     def get_capital(self):
         return self.capital
@@ -200,8 +269,6 @@ class TraderAgent(FixedAgent):
         """  
         # Skip step if agent has zero capital
         if self.state == TraderState.ZERO_CAPITAL:
-            # A debug print (optional, can be commented out)
-            print(f"Agent {self.unique_id} is out of capital and has stopped trading.")
             return
 
         self.trade_action()
@@ -209,8 +276,5 @@ class TraderAgent(FixedAgent):
         if self.state is TraderState.HAS_CAPITAL:
             self.try_to_share_capital()
 
-        # A debug print (optional, can be commented out)
-        print(f"Agent {self.unique_id}: Capital = {self.capital}, State = {self.state}, Price Memory = {self.price_memory}")
-
 
 
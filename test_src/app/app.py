@@ -3,6 +3,7 @@
 # Run by Typing "solara run test_src/app/app.py" into the terminal
 
 # Importing Libraries 
+import time
 import numpy as np
 import pandas as pd
 import mplfinance  as mpf 
@@ -23,6 +24,23 @@ from mesa.visualization import (
 import solara
 from matplotlib.figure import Figure
 
+## Price Data Cache
+from test_src.data_gathering.price_cache import (
+    PRICE_CACHE
+)
+
+## Incremental Chart Rendering
+from test_src.app.rendering import (
+    CapitalYieldRenderer,
+    NetworkRenderer
+)
+
+## Background Stepping
+from test_src.app.background import (
+    BackgroundRunner,
+    source_model
+)
+
 
 
 
@@ -34,6 +52,11 @@ log_to_stderr(INFO)
 # [0.2] -> [1] Demo | [0] Custom
 custom_env = 0
 
+# [0.3] -> "ui" steps the model on the UI thread, re-rendering every step (SolaraViz) | "background" steps
+# it in a worker thread and renders its latest snapshot at most BACKGROUND_FPS times per second (Custom only)
+run_mode = "ui"
+BACKGROUND_FPS = 10
+
 
 """[1] Gathering Data for Visualisation""" # -> Turn into a class
 class GatheringData:
@@ -53,11 +76,8 @@ class GatheringData:
         
         # Custom [0]
         elif custom_env == 0:
-            capital_list = []
-            for agent in model.agents:
-                capital_list.append(agent.capital)
-
-            return capital_list
+            # Works for the live model (either engine) and for its background snapshots
+            return list(model.agent_capital())
 
 
     # [1.3] Gathering Asset Price Data
@@ -67,20 +87,9 @@ class GatheringData:
         it only needs to be imported once"""
         if custom_env == 1:
             try:
-                # Load CSV data
-                price_data = pd.read_csv("data/BTCUSDT_kline_1h_bt=180d.csv")
-
-                # Convert timestamp column to datetime format
-                price_data["timestamp"] = pd.to_datetime(price_data["timestamp"])
-
-                # Set timestamp as index and rename it to "date" (required by mplfinance)
-                price_data.set_index("timestamp", inplace=True)
-                price_data.index.name = "date"  # This is what mplfinance requires
-
-                
-
-                # Return the price data as a DataFrame (filtered for the current timestep)
-                return price_data
+                # Loaded once per process (date-indexed, as mplfinance requires) and shared by every
+                # component and session; call PRICE_CACHE.invalidate() to reload it
+                return PRICE_CACHE.get("data/BTCUSDT_kline_1h_bt=180d.csv")
 
             except Exception as e:
                 print(f"Error loading price data: {e}")
@@ -224,61 +233,41 @@ class visuals:
         solara.FigureMatplotlib(fig)
 
     # [3.3] Create Capital Yield Component
-    agent_capital_history = {}
     @solara.component
     def CapitalYield(model):
-        # Reactive state for capital history and reset trigger
-        reset_key, set_reset_key = solara.use_state(0)
-        visuals.agent_capital_history, set_agent_capital_history = solara.use_state({})
-
-        # Automatically reset agent_capital_history when model changes
-        solara.use_effect(lambda: set_agent_capital_history({}) or set_reset_key(0), [model])
-  
-
         # Update the agent counter
         update_counter.get() 
 
-        # Initialise Figure
-        fig = Figure()
-        ax = fig.subplots()
-
         # Get capital values for all agents at the current timestep
         capital_values = GatheringData.get_agent_capital(model)
 
-        # Ensure each agent has a history storage
-        for agent_id in range(len(capital_values)):
-            if agent_id not in visuals.agent_capital_history:
-                visuals.agent_capital_history[agent_id] = []  # Initialize empty list for new agents
-
-        # Append the current timestep's capital value for each agent
-        for agent_id, capital in enumerate(capital_values):
-            visuals.agent_capital_history[agent_id].append(capital)
-
-
-        # Plot each agent's capital over time
-        for agent_id, capital_series in visuals.agent_capital_history.items():
-            x_axis_list = np.linspace(0, model.market_date, len(capital_series))
-            x_axis_list = list(x_axis_list)
-            
-
-            ax.plot(x_axis_list, capital_series, linestyle="-", alpha=0.5, label=f"Agent {int(agent_id+1)}")
+        # One renderer per model: it keeps a fixed-size capital history and updates its figure in place
+        # (downsampled lines, or percentile bands when there are too many agents for individual lines)
+        renderer = solara.use_memo(lambda: CapitalYieldRenderer(len(capital_values)), dependencies=[source_model(model)])
+        fig = renderer.update(model.steps, capital_values)
 
+        # Show plot in Solara
+        solara.FigureMatplotlib(fig, dependencies=[model, model.steps], format="png")
 
-        # Labeling Chart and Axis
-        ax.set_title("Agent Capital Over Time")
-        ax.set_xlabel("Unit Time")
-        ax.set_ylabel("Capital")
-        ax.set_xlim(left=0) # X min is 0
-        ax.grid(True, linestyle="-", alpha=0.3)
+    # [3.4] Create Network Graph Component
+    @solara.component
+    def NetworkGraph(model):
+        # Update the agent counter
+        update_counter.get()
 
-        # Add a legend
-        ax.legend(title="Agents", loc="upper left", fontsize="5.5", bbox_to_anchor=(1.0, 1.15))
+        # One renderer per model: node positions and edges are computed once for the model's topology,
+        # each step only recolours/resizes the nodes (or re-bins them into an image for large networks)
+        renderer = solara.use_memo(
+            lambda: NetworkRenderer(model.network.csr, cmap="viridis", vmin=0, vmax=model.price_history[0]*2),
+            dependencies=[source_model(model)],
+        )
+        fig = renderer.update(model.agent_capital())
 
         # Show plot in Solara
-        solara.FigureMatplotlib(fig)
+        solara.FigureMatplotlib(fig, dependencies=[model, model.steps], format="png")
 
 
-    # [3.4] Create Price Movement Chart
+    # [3.5] Create Price Movement Chart
     @solara.component
     def PriceMovement(model):
         # Update the agent counter
@@ -287,7 +276,7 @@ class visuals:
         # Import Price data
         if custom_env == 1:
             if model.steps == 0:
-                price_data = GatheringData.get_price_data(model).iloc[[model.steps]]
+                price_data = GatheringData.get_price_data(model).iloc[0:1]
             else:
                 price_data = GatheringData.get_price_data(model).iloc[0:model.steps]
 
@@ -313,24 +302,87 @@ class visuals:
         # Simulate
         solara.FigureMatplotlib(fig)
 
+    # [3.6] Create Background Run Component
+    @solara.component
+    def BackgroundRun(model):
+        """
+        Steps the model in a worker thread at full speed and renders the charts from its latest
+        snapshot at most "Frames per second" times per second; intermediate steps are skipped.
+        SolaraViz's own Step/Play controls must not be used while the worker runs.
+        """
+        fps = solara.use_reactive(BACKGROUND_FPS)
+        runner = solara.use_memo(lambda: BackgroundRunner(model, fps=fps.value), dependencies=[model])
+        snapshot = solara.use_reactive(None)
+        running = solara.use_reactive(False)
+
+        # Stop the worker when the model is replaced (Reset) or the page is closed
+        solara.use_effect(lambda: runner.stop, dependencies=[runner])
+
+        def poll():
+            # Consumes at most one snapshot per frame until the worker finishes
+            seen = None
+            while True:
+                version, latest = runner.latest()
+                if version != seen:
+                    seen = version
+                    snapshot.set(latest)
+                if not runner.is_running:
+                    break
+                time.sleep(1 / runner.fps)
+            running.set(False)
+
+        solara.use_thread(poll, dependencies=[runner, running.value])
+
+        def start():
+            runner.start()
+            running.set(True)
+
+        def set_fps(value):
+            runner.fps = value
+
+        # A snapshot left over from a previous model is never shown
+        current = snapshot.value if snapshot.value is not None and snapshot.value.source is model else runner.snapshot
+
+        with solara.Row():
+            solara.Button(label="Run in background", color="primary", on_click=start, disabled=running.value)
+            solara.Button(label="Stop", color="primary", on_click=lambda: runner.stop(), disabled=not running.value)
+            solara.SliderInt("Frames per second", value=fps, min=1, max=30, on_value=set_fps)
+        solara.Text(f"Step {current.steps} | {runner.steps_per_second:,.0f} steps/s")
+        if runner.error is not None:
+            solara.Error(f"error in background step: {runner.error}")
+
+        visuals.PriceMovement(current)
+        visuals.CapitalYield(current)
+        visuals.CapitalHistogram(current)
+        visuals.NetworkGraph(current)
+
 
 
 """ [4] Create Standard Visualisations"""
 # [4.1] Space Graph
-SpaceGraph = make_space_component(
-    GatheringData.agent_representation, cmap="viridis", vmin=0, vmax=model.price_history[0]*2, 
-    post_process=post_process,
-    
-)
+if custom_env == 1:
+    SpaceGraph = make_space_component(
+        GatheringData.agent_representation, cmap="viridis", vmin=0, vmax=model.price_history[0]*2, 
+        post_process=post_process,
+        
+    )
+
+elif custom_env == 0:
+    SpaceGraph = visuals.NetworkGraph
 
 
 
 """ [5] Run App"""
 # Create the SolaraViz page to serve the interactive visualizations.e
+if run_mode == "background" and custom_env == 0:
+    components = [visuals.BackgroundRun]
+else:
+    components = [visuals.PriceMovement, visuals.CapitalYield, 
+                  visuals.CapitalHistogram, SpaceGraph]
+
 page = SolaraViz(
     model,
-    components=[visuals.PriceMovement, visuals.CapitalYield, 
-                visuals.CapitalHistogram, SpaceGraph],
+    components=components,
     model_params=model_params,
     name="Agent Portfolio Optimisation",
     layout="column",  # Arrange components in a column
@@ -0,0 +1,103 @@
+import threading
+import time
+import numpy as np
+
+
+def read_only(values):
+    values = np.array(values)
+    values.setflags(write=False)
+    return values
+
+
+class ModelSnapshot():
+    # Immutable copy of what the charts read from a TraderNetwork at one step. It exposes the same
+    # attributes/methods as the model (steps, price_history, agent_capital(), network), so every
+    # chart component can render a snapshot in place of the live model.
+    def __init__(self, model):
+        self.source = model  # Live model the snapshot was taken from (only for identity, never read)
+        self.steps = model.steps
+        self.market_date = model.market_date
+        self.running = model.running
+        self.price_history = read_only(model.price_history)
+        self.capital = read_only(model.agent_capital())
+        self.network = model.network  # The topology is fixed for the lifetime of a model
+
+    def agent_capital(self):
+        return self.capital
+
+
+def source_model(model):
+    """
+    Returns the live model behind a snapshot (or the model itself), for use as a memo key.
+    """
+    return getattr(model, "source", model)
+
+
+class BackgroundRunner():
+    # Steps a model in a worker thread at full speed and publishes a ModelSnapshot at most
+    # `fps` times per second; readers only ever see the latest snapshot, intermediate steps are
+    # never rendered. The model must not be touched by anything else while the worker runs.
+    def __init__(self, model, fps=10, max_steps=None):
+        self.model = model
+        self.fps = fps
+        self.max_steps = max_steps  # Stop after this many steps (None runs until model.running is False)
+        self.snapshot = ModelSnapshot(model)
+        self.version = 0  # Incremented on every published snapshot
+        self.error = None
+        self.steps_per_second = 0.0
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.thread = None
+
+    @property
+    def is_running(self):
+        return self.thread is not None and self.thread.is_alive()
+
+    def publish(self):
+        snapshot = ModelSnapshot(self.model)
+        with self.lock:
+            self.snapshot = snapshot
+            self.version += 1
+
+    def latest(self):
+        """
+        Returns (version, snapshot) of the most recently published snapshot.
+        """
+        with self.lock:
+            return self.version, self.snapshot
+
+    def work(self):
+        started = last_publish = time.perf_counter()
+        steps = 0
+        try:
+            while self.model.running and not self.stop_event.is_set():
+                if self.max_steps is not None and steps >= self.max_steps:
+                    break
+                self.model.step()
+                steps += 1
+
+                now = time.perf_counter()
+                if now - last_publish >= 1 / self.fps:
+                    self.steps_per_second = steps / (now - started)
+                    self.publish()
+                    last_publish = now
+        except Exception as e:
+            self.error = e
+        finally:
+            # The final state is always published, even if it fell between two frames
+            elapsed = time.perf_counter() - started
+            self.steps_per_second = steps / elapsed if elapsed > 0 else 0.0
+            self.publish()
+
+    def start(self):
+        if self.is_running:
+            return
+        self.stop_event.clear()
+        self.error = None
+        self.thread = threading.Thread(target=self.work, name="model-runner", daemon=True)
+        self.thread.start()
+
+    def stop(self, timeout=None):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout)
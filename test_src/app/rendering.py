@@ -0,0 +1,262 @@
+import weakref
+import numpy as np
+import networkx as nx
+from matplotlib import colormaps
+from matplotlib.cm import ScalarMappable
+from matplotlib.collections import LineCollection
+from matplotlib.colors import Normalize
+from matplotlib.figure import Figure
+
+
+class SeriesBuffer():
+    # Fixed-size history of one value per agent per sample. When full, every other sample is
+    # dropped and only every second new sample is kept, so the buffer always spans the whole run
+    # at a resolution that halves as the run grows. The latest sample is always shown: samples
+    # between two kept ones overwrite a tail slot after the kept samples.
+    def __init__(self, num_agents, capacity=2048):
+        self.capacity = capacity - capacity % 2
+        self.values = np.empty((num_agents, self.capacity + 1))  # The extra column is the tail slot
+        self.steps = np.empty(self.capacity + 1)
+        self.length = 0  # Kept samples
+        self.tail = False  # Whether the tail slot holds a sample newer than the kept ones
+        self.stride = 1  # Samples kept: one in every `stride` appended
+        self.appended = 0
+
+    def append(self, step, values):
+        keep = self.appended % self.stride == 0
+        self.appended += 1
+        if keep and self.length == self.capacity:
+            half = self.capacity // 2
+            self.values[:, :half] = self.values[:, 0:self.capacity:2]
+            self.steps[:half] = self.steps[0:self.capacity:2]
+            self.length = half
+            self.stride *= 2
+            self.appended = 1  # Restart the stride count from this kept sample
+
+        self.values[:, self.length] = values
+        self.steps[self.length] = step
+        if keep:
+            self.length += 1
+        self.tail = not keep
+
+    def series(self):
+        end = self.length + self.tail
+        return self.steps[:end], self.values[:, :end]
+
+
+def minmax_downsample(x, y, num_buckets):
+    """
+    Reduces every row of y (shape (rows, n)) to at most 2*num_buckets points by keeping the min and
+    max of each bucket in time order, which preserves the visible envelope of each line.
+    Returns (x, y) with shapes (rows, m) and (rows, m).
+    """
+    rows, n = y.shape
+    if n <= 2 * num_buckets:
+        return np.broadcast_to(x, y.shape), y
+
+    # Trim to a whole number of buckets (the last, partial bucket keeps its final point)
+    size = n // num_buckets
+    whole = size * num_buckets
+    buckets = y[:, :whole].reshape(rows, num_buckets, size)
+    offsets = np.arange(num_buckets) * size
+
+    low = buckets.argmin(axis=2) + offsets
+    high = buckets.argmax(axis=2) + offsets
+    index = np.sort(np.concatenate([low, high], axis=1), axis=1)
+    if whole < n:
+        index = np.concatenate([index, np.full((rows, 1), n - 1)], axis=1)
+
+    return x[index], np.take_along_axis(y, index, axis=1)
+
+
+class CapitalYieldRenderer():
+    # Keeps one figure per model and updates it in place: one line per agent (downsampled to the
+    # figure's pixel width), or percentile bands of the capital distribution for large populations
+    def __init__(self, num_agents, max_lines=50, capacity=2048, bands=(10, 25, 50, 75, 90), legend=True):
+        self.use_bands = num_agents > max_lines
+        self.bands = bands
+        # In band mode only the percentiles of each step are kept, not every agent's capital
+        self.buffer = SeriesBuffer(len(bands) if self.use_bands else num_agents, capacity)
+        self.last_step = None
+
+        self.figure = Figure()
+        self.ax = self.figure.subplots()
+        self.ax.set_xlabel("Unit Time")
+        self.ax.set_ylabel("Capital")
+        self.ax.grid(True, linestyle="-", alpha=0.3)
+
+        if self.use_bands:
+            self.ax.set_title(f"Agent Capital Over Time (percentiles of {num_agents} agents)")
+            self.median, = self.ax.plot([], [], linestyle="-", color="C0", label="Median")
+            self.fills = []
+        else:
+            self.ax.set_title("Agent Capital Over Time")
+            self.lines = [self.ax.plot([], [], linestyle="-", alpha=0.5, label=f"Agent {agent_id + 1}")[0] for agent_id in range(num_agents)]
+            if legend:
+                self.ax.legend(title="Agents", loc="upper left", fontsize="5.5", bbox_to_anchor=(1.0, 1.15))
+
+    @property
+    def pixel_width(self):
+        return int(self.figure.get_figwidth() * self.figure.dpi)
+
+    def update(self, step, capital_values):
+        """
+        Adds the capital of every agent at step (once per step) and refreshes the artists.
+        """
+        if step != self.last_step:
+            values = np.asarray(capital_values, dtype=float)
+            self.buffer.append(step, np.percentile(values, self.bands) if self.use_bands else values)
+            self.last_step = step
+
+        steps, values = self.buffer.series()
+        if len(steps) == 0:
+            return self.figure
+
+        if self.use_bands:
+            self.draw_bands(steps, values)
+        else:
+            x, y = minmax_downsample(steps, values, max(self.pixel_width // 2, 1))
+            for line, line_x, line_y in zip(self.lines, x, y):
+                line.set_data(line_x, line_y)
+
+        self.ax.relim()
+        if self.use_bands:
+            # relim only sees lines, so add the outer band's extent for the autoscale
+            self.ax.update_datalim([(steps[0], values[0].min()), (steps[-1], values[-1].max())])
+        self.ax.autoscale_view()
+        self.ax.set_xlim(left=0)  # X min is 0
+        return self.figure
+
+    def draw_bands(self, steps, percentiles):
+        # The percentile curves are smooth, so evenly spaced samples at the pixel width are enough
+        if len(steps) > self.pixel_width:
+            index = np.linspace(0, len(steps) - 1, self.pixel_width).astype(int)
+            steps, percentiles = steps[index], percentiles[:, index]
+
+        middle = len(self.bands) // 2
+        self.median.set_data(steps, percentiles[middle])
+        for fill in self.fills:
+            fill.remove()
+        self.fills = [
+            self.ax.fill_between(steps, percentiles[i], percentiles[-1 - i], color="C0", alpha=0.15, linewidth=0)
+            for i in range(middle)
+        ]
+
+
+def smooth_layout(num_nodes, sources, targets, iterations=30, seed=0):
+    """
+    Fast O(iterations * (n + m)) layout for large graphs: random positions repeatedly pulled
+    towards the mean of their neighbours, re-centred and re-scaled each pass so they do not collapse.
+    Returns an (n, 2) array in [-1, 1].
+    """
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform(-1, 1, size=(num_nodes, 2))
+    degree = np.bincount(sources, minlength=num_nodes) + np.bincount(targets, minlength=num_nodes)
+    has_neighbours = degree > 0
+
+    for _ in range(iterations):
+        neighbour_sum = np.stack([
+            np.bincount(sources, weights=positions[targets, axis], minlength=num_nodes)
+            + np.bincount(targets, weights=positions[sources, axis], minlength=num_nodes)
+            for axis in range(2)
+        ], axis=1)
+        positions[has_neighbours] = 0.5*positions[has_neighbours] + 0.5*neighbour_sum[has_neighbours] / degree[has_neighbours, None]
+        positions -= positions.mean(axis=0)
+        positions /= positions.std(axis=0) + 1e-12
+
+    return positions / (np.abs(positions).max() + 1e-12)
+
+
+class LayoutCache():
+    # Node positions computed once per topology (CSRGraph) and reused for every frame and session
+    def __init__(self, spring_limit=500):
+        self.spring_limit = spring_limit  # Larger graphs use smooth_layout instead of nx.spring_layout
+        self.positions = weakref.WeakKeyDictionary()
+
+    def layout(self, csr, seed=0):
+        positions = self.positions.get(csr)
+        if positions is None:
+            if csr.num_nodes <= self.spring_limit:
+                pos = nx.spring_layout(csr.to_networkx(), seed=seed)
+                positions = np.array([pos[node] for node in range(csr.num_nodes)]).reshape(-1, 2)
+            else:
+                positions = smooth_layout(csr.num_nodes, *csr.edges(), seed=seed)
+            self.positions[csr] = positions
+        return positions
+
+
+LAYOUTS = LayoutCache()
+
+
+class NetworkRenderer():
+    # Draws the trader network once and afterwards only recolours/resizes the nodes each step.
+    # Up to raster_limit nodes, edges are one LineCollection and nodes one scatter; above it, nodes
+    # and edges are binned into an image (the edge layer is computed once) so large graphs stay interactive.
+    def __init__(self, csr, cmap="viridis", vmin=0, vmax=1, size=500, label_limit=50, raster_limit=2000, resolution=600):
+        self.csr = csr
+        self.positions = LAYOUTS.layout(csr)
+        self.size = size
+        self.raster = csr.num_nodes > raster_limit
+        self.cmap = colormaps[cmap]
+        self.norm = Normalize(vmin=vmin, vmax=vmax)
+
+        self.figure = Figure(figsize=(7.5, 5.5))
+        self.ax = self.figure.subplots()
+        self.ax.set_xlim([-1.2, 1.2])
+        self.ax.set_ylim([-1.2, 1.2])
+        self.ax.set_axis_off()
+
+        if self.raster:
+            self.resolution = resolution
+            self.pixels = self.to_pixels(self.positions)
+            self.edge_layer = self.edge_density()
+            self.image = self.ax.imshow(np.zeros((resolution, resolution, 4)), extent=(-1.2, 1.2, -1.2, 1.2), origin="lower", interpolation="nearest")
+        else:
+            sources, targets = csr.edges()
+            segments = np.stack([self.positions[sources], self.positions[targets]], axis=1)
+            self.ax.add_collection(LineCollection(segments, colors="grey", linewidths=0.5, alpha=0.5, zorder=0))
+            self.nodes = self.ax.scatter(self.positions[:, 0], self.positions[:, 1], c=np.zeros(csr.num_nodes), cmap=self.cmap, norm=self.norm, s=size, zorder=1)
+
+            # Node labels only while they stay readable
+            if csr.num_nodes <= label_limit:
+                for i, (x, y) in enumerate(self.positions):
+                    self.ax.text(x, y, f"A{i+1}", fontsize=9, ha="center", va="center", color="white", fontweight="bold")
+
+        self.figure.colorbar(ScalarMappable(norm=self.norm, cmap=self.cmap), ax=self.ax, label="Capital Value")
+
+    def to_pixels(self, points):
+        # Flat pixel index of each point in the resolution x resolution image covering [-1.2, 1.2]^2
+        scaled = np.clip(((points + 1.2) / 2.4 * self.resolution).astype(np.int64), 0, self.resolution - 1)
+        return scaled[..., 1] * self.resolution + scaled[..., 0]
+
+    def edge_density(self, samples=16):
+        # Each edge is sampled at evenly spaced points; the image holds log-scaled hit counts
+        sources, targets = self.csr.edges()
+        t = np.linspace(0, 1, samples)[:, None, None]
+        points = self.positions[sources][None] * (1 - t) + self.positions[targets][None] * t
+        counts = np.bincount(self.to_pixels(points).ravel(), minlength=self.resolution**2)
+        density = np.log1p(counts) / max(np.log1p(counts.max()), 1)
+
+        layer = np.zeros((self.resolution**2, 4))
+        layer[:, :3] = 0.5  # Grey edges
+        layer[:, 3] = 0.6 * density
+        return layer
+
+    def update(self, capital_values):
+        """
+        Recolours (and resizes) the nodes from the agents' capital (indexed by node).
+        """
+        capital = np.asarray(capital_values, dtype=float)
+        if self.raster:
+            # Mean capital of the nodes falling in each pixel, drawn over the edge layer
+            counts = np.bincount(self.pixels, minlength=self.resolution**2)
+            sums = np.bincount(self.pixels, weights=capital, minlength=self.resolution**2)
+            occupied = counts > 0
+            rgba = self.edge_layer.copy()
+            rgba[occupied] = self.cmap(self.norm(sums[occupied] / counts[occupied]))
+            self.image.set_data(rgba.reshape(self.resolution, self.resolution, 4))
+        else:
+            # Agents out of capital are drawn at half size
+            self.nodes.set_array(capital)
+            self.nodes.set_sizes(np.where(capital > 0, self.size, self.size/2))
+        return self.figure
@@ -0,0 +1,178 @@
+import hashlib
+import json
+import os
+import shutil
+import numpy as np
+import pandas as pd
+
+
+# Binance kline columns kept in the cache (close_time and ignore are dropped)
+KLINE_COLUMNS = {
+    "timestamp": np.int64,  # Open time in ns since the epoch
+    "open": np.float64,
+    "high": np.float64,
+    "low": np.float64,
+    "close": np.float64,
+    "volume": np.float64,
+    "quote_asset_volume": np.float64,
+    "number_of_trades": np.int64,
+    "taker_buy_base_asset_volume": np.float64,
+    "taker_buy_quote_asset_volume": np.float64,
+}
+
+MANIFEST = "manifest.json"
+CACHE_VERSION = 1
+
+
+# Helper functions that identify the source file: mtime/size is checked first, the hash only when they change
+def file_signature(path):
+    stat = os.stat(path)
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+
+
+def file_hash(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def default_cache_dir(csv_path):
+    directory, name = os.path.split(os.path.abspath(csv_path))
+    return os.path.join(directory, ".cache", os.path.splitext(name)[0])
+
+
+def build_cache(csv_path, cache_dir, chunk_rows=100_000):
+    """
+    Converts a kline CSV into one raw binary file per column (<cache_dir>/<column>.bin) plus a manifest.
+    The CSV is parsed in chunks of chunk_rows, so files larger than memory can be converted.
+    """
+    tmp_dir = cache_dir.rstrip(os.sep) + ".tmp"
+    if os.path.exists(tmp_dir):
+        shutil.rmtree(tmp_dir)
+    os.makedirs(tmp_dir)
+
+    files = {name: open(os.path.join(tmp_dir, f"{name}.bin"), "wb") for name in KLINE_COLUMNS}
+    rows = 0
+    try:
+        for chunk in pd.read_csv(csv_path, usecols=list(KLINE_COLUMNS), chunksize=chunk_rows):
+            chunk["timestamp"] = pd.to_datetime(chunk["timestamp"]).astype("datetime64[ns]").astype(np.int64)
+            for name, dtype in KLINE_COLUMNS.items():
+                chunk[name].to_numpy(dtype=dtype).tofile(files[name])
+            rows += len(chunk)
+    finally:
+        for f in files.values():
+            f.close()
+
+    manifest = {
+        "version": CACHE_VERSION,
+        "source": os.path.abspath(csv_path),
+        "rows": rows,
+        "columns": {name: np.dtype(dtype).str for name, dtype in KLINE_COLUMNS.items()},
+        "sha256": file_hash(csv_path),
+        **file_signature(csv_path),
+    }
+    with open(os.path.join(tmp_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f)
+
+    if os.path.exists(cache_dir):
+        shutil.rmtree(cache_dir)
+    os.replace(tmp_dir, cache_dir)
+    return manifest
+
+
+def cache_is_valid(csv_path, cache_dir):
+    """
+    Returns whether the cache was built from the current contents of csv_path.
+    A changed mtime/size with an unchanged hash (e.g. a touched file) refreshes the manifest instead.
+    """
+    manifest_path = os.path.join(cache_dir, MANIFEST)
+    if not os.path.exists(manifest_path):
+        return False
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest.get("version") != CACHE_VERSION:
+        return False
+
+    signature = file_signature(csv_path)
+    if all(manifest[key] == value for key, value in signature.items()):
+        return True
+    if signature["size"] != manifest["size"] or file_hash(csv_path) != manifest["sha256"]:
+        return False
+
+    manifest.update(signature)
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f)
+    return True
+
+
+class KlineData():
+    # Memory-mapped columnar kline data (read-only); columns are only paged in when accessed
+    def __init__(self, cache_dir):
+        with open(os.path.join(cache_dir, MANIFEST)) as f:
+            self.manifest = json.load(f)
+        self.rows = self.manifest["rows"]
+        self.columns = {
+            name: np.memmap(os.path.join(cache_dir, f"{name}.bin"), dtype=np.dtype(dtype), mode="r", shape=(self.rows,))
+            if self.rows > 0 else np.empty(0, dtype=np.dtype(dtype))
+            for name, dtype in self.manifest["columns"].items()
+        }
+
+    def __len__(self):
+        return self.rows
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def timestamps(self):
+        return self.columns["timestamp"].view("datetime64[ns]")
+
+
+def open_klines(csv_path, cache_dir=None):
+    """
+    Returns the kline data of csv_path from its binary cache, building the cache first if it is
+    missing or out of date.
+    """
+    cache_dir = cache_dir or default_cache_dir(csv_path)
+    if not cache_is_valid(csv_path, cache_dir):
+        build_cache(csv_path, cache_dir)
+    return KlineData(cache_dir)
+
+
+class KlineReplayFeed():
+    # Replays one kline column (close by default) into the model one bar per step.
+    # Same interface as GBMPriceEngine (next_price); bars are copied out of the memory map in chunks.
+    def __init__(self, klines, column="close", start=0, chunk_size=4096):
+        self.klines = klines
+        self.column = column
+        self.chunk_size = chunk_size
+        self.seek(start)
+
+    def seek(self, index):
+        # Makes bar `index` the current one
+        self.index = index
+        self.chunk = np.empty(0)
+        self.chunk_start = index + 1
+
+    @property
+    def current_price(self):
+        return float(self.klines[self.column][self.index])
+
+    @property
+    def exhausted(self):
+        return self.index + 1 >= len(self.klines)
+
+    def refill(self):
+        self.chunk_start = self.index + 1
+        self.chunk = np.array(self.klines[self.column][self.chunk_start:self.chunk_start + self.chunk_size])
+
+    def next_price(self):
+        """Returns the price of the next bar."""
+        if self.exhausted:
+            raise IndexError("The kline feed has no more bars")
+        if self.index + 1 - self.chunk_start >= len(self.chunk):
+            self.refill()
+
+        self.index += 1
+        return float(self.chunk[self.index - self.chunk_start])
@@ -0,0 +1,57 @@
+import os
+import threading
+import pandas as pd
+from test_src.data_gathering.kline_cache import (
+    open_klines
+)
+
+
+# Kline data used by the demo price chart
+DEFAULT_PRICE_DATA = "data/BTCUSDT_kline_1h_bt=180d.csv"
+
+
+class PriceDataCache():
+    # Process-wide cache of kline DataFrames, shared by every chart component and Solara session.
+    # Each file is loaded once (from its binary kline cache, without parsing the CSV) and kept
+    # until invalidate() is called.
+    def __init__(self):
+        self.frames = {}
+        self.lock = threading.Lock()
+
+    def load(self, path):
+        klines = open_klines(path)
+        price_data = pd.DataFrame({name: klines[name] for name in klines.columns if name != "timestamp"})
+
+        # Timestamp index named "date" (required by mplfinance)
+        price_data.index = pd.DatetimeIndex(klines.timestamps(), name="date")
+        return price_data
+
+    def get(self, path=DEFAULT_PRICE_DATA):
+        """
+        Returns the kline DataFrame of path, indexed by date. Callers must not modify it.
+        """
+        key = os.path.abspath(path)
+        price_data = self.frames.get(key)
+        if price_data is None:
+            with self.lock:
+                price_data = self.frames.get(key)
+                if price_data is None:
+                    price_data = self.frames[key] = self.load(path)
+        return price_data
+
+    def window(self, start, stop, path=DEFAULT_PRICE_DATA):
+        # Rows start:stop of the cached DataFrame (a slice, not a reload)
+        return self.get(path).iloc[start:stop]
+
+    def invalidate(self, path=None):
+        """
+        Drops the cached DataFrame of path (or of every file), so it is reloaded on next use.
+        """
+        with self.lock:
+            if path is None:
+                self.frames.clear()
+            else:
+                self.frames.pop(os.path.abspath(path), None)
+
+
+PRICE_CACHE = PriceDataCache()
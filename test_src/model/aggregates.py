@@ -0,0 +1,98 @@
+import numpy as np
+
+
+class IncrementalAggregate():
+    # Base class for population aggregates that are updated when a single agent changes,
+    # instead of being recomputed by scanning every agent.
+    # reset() recomputes the value from arrays of every agent's capital and state value.
+    def __init__(self):
+        self.value = 0
+
+    def reset(self, capital, state):
+        raise NotImplementedError
+
+    def capital_changed(self, old, new):
+        pass
+
+    def state_changed(self, old, new):
+        pass
+
+
+class StateCount(IncrementalAggregate):
+    # Number of agents in the given TraderState
+    def __init__(self, state):
+        super().__init__()
+        self.state = state
+
+    def reset(self, capital, state):
+        self.value = int(np.count_nonzero(state == self.state.value))
+
+    def state_changed(self, old, new):
+        if old is self.state:
+            self.value -= 1
+        if new is self.state:
+            self.value += 1
+
+
+class TotalCapital(IncrementalAggregate):
+    # Sum of every agent's capital
+    def reset(self, capital, state):
+        self.value = float(np.sum(capital))
+
+    def capital_changed(self, old, new):
+        self.value += new - old
+
+
+class CountAbove(IncrementalAggregate):
+    # Number of agents with capital strictly above threshold
+    def __init__(self, threshold):
+        super().__init__()
+        self.threshold = threshold
+
+    def reset(self, capital, state):
+        self.value = int(np.count_nonzero(capital > self.threshold))
+
+    def capital_changed(self, old, new):
+        self.value += int(new > self.threshold) - int(old > self.threshold)
+
+
+class Aggregates():
+    # Named incremental aggregates kept up to date by the trader agents.
+    # TraderAgent calls capital_changed/state_changed whenever its capital or state is assigned, so
+    # reading an aggregate (e.g. in a DataCollector reporter) is O(1).
+    def __init__(self, model):
+        self.model = model
+        self.aggregates = {}
+        self.capital_listeners = []
+        self.state_listeners = []
+
+    def register(self, name, aggregate):
+        """
+        Adds an aggregate under name, initialised from the agents that already exist.
+        """
+        self.aggregates[name] = aggregate
+        if type(aggregate).capital_changed is not IncrementalAggregate.capital_changed:
+            self.capital_listeners.append(aggregate)
+        if type(aggregate).state_changed is not IncrementalAggregate.state_changed:
+            self.state_listeners.append(aggregate)
+        aggregate.reset(self.model.agent_capital(), self.model.agent_states())
+        return aggregate
+
+    def reset(self, capital, state):
+        # Recomputes every aggregate from arrays (used by the vectorised engine)
+        for aggregate in self.aggregates.values():
+            aggregate.reset(capital, state)
+
+    def capital_changed(self, old, new):
+        for aggregate in self.capital_listeners:
+            aggregate.capital_changed(old, new)
+
+    def state_changed(self, old, new):
+        for aggregate in self.state_listeners:
+            aggregate.state_changed(old, new)
+
+    def __getitem__(self, name):
+        return self.aggregates[name].value
+
+    def __contains__(self, name):
+        return name in self.aggregates
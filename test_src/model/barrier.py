@@ -0,0 +1,361 @@
+import numpy as np
+
+
+class BarrierIndex():
+    # Segment tree of running max/min over a growing price series, used to find the first price
+    # that crosses a take-profit (up) or stop (down) barrier in O(log n).
+    # Indices are positions in the whole series. With a window, only the latest `window` prices have
+    # to stay queryable: once the tree is full, the older leaves are dropped and the tree rebuilt,
+    # so it holds at most 2 * window prices however long the series grows.
+    def __init__(self, prices=(), capacity=1024, window=None, offset=0):
+        """
+        offset is the position of prices[0] in the series (when resuming a windowed series).
+        """
+        self.window = window
+        self.offset = offset  # Position of the first leaf in the series
+        self.capacity = 1
+        while self.capacity < max(capacity, len(prices), 2 * (window or 0)):
+            self.capacity *= 2
+
+        # Node i covers the leaves of its children 2i and 2i+1; empty leaves can never be crossed
+        self.max_tree = np.full(2 * self.capacity, -np.inf)
+        self.min_tree = np.full(2 * self.capacity, np.inf)
+        self.length = 0  # Prices held in the leaves
+        self.extend(prices)
+
+    def __len__(self):
+        # Prices in the whole series, including the ones dropped before the window
+        return self.offset + self.length
+
+    @property
+    def prices(self):
+        # The prices still held, from position offset onwards
+        return self.max_tree[self.capacity:self.capacity + self.length]
+
+    def rebuild(self):
+        # Recomputes every internal node, one level at a time
+        low = self.capacity // 2
+        while low >= 1:
+            high = 2 * low
+            self.max_tree[low:high] = np.maximum(self.max_tree[2*low:2*high:2], self.max_tree[2*low+1:2*high:2])
+            self.min_tree[low:high] = np.minimum(self.min_tree[2*low:2*high:2], self.min_tree[2*low+1:2*high:2])
+            low //= 2
+
+    def grow(self, needed):
+        highs = self.max_tree[self.capacity:self.capacity + self.length].copy()
+        lows = self.min_tree[self.capacity:self.capacity + self.length].copy()
+        while self.capacity < needed:
+            self.capacity *= 2
+        self.max_tree = np.full(2 * self.capacity, -np.inf)
+        self.min_tree = np.full(2 * self.capacity, np.inf)
+        self.max_tree[self.capacity:self.capacity + len(highs)] = highs
+        self.min_tree[self.capacity:self.capacity + len(lows)] = lows
+        self.rebuild()
+
+    def compact(self):
+        # Moves the latest `window` leaves to the front and drops the older ones
+        drop = self.length - self.window
+        for tree, empty in ((self.max_tree, -np.inf), (self.min_tree, np.inf)):
+            tree[self.capacity:self.capacity + self.window] = tree[self.capacity + drop:self.capacity + self.length].copy()
+            tree[self.capacity + self.window:self.capacity + self.length] = empty
+        self.offset += drop
+        self.length = self.window
+        self.rebuild()
+
+    def reserve(self, count):
+        # Makes room for count more leaves, dropping the prices before the window before growing
+        if self.length + count <= self.capacity:
+            return
+        if self.window is not None and self.length > self.window:
+            self.compact()
+        if self.length + count > self.capacity:
+            self.grow(self.length + count)
+
+    def append(self, price):
+        """
+        Adds one price to the end of the series, updating the leaf's ancestors.
+        """
+        self.append_range(float(price), float(price))
+
+    def append_range(self, high, low):
+        self.reserve(1)
+
+        node = self.capacity + self.length
+        self.max_tree[node] = high
+        self.min_tree[node] = low
+        self.length += 1
+
+        # Ancestors only change while the new leaf is a new max or min of their range
+        node //= 2
+        while node >= 1 and (high > self.max_tree[node] or low < self.min_tree[node]):
+            self.max_tree[node] = max(self.max_tree[node], high)
+            self.min_tree[node] = min(self.min_tree[node], low)
+            node //= 2
+
+    def extend(self, prices):
+        prices = np.asarray(prices, dtype=float)
+        self.extend_range(prices, prices)
+
+    def extend_range(self, highs, lows):
+        self.reserve(len(highs))
+
+        self.max_tree[self.capacity + self.length:self.capacity + self.length + len(highs)] = highs
+        self.min_tree[self.capacity + self.length:self.capacity + self.length + len(lows)] = lows
+        self.length += len(highs)
+        self.rebuild()
+
+    def crosses(self, node, up, down):
+        return self.max_tree[node] >= up or self.min_tree[node] <= down
+
+    def first_hit(self, up, down, start=0):
+        """
+        Returns (index, hit_up) of the first price at or after start with price >= up or
+        price <= down, or (-1, False) if neither barrier is ever crossed.
+        """
+        if start < self.offset:
+            raise IndexError(f"Prices before {self.offset} are no longer held (window of {self.window})")
+        if start >= len(self):
+            return -1, False
+
+        # Walk right from the start leaf until a node's range contains a crossing
+        node = self.capacity + start - self.offset
+        while not self.crosses(node, up, down):
+            while node & 1:
+                node //= 2
+            if node == 0:
+                return -1, False
+            node += 1
+
+        # Descend to the leftmost crossing leaf
+        while node < self.capacity:
+            node = 2 * node if self.crosses(2 * node, up, down) else 2 * node + 1
+
+        # The take-profit barrier is checked first, so it wins a tie
+        index = self.offset + node - self.capacity
+        return index, bool(self.max_tree[node] >= up)
+
+    def touch(self, up, down, start=0):
+        """
+        Returns (index, hit_up, price) of the first crossing at or after start, where price is
+        the crossing price, or (-1, False, nan) if neither barrier is crossed.
+        """
+        index, hit_up = self.first_hit(up, down, start)
+        if index < 0:
+            return -1, False, np.nan
+        return index, hit_up, float(self.prices[index - self.offset])
+
+
+# Rules for a bar whose range contains both barriers: which one was touched first
+OHLC_TIE_RULES = ("open", "up", "down")
+
+
+class OHLCBarrierIndex(BarrierIndex):
+    # Barrier index over OHLC bars: the max tree holds each bar's high and the min tree its low,
+    # so a barrier counts as touched whenever it lies inside a bar's range, not only at its close
+    def __init__(self, opens=(), highs=(), lows=(), closes=(), capacity=1024, tie="open", window=None, offset=0):
+        """
+        tie decides a bar that touches both barriers: "up" or "down" always pick that barrier,
+        "open" picks the barrier nearest to the bar's open.
+        """
+        if tie not in OHLC_TIE_RULES:
+            raise ValueError(f"Unknown tie rule: {tie}")
+        self.tie = tie
+        self.opens = np.empty(0)
+        self.closes = np.empty(0)
+        super().__init__(capacity=capacity, window=window, offset=offset)
+        self.opens = np.empty(self.capacity)
+        self.closes = np.empty(self.capacity)
+        self.extend_bars(opens, highs, lows, closes)
+
+    @property
+    def prices(self):
+        return self.closes[:self.length]
+
+    def grow(self, needed):
+        super().grow(needed)
+        if len(self.closes) < self.capacity:
+            self.opens = np.concatenate([self.opens, np.empty(self.capacity - len(self.opens))])
+            self.closes = np.concatenate([self.closes, np.empty(self.capacity - len(self.closes))])
+
+    def compact(self):
+        drop = self.length - self.window
+        self.opens[:self.window] = self.opens[drop:self.length].copy()
+        self.closes[:self.window] = self.closes[drop:self.length].copy()
+        super().compact()
+
+    def append_bar(self, open_, high, low, close):
+        self.reserve(1)
+        self.opens[self.length] = open_
+        self.closes[self.length] = close
+        self.append_range(float(high), float(low))
+
+    def extend_bars(self, opens, highs, lows, closes):
+        closes = np.asarray(closes, dtype=float)
+        self.reserve(len(closes))
+        self.opens[self.length:self.length + len(closes)] = opens
+        self.closes[self.length:self.length + len(closes)] = closes
+        self.extend_range(np.asarray(highs, dtype=float), np.asarray(lows, dtype=float))
+
+    def touch(self, up, down, start=0):
+        """
+        Returns (index, hit_up, price) of the first bar at or after start whose range reaches
+        either barrier. A bar that opens beyond a barrier fills at its open, otherwise at the barrier.
+        """
+        index, _ = self.first_hit(up, down, start)
+        if index < 0:
+            return -1, False, np.nan
+
+        leaf = index - self.offset
+        node = self.capacity + leaf
+        open_ = self.opens[leaf]
+        reaches_up = self.max_tree[node] >= up
+        reaches_down = self.min_tree[node] <= down
+        if reaches_up and reaches_down:
+            if self.tie == "open":
+                hit_up = up - open_ <= open_ - down
+            else:
+                hit_up = self.tie == "up"
+        else:
+            hit_up = bool(reaches_up)
+
+        if hit_up:
+            return index, True, float(max(up, open_))
+        return index, False, float(min(down, open_))
+
+
+class BatchBarrierIndex():
+    # BarrierIndex over K price series of equal length (one per replica), stored as (K, 2 * capacity)
+    # trees. Every series shares the same query start, so a query visits the same O(log n) canonical
+    # nodes in each row and runs as a fixed number of vectorised operations whatever K is.
+    # Indices and the window work as in BarrierIndex.
+    def __init__(self, prices, capacity=1024, window=None):
+        """
+        prices is a (K, n) array of the initial prices of every series.
+        """
+        prices = np.atleast_2d(np.asarray(prices, dtype=float))
+        self.num_series = prices.shape[0]
+        self.window = window
+        self.offset = 0
+        self.capacity = 1
+        while self.capacity < max(capacity, prices.shape[1], 2 * (window or 0)):
+            self.capacity *= 2
+
+        self.max_tree = np.full((self.num_series, 2 * self.capacity), -np.inf)
+        self.min_tree = np.full((self.num_series, 2 * self.capacity), np.inf)
+        self.length = 0
+        self.extend(prices)
+
+    def __len__(self):
+        return self.offset + self.length
+
+    @property
+    def prices(self):
+        return self.max_tree[:, self.capacity:self.capacity + self.length]
+
+    def rebuild(self):
+        low = self.capacity // 2
+        while low >= 1:
+            high = 2 * low
+            self.max_tree[:, low:high] = np.maximum(self.max_tree[:, 2*low:2*high:2], self.max_tree[:, 2*low+1:2*high:2])
+            self.min_tree[:, low:high] = np.minimum(self.min_tree[:, 2*low:2*high:2], self.min_tree[:, 2*low+1:2*high:2])
+            low //= 2
+
+    def grow(self, needed):
+        prices = self.prices.copy()
+        while self.capacity < needed:
+            self.capacity *= 2
+        self.max_tree = np.full((self.num_series, 2 * self.capacity), -np.inf)
+        self.min_tree = np.full((self.num_series, 2 * self.capacity), np.inf)
+        self.max_tree[:, self.capacity:self.capacity + prices.shape[1]] = prices
+        self.min_tree[:, self.capacity:self.capacity + prices.shape[1]] = prices
+        self.rebuild()
+
+    def compact(self):
+        drop = self.length - self.window
+        for tree, empty in ((self.max_tree, -np.inf), (self.min_tree, np.inf)):
+            tree[:, self.capacity:self.capacity + self.window] = tree[:, self.capacity + drop:self.capacity + self.length].copy()
+            tree[:, self.capacity + self.window:self.capacity + self.length] = empty
+        self.offset += drop
+        self.length = self.window
+        self.rebuild()
+
+    def reserve(self, count):
+        if self.length + count <= self.capacity:
+            return
+        if self.window is not None and self.length > self.window:
+            self.compact()
+        if self.length + count > self.capacity:
+            self.grow(self.length + count)
+
+    def append(self, prices):
+        """
+        Adds one price (shape (K,)) to the end of every series.
+        """
+        self.reserve(1)
+
+        node = self.capacity + self.length
+        self.max_tree[:, node] = prices
+        self.min_tree[:, node] = prices
+        self.length += 1
+
+        node //= 2
+        while node >= 1:
+            np.maximum(self.max_tree[:, node], prices, out=self.max_tree[:, node])
+            np.minimum(self.min_tree[:, node], prices, out=self.min_tree[:, node])
+            node //= 2
+
+    def extend(self, prices):
+        prices = np.asarray(prices, dtype=float)
+        self.reserve(prices.shape[1])
+        self.max_tree[:, self.capacity + self.length:self.capacity + self.length + prices.shape[1]] = prices
+        self.min_tree[:, self.capacity + self.length:self.capacity + self.length + prices.shape[1]] = prices
+        self.length += prices.shape[1]
+        self.rebuild()
+
+    def canonical_nodes(self, start):
+        # Nodes covering the leaves from leaf start to the last one, ordered left to right
+        left, right = [], []
+        low, high = self.capacity + start, self.capacity + self.length
+        while low < high:
+            if low & 1:
+                left.append(low)
+                low += 1
+            if high & 1:
+                high -= 1
+                right.append(high)
+            low //= 2
+            high //= 2
+        return np.array(left + right[::-1], dtype=np.int64)
+
+    def touch(self, up, down, start=0):
+        """
+        Returns (index, hit_up, price) arrays (shape (K,)) of the first crossing at or after start
+        in every series, with -1, False and nan where neither barrier (up/down, shape (K,)) is crossed.
+        """
+        up = np.asarray(up, dtype=float)[:, None]
+        down = np.asarray(down, dtype=float)[:, None]
+        rows = np.arange(self.num_series)
+        index = np.full(self.num_series, -1, dtype=np.int64)
+        hit_up = np.zeros(self.num_series, dtype=bool)
+        price = np.full(self.num_series, np.nan)
+
+        if start < self.offset:
+            raise IndexError(f"Prices before {self.offset} are no longer held (window of {self.window})")
+        nodes = self.canonical_nodes(start - self.offset)
+        if len(nodes) == 0:
+            return index, hit_up, price
+        crosses = (self.max_tree[:, nodes] >= up) | (self.min_tree[:, nodes] <= down)
+        found = crosses.any(axis=1)
+        node = nodes[crosses.argmax(axis=1)]
+
+        # Descend every row to its leftmost crossing leaf (rows already at a leaf stay put)
+        while (node < self.capacity).any():
+            inner = node < self.capacity
+            left = np.where(inner, 2 * node, node)
+            left_crosses = (self.max_tree[rows, left] >= up[:, 0]) | (self.min_tree[rows, left] <= down[:, 0])
+            node = np.where(inner, np.where(left_crosses, left, left + 1), node)
+
+        index[found] = self.offset + node[found] - self.capacity
+        price[found] = self.max_tree[rows[found], node[found]]
+        hit_up[found] = price[found] >= up[found, 0]
+        return index, hit_up, price
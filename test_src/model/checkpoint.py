@@ -0,0 +1,255 @@
+import json
+import os
+import shutil
+import numpy as np
+from test_src.agent.trader import (
+    TraderState
+)
+from test_src.model.topology import (
+    CSRGraph
+)
+
+
+# A checkpoint is a directory of .npy arrays (loaded memory-mapped) plus manifest.json holding
+# the constructor parameters, RNG states and every scalar needed for a bit-exact continuation
+MANIFEST = "manifest.json"
+CHECKPOINT_VERSION = 1
+
+
+# Helper functions that read/write one array of the checkpoint
+def save_array(path, name, values):
+    np.save(os.path.join(path, f"{name}.npy"), np.asarray(values))
+
+
+def load_array(path, name):
+    return np.load(os.path.join(path, f"{name}.npy"), mmap_mode="r")
+
+
+def manifest_value(value, name="manifest"):
+    """
+    Returns value in a form json can write exactly: NumPy scalars as Python numbers, arrays as
+    (nested) lists and dtypes as their dtype string (e.g. "<f4"). Raises TypeError for anything else.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.dtype) or (isinstance(value, type) and issubclass(value, (np.generic, bool, int, float, complex))):
+        return np.dtype(value).str
+    if isinstance(value, (list, tuple)):
+        return [manifest_value(item, f"{name}[{index}]") for index, item in enumerate(value)]
+    if isinstance(value, dict):
+        if not all(isinstance(key, str) for key in value):
+            raise TypeError(f"Cannot save {name} in a checkpoint: keys must be strings")
+        return {key: manifest_value(item, f"{name}.{key}") for key, item in value.items()}
+    raise TypeError(f"Cannot save {name} in a checkpoint: {type(value).__name__} has no JSON form")
+
+
+def checkpoint_directory(path):
+    """
+    Returns the directory holding the checkpoint saved at path: path itself, or the previous
+    checkpoint moved aside to path.old if a save stopped between swapping the two directories.
+    """
+    path = path.rstrip(os.sep)
+    if not os.path.exists(path) and os.path.exists(path + ".old"):
+        return path + ".old"
+    return path
+
+
+def read_manifest(path):
+    with open(os.path.join(path, MANIFEST)) as f:
+        return json.load(f)
+
+
+def strategy_key(strategy_type, params):
+    # The random strategy's {"model": model} params are re-created on restore
+    params = {name: value for name, value in params.items() if name != "model"}
+    return json.dumps([strategy_type, params], sort_keys=True)
+
+
+def save_agents(model, path):
+    if model.engine is not None:
+        engine = model.engine
+        save_array(path, "capital", engine.capital)
+        save_array(path, "win_rate", engine.win_rate)
+        save_array(path, "generocity_rate", engine.generocity_rate)
+        save_array(path, "state", engine.state)
+        save_array(path, "strategy_code", engine.strategy_code)
+        save_array(path, "strategy_group", engine.strategy_group)
+        return {
+            "strategy_groups": [[strategy_type, params] for strategy_type, params in engine.strategy_groups],
+        }
+
+    agents = list(model.agents)
+    groups = {}
+    group = np.array([groups.setdefault(strategy_key(a.strategy_type, a.strategy_params), len(groups)) for a in agents], dtype=np.int32)
+    save_array(path, "capital", [a.capital for a in agents])
+    save_array(path, "win_rate", [a.win_rate for a in agents])
+    save_array(path, "generocity_rate", [a.generocity_rate for a in agents])
+    save_array(path, "state", np.array([a.state.value for a in agents], dtype=np.int8))
+    save_array(path, "strategy_group", group)
+    return {"strategy_groups": [json.loads(key) for key in groups]}
+
+
+def price_engine_state(model):
+    if model.klines is not None:
+        return {"index": model.price_engine.index}
+    return {"last_prices": model.price_engine.last_prices.tolist(), "position": model.price_engine.position}
+
+
+def save_checkpoint(model, path):
+    """
+    Writes the full TraderNetwork state to the directory path. The checkpoint is written to a
+    temporary directory first and swapped in, so a crash mid-write never corrupts the last one
+    (mid-swap, the last one is still at path.old, where checkpoint_directory finds it).
+    """
+    path = path.rstrip(os.sep)
+    tmp_path = path + ".tmp"
+    old_path = path + ".old"
+    if os.path.exists(tmp_path):
+        shutil.rmtree(tmp_path)
+    os.makedirs(tmp_path)
+
+    # Network, price history and pending GBM chunk
+    save_array(tmp_path, "indptr", model.network.csr.indptr)
+    save_array(tmp_path, "indices", model.network.csr.indices)
+    save_array(tmp_path, "history", model.barrier.prices)
+    if model.klines is None:
+        save_array(tmp_path, "price_chunk", model.price_engine.chunk)
+    save_array(tmp_path, "events", model.events.records())
+    for name, values in model.datacollector.model_vars.items():
+        save_array(tmp_path, f"collector_{name}", values)
+    if model.recorder is not None:
+        save_array(tmp_path, "recorded_steps", model.recorder.recorded_steps)
+        for field in ("capital", "win_rate", "state"):
+            save_array(tmp_path, f"recorded_{field}", model.recorder[field])
+
+    params = {name: value for name, value in model.init_params.items() if name not in ("aggregates", "topology")}
+    if isinstance(model.init_params.get("topology"), str):
+        params["topology"] = model.init_params["topology"]
+
+    random_state = model.random.getstate()
+    manifest = {
+        "version": CHECKPOINT_VERSION,
+        "params": params,
+        "steps": model.steps,
+        "market_date": model.market_date,
+        "current_price": model.current_price,
+        "running": model.running,
+        "rng": model.rng.bit_generator.state,
+        "random": [random_state[0], list(random_state[1]), random_state[2]],
+        "price_buffer": {"length": len(model.prices), "total": model.prices.total},
+        "price_engine": price_engine_state(model),
+        "indicators": {str(period): dict(vars(window)) for period, window in model.indicators.windows.items()},
+        "events": {"dropped": model.events.dropped},
+        "aggregates": {name: aggregate.value for name, aggregate in model.aggregates.aggregates.items()},
+        "collector": list(model.datacollector.model_vars),
+        "agents": save_agents(model, tmp_path),
+    }
+    with open(os.path.join(tmp_path, MANIFEST), "w") as f:
+        json.dump(manifest_value(manifest), f)
+
+    # Move the last checkpoint aside before swapping in the new one, and only then delete it
+    if os.path.exists(old_path):
+        shutil.rmtree(old_path)
+    if os.path.exists(path):
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    if os.path.exists(old_path):
+        shutil.rmtree(old_path)
+
+
+def load_network(path):
+    return CSRGraph(np.array(load_array(path, "indptr")), np.array(load_array(path, "indices")))
+
+
+def restore_agents(model, path, manifest):
+    saved = manifest["agents"]
+    capital = np.array(load_array(path, "capital"))
+    win_rate = np.array(load_array(path, "win_rate"))
+    generocity_rate = np.array(load_array(path, "generocity_rate"))
+    state = np.array(load_array(path, "state"))
+    strategy_group = np.array(load_array(path, "strategy_group"))
+
+    if model.engine is not None:
+        engine = model.engine
+        engine.capital, engine.win_rate, engine.generocity_rate, engine.state = capital, win_rate, generocity_rate, state
+        engine.strategy_code = np.array(load_array(path, "strategy_code"))
+        engine.strategy_group = strategy_group
+        engine.strategy_groups = [(strategy_type, params) for strategy_type, params in saved["strategy_groups"]]
+        return
+
+    for index, agent in enumerate(model.agents):
+        strategy_type, params = saved["strategy_groups"][strategy_group[index]]
+        if strategy_type == "random":
+            params = dict(params, model=model)
+        # Private attributes are set directly; the aggregates are restored separately
+        agent._capital = float(capital[index])
+        agent._state = TraderState(int(state[index]))
+        agent.win_rate = float(win_rate[index])
+        agent.generocity_rate = float(generocity_rate[index])
+        agent.strategy_type = strategy_type
+        agent.strategy_params = params
+        model.signal_cache.register(strategy_type, params)
+
+
+def restore_checkpoint(model, path):
+    """
+    Restores a TraderNetwork built from the same parameters and network (see
+    TraderNetwork.from_checkpoint) to the state saved in path.
+    """
+    manifest = read_manifest(path)
+    if manifest["version"] != CHECKPOINT_VERSION:
+        raise ValueError(f"Unsupported checkpoint version: {manifest['version']}")
+
+    # Clocks and random number generators
+    model.steps = manifest["steps"]
+    model.market_date = manifest["market_date"]
+    model.current_price = manifest["current_price"]
+    model.running = manifest["running"]
+    model.rng.bit_generator.state = manifest["rng"]
+    version, internal_state, gauss_next = manifest["random"]
+    model.random.setstate((version, tuple(internal_state), gauss_next))
+
+    # Price history, barrier index, price engine and indicators
+    history = np.array(load_array(path, "history"))
+    buffer = manifest["price_buffer"]
+    model.prices.restore(history[len(history) - buffer["length"]:], buffer["total"])
+    engine = manifest["price_engine"]
+    if model.klines is not None:
+        model.price_engine.seek(engine["index"])
+    else:
+        model.price_engine.chunk = np.array(load_array(path, "price_chunk"))
+        model.price_engine.position = engine["position"]
+        model.price_engine.last_prices = np.array(engine["last_prices"])
+    model.barrier = model.build_barrier(history)
+    model.barrier_query = None
+    model.indicators.windows = {}
+    for period, window_state in manifest["indicators"].items():
+        vars(model.indicators.window(int(period))).update(window_state)
+
+    restore_agents(model, path, manifest)
+
+    # Aggregates, collected data, events and the agent history
+    for name, value in manifest["aggregates"].items():
+        if name in model.aggregates:
+            model.aggregates.aggregates[name].value = value
+    for name in manifest["collector"]:
+        if name in model.datacollector.model_vars:
+            model.datacollector.model_vars[name] = load_array(path, f"collector_{name}").tolist()
+
+    model.events.clear()
+    events = load_array(path, "events")
+    model.events.events[:len(events)] = events[-model.events.capacity:]
+    model.events.count = min(len(events), model.events.capacity)
+    model.events.dropped = manifest["events"]["dropped"]
+
+    if model.recorder is not None and os.path.exists(os.path.join(path, "recorded_steps.npy")):
+        model.recorder.count = 0
+        recorded = [load_array(path, f"recorded_{field}") for field in ("capital", "win_rate", "state")]
+        for row, step in enumerate(load_array(path, "recorded_steps").tolist()):
+            model.recorder.record(step, *(values[row] for values in recorded))
+
+    return model
@@ -0,0 +1,179 @@
+import numpy as np
+import pandas as pd
+from test_src.agent.trader import (
+    TraderState
+)
+from test_src.model.model import (
+    TraderNetwork,
+    STATE_AGGREGATES
+)
+from test_src.model.barrier import (
+    BatchBarrierIndex
+)
+from test_src.model.price_engine import (
+    GBMPriceEngine
+)
+from test_src.model.redistribution import (
+    best_neighbours,
+    redistribute_simultaneous
+)
+
+
+# TraderNetwork parameters the ensemble can run in lockstep (everything else keeps its default)
+ENSEMBLE_PARAMS = (
+    "num_nodes",
+    "avg_node_degree",
+    "topology",
+    "topology_params",
+    "start_price",
+    "volatility",
+    "generocity_rate",
+    "history_length",
+    "price_chunk_size",
+    "engine",
+    "update",
+    "strategy_type",
+)
+
+
+class TraderEnsemble():
+    # K replicas of one TraderNetwork configuration (one seed each) advanced in lockstep.
+    # Each replica is built by TraderNetwork(seed=..., engine="vectorised") so it starts from the same
+    # network, prices and random streams; afterwards the replicas live in (K, N) arrays (their networks
+    # as one block-diagonal CSR graph) and every step is one batched pass, so Python overhead is paid
+    # once per step instead of once per replica. The collected series match the individual runs exactly.
+    def __init__(self, seeds, **params):
+        """
+        seeds is one seed per replica. Only the vectorised engine with simultaneous updates and the
+        random strategy is supported (sequential updates shuffle every replica's agents separately,
+        and the other strategies are evaluated per replica).
+        """
+        unsupported = sorted(set(params) - set(ENSEMBLE_PARAMS))
+        if unsupported:
+            raise ValueError(f"Unsupported ensemble parameters: {unsupported}")
+        if params.get("engine", "vectorised") != "vectorised" or params.get("update", "simultaneous") != "simultaneous":
+            raise ValueError("The ensemble only runs the vectorised engine with simultaneous updates")
+        if params.get("strategy_type", "random") != "random":
+            raise ValueError("The ensemble only runs the random strategy")
+        params = dict(params, engine="vectorised")
+
+        self.seeds = [int(seed) for seed in seeds]
+        replicas = [TraderNetwork(seed=seed, **params) for seed in self.seeds]
+        self.num_replicas = len(replicas)
+        self.num_agents = replicas[0].engine.num_agents
+        if any(replica.engine.num_agents != self.num_agents for replica in replicas):
+            raise ValueError("Every replica must have the same number of agents")
+        engines = [replica.engine for replica in replicas]
+
+        # Agent attributes as (K, N) views of flat arrays laid out replica by replica
+        self.capital = np.concatenate([engine.capital for engine in engines])
+        self.win_rate = np.concatenate([engine.win_rate for engine in engines])
+        self.generocity_rate = np.concatenate([engine.generocity_rate for engine in engines])
+        self.state = np.concatenate([engine.state for engine in engines])
+
+        # Block-diagonal CSR graph of every replica's network
+        node_offsets = np.arange(self.num_replicas) * self.num_agents
+        edge_offsets = np.concatenate([[0], np.cumsum([len(engine.indices) for engine in engines])])
+        self.indptr = np.concatenate([engine.indptr[:-1] + offset for engine, offset in zip(engines, edge_offsets)] + [edge_offsets[-1:]])
+        self.indices = np.concatenate([engine.indices + offset for engine, offset in zip(engines, node_offsets)])
+
+        # Random streams: each replica's own RandomStreams (pre-drawn in blocks of steps)
+        self.streams = [replica.streams for replica in replicas]
+
+        # Prices: one GBM path per replica from the replica's own generator
+        first = replicas[0]
+        self.price_engine = GBMPriceEngine(first.current_price, volatility=first.volatility, rng=[replica.rng for replica in replicas], chunk_size=first.price_engine.chunk_size)
+        self.current_price = np.array([replica.current_price for replica in replicas])
+        self.history_length = params.get("history_length")
+        self.barrier = BatchBarrierIndex(np.array([replica.price_history for replica in replicas]), window=self.history_length)
+        self.market_date = 0
+
+        self.model_vars = {name: [] for name in STATE_AGGREGATES.values()}
+        self.collect()
+
+    def view(self, values):
+        # (K, N) view of a flat per-agent array
+        return values.reshape(self.num_replicas, self.num_agents)
+
+    def next_draws(self):
+        """
+        Returns the (2, K * N) uniforms of this step: the random strategy's draws, then the sharing draws,
+        read from every replica's streams at the current step exactly as a single run reads them.
+        """
+        return np.array([
+            np.concatenate([streams.uniforms(name, self.market_date) for streams in self.streams])
+            for name in ("strategy", "sharing")
+        ])
+
+    def collect(self):
+        has_capital = np.count_nonzero(self.view(self.state == TraderState.HAS_CAPITAL.value), axis=1)
+        self.model_vars[STATE_AGGREGATES[TraderState.HAS_CAPITAL]].append(has_capital)
+        self.model_vars[STATE_AGGREGATES[TraderState.ZERO_CAPITAL]].append(self.num_agents - has_capital)
+
+    def trade_outcomes(self, decision_draws, active):
+        # Same as VectorisedEngine.trade_outcomes, with one barrier query per replica in a single batch
+        buy = decision_draws < 0.5
+        total = len(self.barrier)
+        start = 0 if self.history_length is None else max(0, total - self.history_length)
+        index, hit_up, price = self.barrier.touch(self.current_price*1.001, self.current_price*0.0090, start)
+
+        hit = np.repeat(index >= 0, self.num_agents)
+        delta = np.repeat(price - self.current_price, self.num_agents)
+        trading = active
+        change = np.where(trading & hit, np.where(buy, delta, -delta), 0.0)
+        won = trading & hit & (buy == np.repeat(hit_up, self.num_agents))
+        return trading, change, won
+
+    def step(self):
+        """Advance every replica by one step."""
+        active = self.state == TraderState.HAS_CAPITAL.value
+        decision_draws, sharing_draws = self.next_draws()
+        trading, change, won = self.trade_outcomes(decision_draws, active)
+
+        # Trade action (only agents that traded update their state)
+        self.capital += change
+        self.win_rate += won
+        self.state[trading] = self.capital[trading] > 0
+
+        # Every agent that still has capital may give to its most successful neighbour
+        sharing = active & (self.state == TraderState.HAS_CAPITAL.value)
+        best = best_neighbours(self.indptr, self.indices, self.win_rate[self.indices])
+        donors = np.flatnonzero(sharing & (best >= 0) & (sharing_draws < self.generocity_rate))
+        redistribute_simultaneous(self.capital, donors, best[donors])
+        self.state[sharing] = self.capital[sharing] > 0
+        self.market_date += 1
+
+        # Next price of every replica
+        self.current_price = self.price_engine.next_prices().copy()
+        self.barrier.append(self.current_price)
+        self.collect()
+
+    def run(self, steps):
+        for _ in range(steps):
+            self.step()
+        return self
+
+    def agent_capital(self):
+        # (K, N) capital of every agent of every replica
+        return self.view(self.capital).copy()
+
+    def replica_dataframe(self, replica):
+        """
+        Returns the model series of one replica, as model.datacollector.get_model_vars_dataframe()
+        of the individual TraderNetwork run would.
+        """
+        return pd.DataFrame({name: np.array(values)[:, replica].tolist() for name, values in self.model_vars.items()})
+
+    def model_vars_dataframe(self):
+        """
+        Returns every replica's model series as one long table with columns replica, seed, step, <variables>.
+        """
+        steps = len(next(iter(self.model_vars.values())))
+        table = pd.DataFrame({
+            "replica": np.repeat(np.arange(self.num_replicas), steps),
+            "seed": np.repeat(self.seeds, steps),
+            "step": np.tile(np.arange(steps), self.num_replicas),
+        })
+        for name, values in self.model_vars.items():
+            table[name] = np.array(values).T.ravel()
+        return table
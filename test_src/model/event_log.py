@@ -0,0 +1,121 @@
+import json
+import logging
+from enum import Enum
+import numpy as np
+
+
+# Types of events recorded by the trader agents
+class EventType(Enum):
+    TRADE = 0
+    TRANSFER = 1
+    BANKRUPTCY = 2
+
+
+# Level each event type is recorded at (standard logging levels)
+EVENT_LEVELS = {
+    EventType.TRADE: logging.DEBUG,
+    EventType.TRANSFER: logging.INFO,
+    EventType.BANKRUPTCY: logging.WARNING,
+}
+
+LEVEL_NAMES = {
+    "off": logging.CRITICAL + 1,
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "warning": logging.WARNING,
+}
+
+# One fixed-size record per event:
+# agent is the acting agent, other the counterparty (-1 if none), amount the capital moved and
+# value the agent's capital after the event
+EVENT_DTYPE = np.dtype([
+    ("step", np.int64),
+    ("type", np.int8),
+    ("agent", np.int64),
+    ("other", np.int64),
+    ("amount", np.float64),
+    ("value", np.float64),
+])
+
+
+class EventLog():
+    # Leveled event log that records typed events into a preallocated ring buffer.
+    # Callers check the per-type flags (e.g. `if log.transfers:`) before recording, so a disabled
+    # log costs one attribute lookup and no formatting.
+    def __init__(self, level="off", capacity=65536, path=None):
+        self.events = np.zeros(capacity, dtype=EVENT_DTYPE)
+        self.capacity = capacity
+        self.count = 0  # Events recorded since the last flush/clear
+        self.dropped = 0  # Events overwritten before they were flushed
+        self.path = path  # If set, a full buffer is flushed here instead of being overwritten
+        self.set_level(level)
+
+    def set_level(self, level):
+        self.level = LEVEL_NAMES[level] if isinstance(level, str) else level
+        self.trades = EVENT_LEVELS[EventType.TRADE] >= self.level
+        self.transfers = EVENT_LEVELS[EventType.TRANSFER] >= self.level
+        self.bankruptcies = EVENT_LEVELS[EventType.BANKRUPTCY] >= self.level
+        self.enabled = self.trades or self.transfers or self.bankruptcies
+
+    def record(self, event_type, step, agent, other=-1, amount=0.0, value=0.0):
+        if self.count == self.capacity and self.path is not None:
+            self.flush()
+        if self.count >= self.capacity:
+            self.dropped += 1
+
+        self.events[self.count % self.capacity] = (step, event_type.value, agent, other, amount, value)
+        self.count += 1
+
+    def record_batch(self, event_type, step, agents, others=-1, amounts=0.0, values=0.0):
+        """
+        Records one event per entry of agents (others/amounts/values broadcast against it).
+        """
+        agents = np.asarray(agents)
+        batch = np.zeros(len(agents), dtype=EVENT_DTYPE)
+        batch["step"] = step
+        batch["type"] = event_type.value
+        batch["agent"] = agents
+        batch["other"] = others
+        batch["amount"] = amounts
+        batch["value"] = values
+
+        for start in range(0, len(batch), self.capacity):
+            chunk = batch[start:start + self.capacity]
+            if self.path is not None and self.count + len(chunk) > self.capacity:
+                self.flush()
+            self.dropped += max(0, self.count + len(chunk) - self.capacity) - max(0, self.count - self.capacity)
+            slots = (self.count + np.arange(len(chunk))) % self.capacity
+            self.events[slots] = chunk
+            self.count += len(chunk)
+
+    def records(self):
+        """
+        Returns the buffered events in the order they were recorded.
+        """
+        if self.count <= self.capacity:
+            return self.events[:self.count].copy()
+        start = self.count % self.capacity
+        return np.concatenate([self.events[start:], self.events[:start]])
+
+    def clear(self):
+        self.count = 0
+
+    def flush(self, path=None):
+        """
+        Appends the buffered events to path (raw binary records for .bin, NDJSON otherwise)
+        and empties the buffer. Binary files can be read back with np.fromfile(path, dtype=EVENT_DTYPE).
+        """
+        path = path or self.path
+        records = self.records()
+
+        if path.endswith(".bin"):
+            with open(path, "ab") as f:
+                records.tofile(f)
+        else:
+            names = [event_type.name.lower() for event_type in EventType]
+            with open(path, "a") as f:
+                for step, event_type, agent, other, amount, value in records.tolist():
+                    f.write(json.dumps({"step": step, "type": names[event_type], "agent": agent, "other": other, "amount": amount, "value": value}) + "\n")
+
+        self.clear()
+        return len(records)
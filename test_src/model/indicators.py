@@ -0,0 +1,143 @@
+import numpy as np
+
+
+class RollingWindow():
+    # Running sums over the last `period` prices (and price changes) of a growing price history
+    def __init__(self, period, prices, resync_every=1000):
+        self.period = period
+        self.resync_every = resync_every
+        self.anchor = float(prices[0])  # Shift applied to the sum of squares for numerical stability
+        self.length = len(prices)
+        self.updates = 0
+        # The last period+2 prices, kept by the window itself since a bounded history may hold fewer
+        self.recent = [float(price) for price in prices[-(period + 2):]]
+
+        # Wilder-style smoothed gain/loss averages
+        self.wilder_gain = None
+        self.wilder_loss = None
+        for index in range(1, len(prices)):
+            self.update_wilder(prices[index] - prices[index - 1], index)
+
+        self.resync()
+
+    def resync(self):
+        """
+        Recomputes the running sums exactly from the recent prices to stop rounding drift.
+        """
+        recent = np.asarray(self.recent[-self.period:], dtype=float) - self.anchor
+        deltas = np.diff(np.asarray(self.recent[-(self.period+1):], dtype=float))
+
+        self.sum = float(np.sum(recent))
+        self.sum_sq = float(np.sum(recent ** 2))
+        self.gain_sum = float(np.sum(deltas[deltas > 0]))
+        self.loss_sum = float(-np.sum(deltas[deltas < 0]))
+
+    def update_wilder(self, delta, num_deltas):
+        gain = delta if delta > 0 else 0.0
+        loss = -delta if delta < 0 else 0.0
+
+        if num_deltas < self.period:
+            self.wilder_gain = (self.wilder_gain or 0.0) + gain
+            self.wilder_loss = (self.wilder_loss or 0.0) + loss
+        elif num_deltas == self.period:
+            # Seed the smoothed averages with the simple average of the first period
+            self.wilder_gain = ((self.wilder_gain or 0.0) + gain) / self.period
+            self.wilder_loss = ((self.wilder_loss or 0.0) + loss) / self.period
+        else:
+            self.wilder_gain = (self.wilder_gain * (self.period - 1) + gain) / self.period
+            self.wilder_loss = (self.wilder_loss * (self.period - 1) + loss) / self.period
+
+    def update(self, new_price):
+        """
+        Adds the newest price to the window and drops the one that falls out of it.
+        Must be called exactly once per appended price.
+        """
+        n = self.length + 1  # Number of prices seen, including the new one
+        recent = self.recent
+        recent.append(float(new_price))
+        if len(recent) > self.period + 2:
+            del recent[0]
+
+        self.sum += new_price - self.anchor
+        self.sum_sq += (new_price - self.anchor) ** 2
+        if n > self.period:
+            old_price = recent[-1 - self.period]
+            self.sum -= old_price - self.anchor
+            self.sum_sq -= (old_price - self.anchor) ** 2
+
+        if n >= 2:
+            delta = new_price - recent[-2]
+            self.gain_sum += max(delta, 0.0)
+            self.loss_sum += max(-delta, 0.0)
+            self.update_wilder(delta, n - 1)
+        if n - 1 > self.period:
+            old_delta = recent[-1 - self.period] - recent[-2 - self.period]
+            self.gain_sum -= max(old_delta, 0.0)
+            self.loss_sum -= max(-old_delta, 0.0)
+
+        self.length = n
+        self.updates += 1
+        if self.updates % self.resync_every == 0:
+            self.resync()
+
+
+class RollingIndicators():
+    # Indicators owned by the model, updated once per new price and read by every agent in O(1)
+    def __init__(self, prices, resync_every=1000):
+        self.prices = prices  # The model's price history (list or PriceBuffer)
+        self.resync_every = resync_every
+        self.windows = {}
+
+    def window(self, period):
+        # Windows are created on first use and backfilled from the price history
+        if period not in self.windows:
+            self.windows[period] = RollingWindow(period, self.prices, self.resync_every)
+        return self.windows[period]
+
+    def update(self):
+        """Called by the model once after each new price is appended."""
+        for window in self.windows.values():
+            window.update(self.prices[-1])
+
+    def rsi(self, period=14, smoothing="simple"):
+        # Checks to see if there is enough data to compute RSI
+        if len(self.prices) < period + 1:
+            return None
+
+        window = self.window(period)
+        if smoothing == "wilder":
+            avg_gain, avg_loss = window.wilder_gain, window.wilder_loss
+        else:
+            avg_gain, avg_loss = window.gain_sum / period, window.loss_sum / period
+
+        if avg_loss <= 0:
+            return 100
+        rs = avg_gain / avg_loss
+        return 100 - (100 / (1 + rs))
+
+    def sma(self, period=28):
+        """
+        Mean of the previous `period` prices (excluding the current price).
+        """
+        # Checks to see if there is enough data to compute SMA
+        if len(self.prices) < period + 1:
+            return None
+
+        window = self.window(period)
+        previous_sum = window.sum - (window.recent[-1] - window.anchor) + (window.recent[-1 - period] - window.anchor)
+        return previous_sum / period + window.anchor
+
+    def bollinger(self, period=20, num_std_dev=2):
+        """
+        Returns the (lower, upper) Bollinger Bands over the last `period` prices.
+        """
+        # Checks to see if there is enough data to compute Bollinger Bands
+        if len(self.prices) < period:
+            return None
+
+        window = self.window(period)
+        shifted_mean = window.sum / period
+        std = np.sqrt(max(window.sum_sq / period - shifted_mean ** 2, 0.0))
+        sma = shifted_mean + window.anchor
+
+        return sma - num_std_dev * std, sma + num_std_dev * std
@@ -11,29 +11,60 @@ from test_src.agent.trader import (
     TraderAgent,
     trader_strategy
 )
+from test_src.model.vector_engine import (
+    VectorisedEngine
+)
+from test_src.model.indicators import (
+    RollingIndicators
+)
+from test_src.model.signal_cache import (
+    SignalCache
+)
+from test_src.model.barrier import (
+    BarrierIndex,
+    OHLCBarrierIndex
+)
+from test_src.model.price_buffer import (
+    PriceBuffer
+)
+from test_src.model.price_engine import (
+    GBMPriceEngine
+)
+from test_src.model.event_log import (
+    EventLog
+)
+from test_src.model.aggregates import (
+    Aggregates,
+    StateCount
+)
+from test_src.model.recorder import (
+    AgentRecorder
+)
+from test_src.model.random_streams import (
+    RandomStreams
+)
+from test_src.data_gathering.kline_cache import (
+    open_klines,
+    KlineReplayFeed
+)
+from test_src.model.checkpoint import (
+    checkpoint_directory,
+    save_checkpoint,
+    restore_checkpoint,
+    read_manifest,
+    load_network
+)
 
-# Helper function to generate random prices that follow a geometric brownian motion
-def generate_new_price(previous_price, volatility=0.01, drift=0, rng=None):
-    """Generate the next price using a Geometric Brownian Motion step."""
-    dt = 1 / 252  # Assume 252 trading days
-    sqrt_dt = np.sqrt(dt)
-    
-    if rng is None:
-        rng = np.random.default_rng()
-
-    # Use a seeded random generator if a seed is provided
-    random_return = rng.normal(loc=0, scale=sqrt_dt)  # Seeded random return
-
-    # Applying Geometric Brownian Motion formula for a single step
-    new_price = previous_price * np.exp((drift - 0.5 * volatility ** 2) * dt + volatility * random_return)
-
-    return float(new_price) 
-
+# Names of the aggregates counting the trader agents in each state
+STATE_AGGREGATES = {
+    TraderState.ZERO_CAPITAL: "Zero_Capital",
+    TraderState.HAS_CAPITAL: "With_Capital",
+}
 
 
-# Helper functions that calculates the trader agents' state at each time step
+# Helper functions that read the trader agents' state counts at each time step (kept up to date incrementally)
 def number_state(model, state):
-    return sum(1 for a in model.grid.all_cells.agents if a.state is state)
+    return model.aggregates[STATE_AGGREGATES[state]]
 
 
 def number_of_zero_capital(model):
@@ -50,52 +81,152 @@ class TraderNetwork(Model):
         self,
         num_nodes=3,
         avg_node_degree=3,
+        topology="erdos_renyi",  # Network generator (see test_src/model/topology.py)
+        topology_params=None,
         start_price=100,  # Use a single starting price instead of a full array
         volatility=0.01,
         generocity_rate = 0.5,
         seed=None,
+        history_length=None,  # Keep only the latest N prices (ring buffer) instead of the full history
+        price_chunk_size=256,  # Number of GBM steps generated at once by the price engine
+        engine="agents",  # "agents" (one TraderAgent per node) or "vectorised" (NumPy arrays)
+        update="simultaneous",  # Vectorised engine only: "simultaneous" or "sequential" (shuffle-order) updates
+        event_level="off",  # "off", "debug" (trades), "info" (transfers) or "warning" (bankruptcies)
+        event_capacity=65536,
+        event_path=None,  # File a full event buffer is flushed to (.bin or .ndjson)
+        strategy_type="random",
+        strategy_params=None,
+        aggregates=None,  # Extra {name: IncrementalAggregate} to maintain and collect (e.g. {"Total_Capital": TotalCapital()})
+        record_every=None,  # Record every agent's capital/win_rate/state every N steps (None = off)
+        record_dtype="float64",
+        record_capacity=1024,  # Number of recorded steps preallocated (grows if exceeded)
+        record_path=None,  # Directory for memory-mapped recordings (in memory if None)
+        checkpoint_every=None,  # Save a checkpoint to checkpoint_path every N steps (None = off)
+        checkpoint_path=None,
+        price_feed=None,  # Kline CSV replayed one bar per step instead of GBM prices (start_price/volatility are then unused)
+        price_column="close",
+        price_start=0,  # Index of the first bar replayed
+        barrier_mode="close",  # "close" or "ohlc" (price_feed only): barriers are touched by each bar's high/low
+        barrier_tie="open",  # "ohlc" mode: barrier taken when a bar touches both ("open", "up" or "down")
     ):
+        # Constructor arguments, saved with checkpoints so the model can be rebuilt on restore
+        self.init_params = {name: value for name, value in locals().items() if name not in ("self", "__class__")}
         super().__init__(seed=seed)
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_path = checkpoint_path
 
         self.current_price = float(start_price)  # Store the latest price
         self.volatility = volatility
         self.market_date = 0
-        self.price_history = [self.current_price]  # Maintain full price history
         self.rng = np.random.default_rng(int(seed))
+
+        # Prices are generated in vectorised chunks and handed out one step at a time,
+        # or replayed from historical klines (read from a memory-mapped binary cache of the CSV)
+        if price_feed is None:
+            self.klines = None
+            self.price_engine = GBMPriceEngine(self.current_price, volatility=self.volatility, rng=self.rng, chunk_size=price_chunk_size)
+        else:
+            self.klines = open_klines(price_feed)
+            self.price_engine = KlineReplayFeed(self.klines, column=price_column, start=price_start)
+            self.current_price = self.price_engine.current_price
+
+        self.prices = PriceBuffer([self.current_price], max_length=history_length)  # Maintain price history
+
+        # Structured event log of trades, transfers and bankruptcies (off by default)
+        self.events = EventLog(level=event_level, capacity=event_capacity, path=event_path)
+
+        # Rolling indicators shared by every rsi/sma/bollinger agent
+        self.indicators = RollingIndicators(self.prices)
+
+        # Signals are computed once per step for each distinct (strategy_type, params) group
+        self.signal_cache = SignalCache(self)
+        self.signal_cache.register(strategy_type, strategy_params)
+
+        # Indexed first-passage lookup over the price history used by trade_action
+        if barrier_mode not in ("close", "ohlc"):
+            raise ValueError(f"Unknown barrier mode: {barrier_mode}")
+        if barrier_mode == "ohlc" and self.klines is None:
+            raise ValueError("barrier_mode='ohlc' needs a price_feed with OHLC bars")
+        self.barrier_mode = barrier_mode
+        self.barrier_tie = barrier_tie
+        self.barrier = self.build_barrier(self.price_history)
+        self.barrier_query = None  # (key, result) of the latest barrier_touch
         
 
-        # Create the network space and store it in the grid attribute of the Trader model class
-        network_space = NetworkSpace(num_nodes, avg_node_degree, self.random)
-        self.grid = network_space.get_network()
+        # Create the network space (sparse CSR arrays; the Mesa grid is built on first access)
+        self.network = NetworkSpace(
+            num_nodes,
+            avg_node_degree,
+            self.random,
+            rng = self.rng.spawn(1)[0],
+            topology = topology,
+            topology_params = topology_params
+        )
+
+        # Per-step blocks of every agent's random draws (strategy signal, sharing check)
+        self.streams = RandomStreams(seed, self.network.csr.num_nodes)
+
+        # Create Trader Agents
+        if engine == "agents":
+            self.engine = None
+            random_agent = TraderAgent.create_agents(
+                model = self,
+                n = self.network.csr.num_nodes,
+                capital = 100,
+                win_rate = 0.01,
+                market_prices = self.prices,  # Pass history
+                generocity_rate = generocity_rate,
+                cell = list(self.grid.all_cells),
+                strategy_type = strategy_type,
+                strategy_params = {"model": self} if strategy_type == "random" else dict(strategy_params or {})
+                
+            )
+
+        # Vectorised engine keeps every agent's attributes in NumPy arrays instead
+        elif engine == "vectorised":
+            self.engine = VectorisedEngine(
+                indptr = self.network.csr.indptr,
+                indices = self.network.csr.indices,
+                capital = 100,
+                win_rate = 0.01,
+                generocity_rate = generocity_rate,
+                strategy_type = strategy_type,
+                strategy_params = strategy_params,
+                update = update
+            )
+
+        else:
+            raise ValueError(f"Unknown engine: {engine}")
+
+        # Population aggregates updated by the agents as their capital/state changes
+        self.aggregates = Aggregates(self)
+        for state, name in STATE_AGGREGATES.items():
+            self.aggregates.register(name, StateCount(state))
+        for name, aggregate in (aggregates or {}).items():
+            self.aggregates.register(name, aggregate)
 
         # Data Collection
         self.datacollector = mesa.DataCollector(
             {
                 "Zero_Capital": number_of_zero_capital,
-                "With_Capital": number_of_with_capital
+                "With_Capital": number_of_with_capital,
+                **{name: (lambda model, name=name: model.aggregates[name]) for name in (aggregates or {})}
             }
         )
 
-        # Create Trader Agents
-        random_agent = TraderAgent.create_agents(
-            model = self,
-            n = num_nodes,
-            capital = 100,
-            win_rate = 0.01,
-            market_prices = self.price_history,  # Pass history
-            generocity_rate = generocity_rate,
-            cell = list(self.grid.all_cells),
-            strategy_type = "random",
-            strategy_params = {"model": self}
-            
-        )
+        # Columnar per-agent history (off by default)
+        self.recorder = None
+        if record_every is not None:
+            num_agents = len(self.engine.capital) if self.engine is not None else len(self.agents)
+            self.recorder = AgentRecorder(num_agents, capacity=record_capacity, every=record_every, dtype=record_dtype, path=record_path)
+            self.record_agents()
 
         """rsi_agent = TraderAgent.create_agents(
             model = self,
             n = num_nodes,
             capital = 100,
             win_rate = 0.01,
-            market_prices = self.price_history,  # Pass history
+            market_prices = self.prices,  # Pass history
             generocity_rate = 0.5,
             cell = list(self.grid.all_cells),
             strategy_type = "rsi",
@@ -107,7 +238,7 @@ class TraderNetwork(Model):
             n = num_nodes,
             capital = 100,
             win_rate = 0.01,
-            market_prices = self.price_history,  # Pass history
+            market_prices = self.prices,  # Pass history
             generocity_rate = 0.5,
             cell = list(self.grid.all_cells),
             strategy_type = "sma",
@@ -119,7 +250,7 @@ class TraderNetwork(Model):
             n = num_nodes,
             capital = 100,
             win_rate = 0.01,
-            market_prices = self.price_history,  # Pass history
+            market_prices = self.prices,  # Pass history
             generocity_rate = 0.5,
             cell = list(self.grid.all_cells),
             strategy_type = "bollinger",
@@ -133,25 +264,113 @@ class TraderNetwork(Model):
         self.datacollector.collect(self)
 
 
+    @classmethod
+    def from_checkpoint(cls, path, **overrides):
+        """
+        Rebuilds a model from a checkpoint directory written by save_checkpoint (or checkpoint_every),
+        ready to continue exactly where it stopped. Objects that cannot be saved (e.g. custom
+        aggregates) are passed again through overrides.
+        """
+        path = checkpoint_directory(path)
+        params = dict(read_manifest(path)["params"], **overrides)
+        params["topology"] = load_network(path)
+        return restore_checkpoint(cls(**params), path)
+
+    def save_checkpoint(self, path=None):
+        save_checkpoint(self, path or self.checkpoint_path)
+
+    def build_barrier(self, history):
+        # Close-price barrier index, or in "ohlc" mode one over the replayed bars up to the current bar.
+        # history holds the latest prices of the series; with history_length only that window is kept.
+        window = self.prices.max_length
+        offset = self.prices.total - len(history)
+        if self.barrier_mode == "close":
+            return BarrierIndex(history, window=window, offset=offset)
+        bars = slice(self.price_engine.index + 1 - len(history), self.price_engine.index + 1)
+        return OHLCBarrierIndex(self.klines["open"][bars], self.klines["high"][bars], self.klines["low"][bars], history, tie=self.barrier_tie, window=window, offset=offset)
+
+    def barrier_touch(self, price_memory, start):
+        """
+        Returns (index, hit_up, price) of the first price from start that crosses the take-profit
+        or stop barrier around price_memory. Every agent trading in a step shares the same price
+        memory, so the index is queried once per step and the result reused.
+        """
+        key = (self.market_date, price_memory, start)
+        if self.barrier_query is None or self.barrier_query[0] != key:
+            self.barrier_query = (key, self.barrier.touch(price_memory*1.001, price_memory*0.0090, start))
+        return self.barrier_query[1]
+
+    @property
+    def grid(self):
+        # Mesa Network of the trader graph (built lazily, so the vectorised engine never needs it)
+        return self.network.get_network()
+
+    @property
+    def price_history(self):
+        # Read-only view of the price history
+        return self.prices.view()
+
+    def agent_capital(self):
+        # Capital of every agent (in creation order) as an array, whichever engine is running
+        if self.engine is not None:
+            return self.engine.capital.copy()
+        return np.array(self.agents.get("capital"), dtype=float)
+
+    def agent_win_rate(self):
+        # Win rate of every agent (in creation order) as an array, whichever engine is running
+        if self.engine is not None:
+            return self.engine.win_rate.copy()
+        return np.array(self.agents.get("win_rate"), dtype=float)
+
+    def agent_states(self):
+        # TraderState value of every agent (in creation order) as an array, whichever engine is running
+        if self.engine is not None:
+            return self.engine.state.copy()
+        return np.array([state.value for state in self.agents.get("state")], dtype=np.int8)
+
     def step(self):
         """Advance simulation one step and generate a new price dynamically."""
-        self.agents.shuffle_do("step")
+        # A replayed price feed stops the run at its last bar
+        if self.klines is not None and self.price_engine.exhausted:
+            self.running = False
+            return
+
+        self.signal_cache.start_step(self.market_date)
+        if self.engine is None:
+            self.streams.start_step(self.market_date)
+            self.agents.shuffle_do("step")
+        else:
+            self.engine.step(self)
+            self.aggregates.reset(self.engine.capital, self.engine.state)
         self.market_date += 1
         #print(self.market_date)
 
         # Generate the next price dynamically
-        self.current_price = generate_new_price(self.current_price, volatility=self.volatility, rng=self.rng)
-
-        # Append to history for tracking
-        self.price_history.append(self.current_price)
+        self.current_price = self.price_engine.next_price()
 
-        # Update agents
-        self.agents.set("price_memory", self.current_price)  # number
-        self.agents.set("market_prices", self.price_history)  # List
+        # Append to history for tracking (agents read it through a shared view)
+        self.prices.append(self.current_price)
+        self.indicators.update()
+        if self.barrier_mode == "ohlc":
+            bar = self.price_engine.index
+            self.barrier.append_bar(self.klines["open"][bar], self.klines["high"][bar], self.klines["low"][bar], self.current_price)
+        else:
+            self.barrier.append(self.current_price)
 
         # Collect data
         self.datacollector.collect(self)
-        print(self.rng)
+        if self.recorder is not None:
+            self.record_agents()
+
+        # Periodic checkpoint
+        if self.checkpoint_every is not None and self.market_date % self.checkpoint_every == 0:
+            self.save_checkpoint()
+
+    def record_agents(self):
+        if self.engine is not None:
+            self.recorder.record(self.market_date, self.engine.capital, self.engine.win_rate, self.engine.state)
+        else:
+            self.recorder.record(self.market_date, self.agents.get("capital"), self.agents.get("win_rate"), [state.value for state in self.agents.get("state")])
 
 
 
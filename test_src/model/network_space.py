@@ -1,13 +1,33 @@
-import networkx as nx
 import mesa
 from mesa.discrete_space import CellCollection, Network
+from test_src.model.topology import (
+    CSRGraph,
+    build_topology
+)
 
 class NetworkSpace():
     # The network space class that implements the logic behind the network grid
-    def __init__(self, num_nodes, avg_node_degree, random_value):
-        prob = avg_node_degree / num_nodes
-        self.graph = nx.erdos_renyi_graph(n=num_nodes, p=prob)
+    # The edges are sampled straight into CSR arrays; the NetworkX graph and Mesa Network are only
+    # built the first time they are needed (agent cells or the visualisation)
+    # topology selects the generator ("erdos_renyi", "barabasi_albert", "watts_strogatz",
+    # "stochastic_block" or "configuration") and topology_params are passed on to it;
+    # a prebuilt CSRGraph (e.g. from a checkpoint) is used as is
+    def __init__(self, num_nodes, avg_node_degree, random_value, rng=None, topology="erdos_renyi", topology_params=None):
+        if isinstance(topology, CSRGraph):
+            self.csr = topology
+        else:
+            self.csr = build_topology(topology, num_nodes, avg_node_degree, rng, **(topology_params or {}))
         self.random = random_value
+        self._graph = None
+        self._network = None
+
+    @property
+    def graph(self):
+        if self._graph is None:
+            self._graph = self.csr.to_networkx()
+        return self._graph
 
     def get_network(self):
-        return Network(self.graph, capacity=1, random=self.random)
+        if self._network is None:
+            self._network = Network(self.graph, capacity=1, random=self.random)
+        return self._network
@@ -0,0 +1,83 @@
+import numpy as np
+
+
+class PriceBuffer():
+    # Model-owned float64 price history. It is preallocated and grows geometrically, or keeps only
+    # the latest `max_length` prices as a ring. Agents read it through a zero-copy read-only view.
+    def __init__(self, prices=(), capacity=1024, max_length=None):
+        self.max_length = max_length
+        if max_length is None:
+            self._data = np.empty(max(capacity, len(prices), 1))
+        else:
+            # Every price is written twice so the latest max_length prices are always contiguous
+            self._data = np.empty(2 * max_length)
+
+        self._length = 0  # Number of prices currently visible
+        self.total = 0  # Number of prices appended so far
+        self._view = None
+        self.extend(prices)
+
+    @property
+    def start(self):
+        """Absolute index (in appended order) of the oldest visible price."""
+        return self.total - self._length
+
+    def append(self, price):
+        if self.max_length is None:
+            # Double the capacity when full (amortised O(1) appends)
+            if self._length == len(self._data):
+                grown = np.empty(2 * len(self._data))
+                grown[:self._length] = self._data[:self._length]
+                self._data = grown
+            self._data[self._length] = price
+            self._length += 1
+
+        else:
+            slot = self.total % self.max_length
+            self._data[slot] = price
+            self._data[slot + self.max_length] = price
+            self._length = min(self._length + 1, self.max_length)
+
+        self.total += 1
+        self._view = None
+
+    def extend(self, prices):
+        for price in prices:
+            self.append(price)
+
+    def restore(self, prices, total):
+        """
+        Replaces the contents with the visible prices of a buffer that has had `total` prices appended.
+        """
+        self._length = 0
+        self.total = total - len(prices)
+        if self.max_length is None and len(self._data) < len(prices):
+            self._data = np.empty(len(prices))
+        self._view = None
+        self.extend(prices)
+
+    def view(self):
+        """
+        Returns a read-only view of the visible prices, oldest first.
+        """
+        if self._view is None:
+            if self.max_length is None:
+                view = self._data[:self._length]
+            else:
+                end = (self.total - 1) % self.max_length + self.max_length + 1
+                view = self._data[end - self._length:end]
+            view.flags.writeable = False
+            self._view = view
+        return self._view
+
+    def latest(self):
+        return float(self._data[self._length - 1]) if self.max_length is None else float(self.view()[-1])
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, key):
+        return self.view()[key]
+
+    def __array__(self, dtype=None, copy=None):
+        return self.view() if dtype is None else self.view().astype(dtype)
@@ -0,0 +1,80 @@
+import numpy as np
+
+
+class GBMPriceEngine():
+    # Generates Geometric Brownian Motion price paths in vectorised chunks (cumsum of log-returns,
+    # then one exp) and hands the prices out lazily one step at a time
+    def __init__(self, start_price, volatility=0.01, drift=0, rng=None, chunk_size=256, num_paths=1, dt=1/252):
+        """
+        rng can be a single np.random.Generator shared by every path, or a sequence with one
+        Generator per path so each path is reproducible on its own (e.g. one seed per replica).
+        """
+        if rng is None:
+            rng = np.random.default_rng()
+        if isinstance(rng, np.random.Generator):
+            self.rngs = None
+            self.rng = rng
+        else:
+            self.rngs = list(rng)
+            self.rng = None
+            num_paths = len(self.rngs)
+
+        self.volatility = volatility
+        self.drift = drift
+        self.dt = dt
+        self.chunk_size = chunk_size
+        self.num_paths = num_paths
+
+        self.last_prices = np.full(num_paths, float(start_price))
+        self.chunk = np.empty((num_paths, 0))
+        self.position = 0
+
+    def draw_returns(self):
+        sqrt_dt = np.sqrt(self.dt)
+        if self.rngs is None:
+            random_returns = self.rng.normal(loc=0, scale=sqrt_dt, size=(self.num_paths, self.chunk_size))
+        else:
+            random_returns = np.stack([rng.normal(loc=0, scale=sqrt_dt, size=self.chunk_size) for rng in self.rngs])
+
+        return (self.drift - 0.5 * self.volatility ** 2) * self.dt + self.volatility * random_returns
+
+    def refill(self):
+        """
+        Generates the next chunk of prices for every path, continuing from the last price handed out.
+        """
+        log_paths = np.cumsum(self.draw_returns(), axis=1)
+        self.chunk = self.last_prices[:, None] * np.exp(log_paths)
+        self.position = 0
+
+    def next_prices(self):
+        """Returns the next price of every path as an array of shape (num_paths,)."""
+        if self.position == self.chunk.shape[1]:
+            self.refill()
+
+        prices = self.chunk[:, self.position]
+        self.position += 1
+        self.last_prices = prices
+        return prices
+
+    def next_price(self):
+        """Returns the next price of the first (or only) path."""
+        return float(self.next_prices()[0])
+
+    def paths(self, num_steps):
+        """
+        Returns the next num_steps prices of every path, prefixed with the current price,
+        as an array of shape (num_paths, num_steps + 1).
+        """
+        out = np.empty((self.num_paths, num_steps + 1))
+        out[:, 0] = self.last_prices
+        filled = 0
+        while filled < num_steps:
+            if self.position == self.chunk.shape[1]:
+                self.refill()
+            take = min(num_steps - filled, self.chunk.shape[1] - self.position)
+            out[:, filled + 1:filled + 1 + take] = self.chunk[:, self.position:self.position + take]
+            self.position += take
+            filled += take
+            self.last_prices = out[:, filled].copy()
+
+        return out
@@ -0,0 +1,122 @@
+import os
+import numpy as np
+
+
+# Per-agent fields recorded every (decimated) step
+RECORD_FIELDS = ("capital", "win_rate", "state")
+
+
+class AgentRecorder():
+    # Columnar per-agent history: one preallocated (steps x agents) array per field.
+    # With a path, every field is a memory-mapped .npy file (<path>/<field>.npy), so runs larger
+    # than RAM are paged to disk; otherwise the arrays are kept in memory.
+    # Both grow by doubling when more steps are recorded than the initial capacity.
+    def __init__(self, num_agents, capacity=1024, every=1, dtype=np.float64, path=None):
+        self.num_agents = num_agents
+        self.capacity = max(1, capacity)
+        self.every = every  # Record one step in every `every` steps
+        self.dtype = np.dtype(dtype)  # dtype of capital/win_rate (state is always int8)
+        self.path = path
+        self.count = 0
+        self.steps = np.zeros(self.capacity, dtype=np.int64)
+
+        if path is not None:
+            os.makedirs(path, exist_ok=True)
+        self.data = {field: self.allocate(field, self.capacity) for field in RECORD_FIELDS}
+
+    def field_dtype(self, field):
+        return np.int8 if field == "state" else self.dtype
+
+    def field_path(self, field):
+        return os.path.join(self.path, f"{field}.npy")
+
+    def allocate(self, field, capacity, path=None):
+        shape = (capacity, self.num_agents)
+        if self.path is None:
+            return np.zeros(shape, dtype=self.field_dtype(field))
+        return np.lib.format.open_memmap(path or self.field_path(field), mode="w+", dtype=self.field_dtype(field), shape=shape)
+
+    def grow(self):
+        capacity = self.capacity*2
+        for field in RECORD_FIELDS:
+            old = self.data[field]
+            if self.path is None:
+                new = self.allocate(field, capacity)
+                new[:self.count] = old[:self.count]
+            else:
+                # Copy into a larger file, then swap it in place of the old one. Windows cannot replace
+                # or rename a mapped file, so both maps are released (by dropping every reference to
+                # them) before the swap and the new file is mapped again afterwards
+                tmp_path = self.field_path(field) + ".tmp"
+                new = self.allocate(field, capacity, tmp_path)
+                new[:self.count] = old[:self.count]
+                new.flush()
+                self.data[field] = None
+                del old, new
+                os.replace(tmp_path, self.field_path(field))
+                new = np.load(self.field_path(field), mmap_mode="r+")
+            self.data[field] = new
+        self.steps = np.concatenate([self.steps, np.zeros(capacity - self.capacity, dtype=np.int64)])
+        self.capacity = capacity
+
+    def record(self, step, capital, win_rate, state):
+        """
+        Records every agent's capital, win_rate and state value for step (skipped unless step % every == 0).
+        Returns whether the step was recorded.
+        """
+        if step % self.every != 0:
+            return False
+        if self.count == self.capacity:
+            self.grow()
+
+        row = self.count
+        self.steps[row] = step
+        self.data["capital"][row] = capital
+        self.data["win_rate"][row] = win_rate
+        self.data["state"][row] = state
+        self.count += 1
+        return True
+
+    @property
+    def recorded_steps(self):
+        return self.steps[:self.count]
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, field):
+        # (recorded steps x agents) view of a field
+        return self.data[field][:self.count]
+
+    def agent(self, field, agents):
+        """
+        Returns the history of one agent (or several, given a list/slice of agent indices) for field.
+        """
+        return self.data[field][:self.count, agents]
+
+    def between(self, field, start=None, stop=None):
+        """
+        Returns (steps, values) for the recorded steps with start <= step < stop.
+        """
+        steps = self.recorded_steps
+        first = 0 if start is None else np.searchsorted(steps, start, side="left")
+        last = self.count if stop is None else np.searchsorted(steps, stop, side="left")
+        return steps[first:last], self.data[field][first:last]
+
+    def flush(self):
+        # Writes the recorded step numbers next to the memory-mapped fields
+        if self.path is None:
+            return
+        for values in self.data.values():
+            values.flush()
+        np.save(os.path.join(self.path, "steps.npy"), self.recorded_steps)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Opens a flushed recording read-only (memory-mapped); returns {field: array, "steps": steps}.
+        """
+        steps = np.load(os.path.join(path, "steps.npy"))
+        data = {field: np.load(os.path.join(path, f"{field}.npy"), mmap_mode="r")[:len(steps)] for field in RECORD_FIELDS}
+        data["steps"] = steps
+        return data
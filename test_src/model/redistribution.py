@@ -0,0 +1,101 @@
+import numpy as np
+
+
+# Helper function that converts per-node neighbour lists into CSR adjacency arrays
+def csr_from_neighbours(neighbours):
+    degree = np.array([len(nbrs) for nbrs in neighbours], dtype=np.int64)
+    indptr = np.zeros(len(neighbours) + 1, dtype=np.int64)
+    np.cumsum(degree, out=indptr[1:])
+    indices = np.fromiter((j for nbrs in neighbours for j in nbrs), dtype=np.int64, count=int(indptr[-1]))
+    return indptr, indices
+
+
+def segment_argmax(indptr, values):
+    """
+    Returns (position, max) of the first maximum of values within each CSR segment.
+    Empty segments get position -1 and max -inf.
+    """
+    num_segments = len(indptr) - 1
+    degree = np.diff(indptr)
+    nonempty = degree > 0
+    starts = indptr[:-1][nonempty]
+
+    segment_max = np.full(num_segments, -np.inf)
+    first = np.full(num_segments, -1, dtype=np.int64)
+    if len(values) == 0:
+        return first, segment_max
+
+    segment_max[nonempty] = np.maximum.reduceat(values, starts)
+    positions = np.where(values == np.repeat(segment_max, degree), np.arange(len(values)), len(values))
+    first[nonempty] = np.minimum.reduceat(positions, starts)
+    return first, segment_max
+
+
+def best_neighbours(indptr, indices, edge_win_rate):
+    """
+    Returns, for every agent, the neighbour with the highest (strictly positive) win rate, or -1.
+    Ties go to the first neighbour, as in TraderAgent.try_to_share_capital.
+    """
+    first, segment_max = segment_argmax(indptr, edge_win_rate)
+    best = np.full(len(first), -1, dtype=np.int64)
+    found = (first >= 0) & (segment_max > 0)
+    best[found] = indices[first[found]]
+    return best
+
+
+def transfer_amounts(capital):
+    # An agent gives everything if it has 1 or less, otherwise 1% of its capital
+    return np.where(capital <= 1, capital, capital*0.01)
+
+
+def redistribute_simultaneous(capital, donors, recipients):
+    """
+    Every donor gives to its recipient at once, based on capital before any transfer this step.
+    Returns the amounts given.
+    """
+    amounts = transfer_amounts(capital[donors])
+    capital -= np.bincount(donors, weights=amounts, minlength=len(capital))
+    capital += np.bincount(recipients, weights=amounts, minlength=len(capital))
+    return amounts
+
+
+def redistribute_sequential(order, capital, has_capital, trade_change, trading, best, gives):
+    """
+    Replays the trade-then-share step of every agent one at a time in `order`, matching the
+    sequential shuffle_do semantics: capital received earlier in the step counts towards whether
+    (and how much) an agent gives. Updates capital and has_capital in place and returns the
+    (donor, recipient, amount, donor capital after the transfer) of every transfer made.
+    """
+    capital_list = capital.tolist()
+    change_list = trade_change.tolist()
+    has_list = has_capital.tolist()
+    trading_list = trading.tolist()
+    best_list = best.tolist()
+    gives_list = gives.tolist()
+
+    donors, recipients, amounts, values = [], [], [], []
+    for i in order.tolist():
+        if not has_list[i]:
+            continue
+
+        # Trade action
+        if trading_list[i]:
+            capital_list[i] += change_list[i]
+            has_list[i] = capital_list[i] > 0
+            if not has_list[i]:
+                continue
+
+        # Share capital with the most successful neighbour
+        if gives_list[i]:
+            amount = capital_list[i] if capital_list[i] <= 1 else capital_list[i]*0.01
+            capital_list[best_list[i]] += amount
+            capital_list[i] -= amount
+            has_list[i] = capital_list[i] > 0
+            donors.append(i)
+            recipients.append(best_list[i])
+            amounts.append(amount)
+            values.append(capital_list[i])
+
+    capital[:] = capital_list
+    has_capital[:] = has_list
+    return np.array(donors, dtype=np.int64), np.array(recipients, dtype=np.int64), np.array(amounts, dtype=float), np.array(values, dtype=float)
@@ -0,0 +1,85 @@
+from test_src.agent.trader import (
+    trader_strategy
+)
+
+
+# Strategies whose signal only depends on the price history (and so is shared within a step)
+DETERMINISTIC_STRATEGIES = ("rsi", "sma", "bollinger")
+
+
+# Helper function that turns a strategy_params dict into a hashable key
+def freeze_params(params):
+    frozen = []
+    for name, value in sorted((params or {}).items()):
+        if isinstance(value, dict):
+            value = freeze_params(value)
+        elif isinstance(value, list):
+            value = tuple(value)
+        frozen.append((name, value))
+    return tuple(frozen)
+
+
+class SignalCache():
+    # Per-step cache of strategy signals shared by every agent with the same strategy parameters
+    def __init__(self, model):
+        self.model = model
+        self.step = None
+        self.signals = {}  # (step, strategy_type, frozen params) -> signal
+        self.groups = {}  # (strategy_type, frozen params) -> params
+        self.hits = 0
+        self.misses = 0
+
+    def register(self, strategy_type, params=None):
+        """
+        Registers a parameter group up front so its signal is computed once at the start of each step.
+        """
+        if strategy_type not in DETERMINISTIC_STRATEGIES:
+            return None
+
+        group = (strategy_type, freeze_params(params))
+        self.groups[group] = dict(params or {})
+        return group
+
+    def compute(self, strategy_type, params):
+        return trader_strategy(self.model.price_history, strategy_type, indicators=self.model.indicators, **params)
+
+    def start_step(self, step):
+        """
+        Drops the previous step's signals and precomputes every registered group.
+        """
+        if step == self.step:
+            return
+
+        self.step = step
+        self.signals = {}
+        for (strategy_type, frozen), params in self.groups.items():
+            self.signals[(step, strategy_type, frozen)] = self.compute(strategy_type, params)
+            self.misses += 1
+
+    def get(self, strategy_type, params=None, index=None):
+        # Random strategies are drawn per agent (index selects the agent's pre-drawn stream) and never cached
+        if strategy_type not in DETERMINISTIC_STRATEGIES:
+            if index is not None:
+                params = dict(params or {}, index=index)
+            return trader_strategy(self.model.price_history, strategy_type, **(params or {}))
+
+        self.start_step(self.model.market_date)
+        key = (self.step, strategy_type, freeze_params(params))
+
+        if key in self.signals:
+            self.hits += 1
+            return self.signals[key]
+
+        self.misses += 1
+        signal = self.compute(strategy_type, params or {})
+        self.signals[key] = signal
+        return signal
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "groups": len(self.groups),
+        }
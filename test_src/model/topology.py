@@ -0,0 +1,258 @@
+import numpy as np
+import networkx as nx
+
+
+class CSRGraph():
+    # Undirected graph stored as CSR adjacency arrays (neighbours of i are indices[indptr[i]:indptr[i+1]])
+    def __init__(self, indptr, indices):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.num_nodes = len(self.indptr) - 1
+
+    @classmethod
+    def from_edges(cls, num_nodes, sources, targets, simple=False):
+        """
+        Builds the graph from undirected edges (each edge given once).
+        With simple=True, self-loops and repeated edges are dropped first.
+        Neighbours are stored in ascending order.
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        if simple:
+            low, high = np.minimum(sources, targets), np.maximum(sources, targets)
+            keys = np.unique((low*num_nodes + high)[low != high])
+            sources, targets = keys // num_nodes, keys % num_nodes
+        rows = np.concatenate([sources, targets])
+        cols = np.concatenate([targets, sources])
+        order = np.argsort(rows*num_nodes + cols)  # Single int64 key sorts much faster than lexsort
+
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=num_nodes), out=indptr[1:])
+        return cls(indptr, cols[order])
+
+    @property
+    def num_edges(self):
+        return len(self.indices) // 2
+
+    def degree(self):
+        return np.diff(self.indptr)
+
+    def neighbours(self, node):
+        return self.indices[self.indptr[node]:self.indptr[node + 1]]
+
+    def edges(self):
+        """
+        Returns (sources, targets) with every undirected edge once (source < target).
+        """
+        sources = np.repeat(np.arange(self.num_nodes), self.degree())
+        keep = sources < self.indices
+        return sources[keep], self.indices[keep]
+
+    def to_networkx(self):
+        graph = nx.Graph()
+        graph.add_nodes_from(range(self.num_nodes))
+        graph.add_edges_from(zip(*(array.tolist() for array in self.edges())))
+        return graph
+
+
+# Helper function that maps pair indices k in [0, n(n-1)/2) to node pairs (i, j) with j < i
+def pair_from_index(k):
+    i = np.floor((1 + np.sqrt(1 + 8*k.astype(float))) / 2).astype(np.int64)
+    # Correct any off-by-one from floating point rounding
+    i -= i*(i - 1)//2 > k
+    i += (i + 1)*i//2 <= k
+    j = k - i*(i - 1)//2
+    return i, j
+
+
+def sample_pairs(num_pairs, prob, rng):
+    """
+    Returns the sorted indices of the pairs in [0, num_pairs) that are kept independently with
+    probability prob, in O(kept) by skipping over absent pairs with geometric gaps.
+    """
+    if prob <= 0 or num_pairs == 0:
+        return np.empty(0, dtype=np.int64)
+    if prob >= 1:
+        return np.arange(num_pairs, dtype=np.int64)
+
+    # Draw the gaps between kept pairs in chunks until every pair index is passed
+    expected = num_pairs*prob
+    chunk_size = int(expected + 5*np.sqrt(expected)) + 16
+    chunks = []
+    last = -1
+    while last < num_pairs:
+        positions = last + np.cumsum(rng.geometric(prob, size=chunk_size))
+        chunks.append(positions)
+        last = int(positions[-1])
+    pairs = np.concatenate(chunks)
+    return pairs[pairs < num_pairs]
+
+
+def gnp_random_graph(num_nodes, prob, rng=None):
+    """
+    Samples an Erdos-Renyi G(n, p) graph in O(n + m) instead of testing all n(n-1)/2 node pairs
+    like nx.erdos_renyi_graph.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    pairs = sample_pairs(num_nodes*(num_nodes - 1)//2, prob, rng)
+    sources, targets = pair_from_index(pairs)
+    return CSRGraph.from_edges(num_nodes, sources, targets)
+
+
+def barabasi_albert_graph(num_nodes, m, rng=None):
+    """
+    Barabasi-Albert preferential attachment (Batagelj-Brandes): every node adds m edges whose
+    targets are copied from uniformly chosen earlier edge endpoints. The copy chains are resolved
+    with vectorised pointer jumping instead of a per-edge loop. Self-loops and repeated edges are dropped.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    num_slots = 2*num_nodes*m
+    if num_slots == 0:
+        return CSRGraph.from_edges(num_nodes, [], [])
+
+    # Even slots hold the node adding the edge, odd slots point at an earlier (or the same) slot
+    pointer = np.arange(num_slots, dtype=np.int64)
+    edge = np.arange(num_nodes*m, dtype=np.int64)
+    pointer[1::2] = rng.integers(0, 2*edge + 1)
+    while True:
+        odd = pointer % 2 == 1
+        if not odd.any():
+            break
+        pointer[odd] = pointer[pointer[odd]]
+
+    nodes = pointer // 2 // m
+    return CSRGraph.from_edges(num_nodes, nodes[0::2], nodes[1::2], simple=True)
+
+
+def watts_strogatz_graph(num_nodes, k, rewire_prob=0.1, rng=None):
+    """
+    Watts-Strogatz small world: a ring lattice joining every node to its k//2 neighbours on each
+    side, with every edge's far end rewired to a uniform node with probability rewire_prob.
+    Rewirings that create a self-loop or repeated edge are dropped.
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    half = min(k // 2, (num_nodes - 1) // 2)
+    sources = np.repeat(np.arange(num_nodes, dtype=np.int64), half)
+    targets = (sources + np.tile(np.arange(1, half + 1), num_nodes)) % num_nodes
+
+    rewire = rng.random(len(targets)) < rewire_prob
+    targets[rewire] = rng.integers(0, num_nodes, size=int(rewire.sum()))
+    return CSRGraph.from_edges(num_nodes, sources, targets, simple=True)
+
+
+def stochastic_block_graph(sizes, probs, rng=None):
+    """
+    Stochastic block model: nodes are split into consecutive blocks of the given sizes and every
+    pair of nodes in blocks (a, b) is joined with probability probs[a][b].
+    Each block pair is sampled with geometric skipping, so the cost is O(n + m).
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    sizes = np.asarray(sizes, dtype=np.int64)
+    offsets = np.concatenate([[0], np.cumsum(sizes)])
+    sources, targets = [], []
+    for a in range(len(sizes)):
+        # Pairs within the block
+        pairs = sample_pairs(int(sizes[a]*(sizes[a] - 1)//2), probs[a][a], rng)
+        i, j = pair_from_index(pairs)
+        sources.append(offsets[a] + i)
+        targets.append(offsets[a] + j)
+
+        # Pairs between this block and every later block
+        for b in range(a + 1, len(sizes)):
+            pairs = sample_pairs(int(sizes[a]*sizes[b]), probs[a][b], rng)
+            sources.append(offsets[a] + pairs // sizes[b])
+            targets.append(offsets[b] + pairs % sizes[b])
+
+    return CSRGraph.from_edges(int(offsets[-1]), np.concatenate(sources), np.concatenate(targets))
+
+
+def configuration_graph(degrees, rng=None):
+    """
+    Configuration model: the degree stubs are shuffled and joined in pairs.
+    Self-loops and repeated edges are dropped (erased configuration model).
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+
+    degrees = np.asarray(degrees, dtype=np.int64)
+    stubs = np.repeat(np.arange(len(degrees), dtype=np.int64), degrees)
+    if len(stubs) % 2 == 1:
+        raise ValueError("The degree sequence must have an even sum")
+    rng.shuffle(stubs)
+    return CSRGraph.from_edges(len(degrees), stubs[0::2], stubs[1::2], simple=True)
+
+
+# Topology builders selected by name; each takes the network size and average degree
+# and derives its own defaults from them
+def erdos_renyi(num_nodes, avg_node_degree, rng, prob=None):
+    if prob is None:
+        prob = avg_node_degree / num_nodes
+    return gnp_random_graph(num_nodes, prob, rng)
+
+
+def barabasi_albert(num_nodes, avg_node_degree, rng, m=None):
+    if m is None:
+        m = max(1, round(avg_node_degree / 2))  # Each node adds m edges, so the average degree is about 2m
+    return barabasi_albert_graph(num_nodes, m, rng)
+
+
+def watts_strogatz(num_nodes, avg_node_degree, rng, k=None, rewire_prob=0.1):
+    if k is None:
+        k = max(2, 2*round(avg_node_degree / 2))
+    return watts_strogatz_graph(num_nodes, k, rewire_prob, rng)
+
+
+def stochastic_block(num_nodes, avg_node_degree, rng, sizes=None, probs=None, num_blocks=2, mixing=0.1):
+    """
+    Without explicit sizes/probs, splits the nodes into num_blocks equal blocks and picks the
+    within/between block probabilities so that a fraction `mixing` of the average degree crosses blocks.
+    """
+    if sizes is None:
+        sizes = np.full(num_blocks, num_nodes // num_blocks)
+        sizes[:num_nodes % num_blocks] += 1
+    sizes = np.asarray(sizes, dtype=np.int64)
+
+    if probs is None:
+        block = sizes.mean()
+        p_in = avg_node_degree*(1 - mixing) / max(block - 1, 1)
+        p_out = avg_node_degree*mixing / max(sizes.sum() - block, 1)
+        probs = np.full((len(sizes), len(sizes)), min(p_out, 1.0))
+        np.fill_diagonal(probs, min(p_in, 1.0))
+    return stochastic_block_graph(sizes, probs, rng)
+
+
+def configuration(num_nodes, avg_node_degree, rng, degrees=None):
+    # Without a degree sequence, degrees are drawn from a Poisson distribution with the average degree
+    if degrees is None:
+        degrees = rng.poisson(avg_node_degree, size=num_nodes)
+        if degrees.sum() % 2 == 1:
+            degrees[rng.integers(num_nodes)] += 1
+    return configuration_graph(degrees, rng)
+
+
+TOPOLOGIES = {
+    "erdos_renyi": erdos_renyi,
+    "barabasi_albert": barabasi_albert,
+    "watts_strogatz": watts_strogatz,
+    "stochastic_block": stochastic_block,
+    "configuration": configuration,
+}
+
+
+def build_topology(name, num_nodes, avg_node_degree, rng=None, **params):
+    """
+    Builds the named topology (see TOPOLOGIES) as a CSRGraph.
+    """
+    if name not in TOPOLOGIES:
+        raise ValueError(f"Unknown topology: {name}")
+    if rng is None:
+        rng = np.random.default_rng()
+    return TOPOLOGIES[name](num_nodes, avg_node_degree, rng, **params)
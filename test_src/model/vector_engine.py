@@ -0,0 +1,165 @@
+import numpy as np
+from test_src.agent.trader import (
+    TraderState
+)
+from test_src.model.event_log import (
+    EventType
+)
+from test_src.model.redistribution import (
+    best_neighbours,
+    redistribute_simultaneous,
+    redistribute_sequential
+)
+
+
+# Strategy codes used in the struct-of-arrays representation of the agents
+STRATEGY_CODES = {"random": 0, "rsi": 1, "sma": 2, "bollinger": 3}
+
+
+class VectorisedEngine():
+    # Array-backed engine that advances every trader agent in one batched step
+    def __init__(self, indptr, indices, capital, win_rate, generocity_rate, strategy_type="random", strategy_params=None, update="simultaneous"):
+        """
+        indptr/indices hold the trader network as CSR adjacency arrays.
+        update is "simultaneous" (every agent acts on the state at the start of the step) or
+        "sequential" (agents act one at a time in a random order, like shuffle_do).
+        Random draws come from the model's random streams, as for TraderAgent.
+        """
+        if update not in ("simultaneous", "sequential"):
+            raise ValueError(f"Unknown update mode: {update}")
+
+        self.num_agents = len(indptr) - 1
+        n = self.num_agents
+        self.ids = np.arange(1, n + 1)  # Matches the unique_id TraderAgent would be given
+        self.update = update
+
+        # Agent attributes (struct-of-arrays)
+        self.capital = np.full(n, capital, dtype=float)
+        self.win_rate = np.full(n, win_rate, dtype=float)
+        self.generocity_rate = np.full(n, generocity_rate, dtype=float)
+        initial_state = TraderState.HAS_CAPITAL if round(capital) >= 0 else TraderState.ZERO_CAPITAL
+        self.state = np.full(n, initial_state.value, dtype=np.int8)
+
+        # Strategy parameters: every agent points to a (strategy_type, params) group
+        self.strategy_groups = [(strategy_type, dict(strategy_params or {}))]
+        self.strategy_code = np.full(n, STRATEGY_CODES[strategy_type], dtype=np.int8)
+        self.strategy_group = np.zeros(n, dtype=np.int32)
+
+        # Trader network as CSR adjacency arrays (neighbours of i are indices[indptr[i]:indptr[i+1]])
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.edge_sources = np.repeat(np.arange(n), np.diff(self.indptr))
+
+    def count_state(self, state):
+        return int(np.count_nonzero(self.state == state.value))
+
+    def decisions(self, model):
+        """
+        Returns an int8 array of decisions: 1 (Buy), 0 (Sell) or -1 (Hold).
+        """
+        decision = np.full(self.num_agents, -1, dtype=np.int8)
+
+        # Random strategy agents take their signal from the strategy stream
+        is_random = self.strategy_code == STRATEGY_CODES["random"]
+        draws = model.streams.uniforms("strategy", model.market_date) < 0.5
+        decision[is_random] = draws[is_random]
+
+        # Deterministic strategies are computed once per parameter group
+        for group, (strategy_type, params) in enumerate(self.strategy_groups):
+            if strategy_type == "random":
+                continue
+            signal = model.signal_cache.get(strategy_type, params)
+            if signal is not None:
+                decision[self.strategy_group == group] = int(signal)
+
+        return decision
+
+    def trade_outcomes(self, model, active):
+        """
+        Returns (trading, change, won): which agents trade, their capital change and whether they win.
+        Every agent shares the same price memory, so the barrier is queried once.
+        """
+        decision = self.decisions(model)
+        trading = active & (decision >= 0)
+        change = np.zeros(self.num_agents)
+        won = np.zeros(self.num_agents, dtype=bool)
+
+        price_memory = model.current_price
+        index, hit_up, price = model.barrier_touch(price_memory, model.prices.start)
+        if index >= 0:
+            delta = price - price_memory
+            buy = decision == 1
+            change[trading] = np.where(buy, delta, -delta)[trading]
+            won = trading & (buy == hit_up)
+
+        return trading, change, won
+
+    def record_events(self, model, state_before, trading, change, donors, recipients, amounts, donor_capital=None):
+        events = model.events
+        if events.trades:
+            traders = np.flatnonzero(trading & (change != 0))
+            events.record_batch(EventType.TRADE, model.market_date, self.ids[traders], amounts=change[traders], values=self.capital[traders])
+        if events.transfers:
+            # Sequential updates log each donor's capital right after its transfer, as TraderAgent does
+            donor_capital = self.capital[donors] if donor_capital is None else donor_capital
+            events.record_batch(EventType.TRANSFER, model.market_date, self.ids[donors], self.ids[recipients], amounts, donor_capital)
+        if events.bankruptcies:
+            bankrupt = np.flatnonzero((state_before == TraderState.HAS_CAPITAL.value) & (self.state == TraderState.ZERO_CAPITAL.value))
+            events.record_batch(EventType.BANKRUPTCY, model.market_date, self.ids[bankrupt], values=self.capital[bankrupt])
+
+    def step_simultaneous(self, model, active):
+        trading, change, won = self.trade_outcomes(model, active)
+
+        # Trade action (only agents that traded update their state)
+        self.capital += change
+        self.win_rate += won
+        self.state[trading] = self.capital[trading] > 0
+
+        # Every agent that still has capital may give to its most successful neighbour
+        sharing = active & (self.state == TraderState.HAS_CAPITAL.value)
+        best = best_neighbours(self.indptr, self.indices, self.win_rate[self.indices])
+        draws = model.streams.uniforms("sharing", model.market_date)
+        donors = np.flatnonzero(sharing & (best >= 0) & (draws < self.generocity_rate))
+        recipients = best[donors]
+        amounts = redistribute_simultaneous(self.capital, donors, recipients)
+        self.state[sharing] = self.capital[sharing] > 0
+
+        return trading, change, donors, recipients, amounts
+
+    def step_sequential(self, model, active):
+        trading, change, won = self.trade_outcomes(model, active)
+
+        # Agents act in a random order, shuffled by model.random exactly as shuffle_do shuffles the agents;
+        # an agent sees the updated win rate of neighbours that acted before it
+        order = list(range(self.num_agents))
+        model.random.shuffle(order)
+        order = np.array(order, dtype=np.int64)
+        rank = np.empty(self.num_agents, dtype=np.int64)
+        rank[order] = np.arange(self.num_agents)
+        win_rate_after = self.win_rate + won
+        acted_before = rank[self.indices] < rank[self.edge_sources]
+        visible_win_rate = np.where(acted_before, win_rate_after[self.indices], self.win_rate[self.indices])
+        best = best_neighbours(self.indptr, self.indices, visible_win_rate)
+
+        draws = model.streams.uniforms("sharing", model.market_date)
+        gives = (best >= 0) & (draws < self.generocity_rate)
+
+        has_capital = self.state == TraderState.HAS_CAPITAL.value
+        donors, recipients, amounts, donor_capital = redistribute_sequential(order, self.capital, has_capital, change, trading, best, gives)
+        self.win_rate = win_rate_after
+        self.state[:] = has_capital
+
+        return trading, change, donors, recipients, amounts, donor_capital
+
+    def step(self, model):
+        """Advance every agent by one step."""
+        state_before = self.state.copy()
+        active = state_before == TraderState.HAS_CAPITAL.value
+
+        if self.update == "sequential":
+            results = self.step_sequential(model, active)
+        else:
+            results = self.step_simultaneous(model, active)
+
+        if model.events.enabled:
+            self.record_events(model, state_before, *results)
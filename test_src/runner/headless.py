@@ -0,0 +1,165 @@
+import json
+import os
+import time
+import numpy as np
+from test_src.model.model import TraderNetwork
+from test_src.model.ensemble import (
+    ENSEMBLE_PARAMS,
+    TraderEnsemble
+)
+
+
+# Parameters passed straight to the TraderNetwork constructor (same names as the app's model_params)
+MODEL_PARAMS = (
+    "seed",
+    "start_price",
+    "volatility",
+    "generocity_rate",
+    "num_nodes",
+    "avg_node_degree",
+    "topology",
+    "topology_params",
+    "engine",
+    "update",
+    "strategy_type",
+    "strategy_params",
+    "event_level",
+    "record_every",
+    "record_dtype",
+    "record_path",
+    "checkpoint_every",
+    "checkpoint_path",
+    "price_feed",
+    "price_column",
+    "barrier_mode",
+    "barrier_tie",
+)
+
+DEFAULT_PARAMS = {
+    "seed": 1,
+    "start_price": 100,
+    "volatility": 0.01,
+    "generocity_rate": 0.5,
+    "num_nodes": 3,
+    "avg_node_degree": 3,
+    "steps": 100,
+}
+
+
+# Helper function that merges a JSON config file and explicit overrides over the defaults
+def load_params(config_path=None, overrides=None):
+    params = dict(DEFAULT_PARAMS)
+    if config_path is not None:
+        with open(config_path) as f:
+            params.update(json.load(f))
+    params.update({k: v for k, v in (overrides or {}).items() if v is not None})
+    return params
+
+
+def build_model(params):
+    # Continue a checkpointed run instead of starting a new one
+    if params.get("resume") is not None:
+        return TraderNetwork.from_checkpoint(params["resume"])
+
+    kwargs = {name: params[name] for name in MODEL_PARAMS if name in params}
+    # Preallocate the agent history for the whole run
+    if kwargs.get("record_every") is not None and "steps" in params:
+        kwargs["record_capacity"] = int(params["steps"]) // kwargs["record_every"] + 1
+    return TraderNetwork(**kwargs)
+
+
+def run_model(model, steps):
+    """
+    Steps the model without any visualisation and returns the wall-clock time taken.
+    """
+    start = time.perf_counter()
+    for _ in range(steps):
+        if not model.running:
+            break
+        model.step()
+    return time.perf_counter() - start
+
+
+def write_output(model, output_path):
+    """
+    Writes the DataCollector model series (one row per step) to CSV.
+    """
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    data = model.datacollector.get_model_vars_dataframe()
+    data.index.name = "step"
+    data.to_csv(output_path)
+
+
+def run(params, output_path=None, events_path=None):
+    """
+    Builds, runs and (optionally) saves one headless TraderNetwork run. Returns a timing summary.
+    """
+    build_start = time.perf_counter()
+    model = build_model(params)
+    build_time = time.perf_counter() - build_start
+
+    # Full event buffers are flushed to events_path during the run
+    if events_path is not None:
+        if os.path.exists(events_path):
+            os.remove(events_path)
+        model.events.path = events_path
+
+    # steps is the length of the whole run, so a resumed run only does the remaining steps
+    start_date = model.market_date
+    wall_time = run_model(model, max(int(params["steps"]) - start_date, 0))
+    steps = model.market_date - start_date  # Fewer if a replayed price feed ran out
+
+    if output_path is not None:
+        write_output(model, output_path)
+    if events_path is not None:
+        model.events.flush()
+    if model.recorder is not None:
+        model.recorder.flush()
+
+    return {
+        "model": model,
+        "steps": steps,
+        "build_time": build_time,
+        "wall_time": wall_time,
+        "steps_per_second": steps / wall_time if wall_time > 0 else float("inf"),
+    }
+
+
+# Helper function that spawns one deterministic seed per replica from a base seed (as sweep tasks do)
+def ensemble_seeds(base_seed, num_replicas):
+    return [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(base_seed).spawn(num_replicas)]
+
+
+def run_ensemble(params, num_replicas, output_path=None):
+    """
+    Runs num_replicas seeds of one configuration in lockstep (see TraderEnsemble) and optionally
+    writes every replica's model series as one long CSV. Returns a timing summary.
+    """
+    kwargs = {name: params[name] for name in ENSEMBLE_PARAMS if name in params}
+    seeds = ensemble_seeds(params.get("seed", 0), num_replicas)
+
+    build_start = time.perf_counter()
+    ensemble = TraderEnsemble(seeds, **kwargs)
+    build_time = time.perf_counter() - build_start
+
+    start = time.perf_counter()
+    ensemble.run(int(params["steps"]))
+    wall_time = time.perf_counter() - start
+
+    if output_path is not None:
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        ensemble.model_vars_dataframe().to_csv(output_path, index=False)
+
+    steps = int(params["steps"])
+    return {
+        "ensemble": ensemble,
+        "steps": steps,
+        "build_time": build_time,
+        "wall_time": wall_time,
+        "steps_per_second": steps / wall_time if wall_time > 0 else float("inf"),
+    }
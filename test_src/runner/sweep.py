@@ -0,0 +1,170 @@
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+from test_src.runner.headless import (
+    DEFAULT_PARAMS,
+    build_model,
+    run_model
+)
+
+# Parquet output is optional and only needs pyarrow when requested
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+
+""" [1] Designs """
+# Helper function that expands a {parameter: [values]} grid into one dict per combination
+def expand_grid(grid):
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*(grid[name] for name in names))]
+
+
+# Helper function that samples a random design. Each range is either (low, high) or
+# {"low": ..., "high": ...} for a uniform draw (integers if both bounds are ints), or a list of choices.
+def random_design(ranges, num_samples, seed=0):
+    rng = np.random.default_rng(seed)
+    design = [{} for _ in range(num_samples)]
+    for name, spec in ranges.items():
+        if isinstance(spec, (tuple, dict)):
+            low, high = (spec["low"], spec["high"]) if isinstance(spec, dict) else spec
+            if isinstance(low, int) and isinstance(high, int):
+                values = rng.integers(low, high + 1, size=num_samples).tolist()
+            else:
+                values = rng.uniform(low, high, size=num_samples).tolist()
+        else:
+            values = [spec[i] for i in rng.integers(0, len(spec), size=num_samples)]
+        for point, value in zip(design, values):
+            point[name] = value
+    return design
+
+
+def make_tasks(design, steps, base_seed=0, replicates=1):
+    """
+    Turns a design into a list of task dicts. Tasks without an explicit seed get a deterministic one
+    spawned from base_seed, so the same design always produces the same runs. With several replicates,
+    an explicit seed is the root of one derived seed per replicate (SeedSequence([seed, replicate])).
+    """
+    children = np.random.SeedSequence(base_seed).spawn(len(design) * replicates)
+    tasks = []
+    for task_id, (point, replicate) in enumerate(itertools.product(design, range(replicates))):
+        params = dict(DEFAULT_PARAMS)
+        params.update(point)
+        params["steps"] = steps
+        if "seed" not in point:
+            params["seed"] = int(children[task_id].generate_state(1)[0])
+        elif replicates > 1:
+            params["seed"] = int(np.random.SeedSequence([int(point["seed"]), replicate]).generate_state(1)[0])
+        tasks.append({"task_id": task_id, "replicate": replicate, "params": params})
+    return tasks
+
+
+# Helper function that builds the tasks described by a sweep config dict (e.g. loaded from JSON):
+# {"grid": {...}} or {"random": {...}, "samples": n}, plus optional "steps", "base_seed", "replicates"
+def tasks_from_config(config):
+    if "grid" in config:
+        design = expand_grid(config["grid"])
+    else:
+        design = random_design(config["random"], config["samples"], seed=config.get("design_seed", 0))
+    return make_tasks(design, config.get("steps", DEFAULT_PARAMS["steps"]), config.get("base_seed", 0), config.get("replicates", 1))
+
+
+""" [2] Running Tasks """
+def run_task(task):
+    """
+    Runs one sweep task in a worker process and returns its results as a long (tidy) table with
+    columns task_id, replicate, <parameters>, step, variable, agent_id, value.
+    """
+    params = task["params"]
+    model = build_model(params)
+    wall_time = run_model(model, int(params["steps"]))
+
+    # Model-level series (agent_id -1)
+    series = model.datacollector.get_model_vars_dataframe()
+    series.index.name = "step"
+    model_rows = series.reset_index().melt(id_vars="step", var_name="variable", value_name="value")
+    model_rows["agent_id"] = -1
+
+    # Final capital of every agent
+    capital = model.agent_capital()
+    agent_rows = pd.DataFrame({
+        "step": model.steps,
+        "variable": "capital",
+        "agent_id": np.arange(len(capital)),
+        "value": capital,
+    })
+
+    results = pd.concat([model_rows, agent_rows], ignore_index=True)
+    results["value"] = results["value"].astype(float)
+    results.insert(0, "task_id", task["task_id"])
+    results.insert(1, "replicate", task["replicate"])
+    scalar_params = [(name, value) for name, value in sorted(params.items()) if isinstance(value, (int, float, str, bool, np.integer, np.floating))]
+    for position, (name, value) in enumerate(scalar_params):
+        results.insert(2 + position, name, value)
+
+    return results, wall_time
+
+
+class ResultsWriter():
+    # Appends each finished task to one columnar results file (CSV, or Parquet if pyarrow is installed)
+    def __init__(self, output_path):
+        self.output_path = output_path
+        self.parquet = output_path.endswith(".parquet")
+        self.writer = None
+        self.columns = None
+
+        if self.parquet and pq is None:
+            raise ImportError("Writing .parquet results requires pyarrow (pip install pyarrow)")
+
+        directory = os.path.dirname(output_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(output_path):
+            os.remove(output_path)
+
+    def write(self, results):
+        # Every task shares the first task's column layout
+        if self.columns is None:
+            self.columns = list(results.columns)
+        results = results.reindex(columns=self.columns)
+
+        if self.parquet:
+            table = pa.Table.from_pandas(results, preserve_index=False)
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.output_path, table.schema)
+            self.writer.write_table(table.cast(self.writer.schema))
+        else:
+            results.to_csv(self.output_path, mode="a", header=not os.path.exists(self.output_path), index=False)
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def run_sweep(tasks, output_path, max_workers=None, progress=True):
+    """
+    Runs every task across a process pool (all cores by default), streaming each task's results to
+    output_path as soon as it finishes. Returns the total wall-clock time.
+    """
+    writer = ResultsWriter(output_path)
+    start = time.perf_counter()
+
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(run_task, task): task for task in tasks}
+            for done, future in enumerate(as_completed(futures), start=1):
+                results, wall_time = future.result()
+                writer.write(results)
+                if progress:
+                    task = futures[future]
+                    print(f"[{done}/{len(tasks)}] task {task['task_id']} (seed {task['params']['seed']}) finished in {wall_time:.2f}s")
+    finally:
+        writer.close()
+
+    return time.perf_counter() - start
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from test_src.agent.trader import (
+    TraderState
+)
+from test_src.model.aggregates import (
+    CountAbove,
+    TotalCapital
+)
+from test_src.model.model import (
+    TraderNetwork
+)
+
+
+@pytest.mark.parametrize("engine", ["agents", "vectorised"])
+def test_aggregates_match_full_scans(engine):
+    model = TraderNetwork(
+        num_nodes=60, seed=9, volatility=0.6, engine=engine,
+        aggregates={"Total_Capital": TotalCapital(), "Above_100": CountAbove(100)},
+    )
+    for _ in range(150):
+        model.step()
+        capital, state = model.agent_capital(), model.agent_states()
+        assert model.aggregates["Total_Capital"] == pytest.approx(capital.sum(), rel=1e-9)
+        assert model.aggregates["Above_100"] == np.count_nonzero(capital > 100)
+        assert model.aggregates["With_Capital"] == np.count_nonzero(state == TraderState.HAS_CAPITAL.value)
+        assert model.aggregates["Zero_Capital"] == np.count_nonzero(state == TraderState.ZERO_CAPITAL.value)
+
+    collected = model.datacollector.get_model_vars_dataframe()
+    assert collected["Above_100"].iloc[-1] == np.count_nonzero(model.agent_capital() > 100)
+    assert collected["Zero_Capital"].iloc[-1] > 0
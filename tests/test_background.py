@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+from test_src.app.background import (
+    BackgroundRunner,
+    ModelSnapshot,
+    source_model
+)
+from test_src.model.model import (
+    TraderNetwork
+)
+
+
+def build_model(seed=5):
+    return TraderNetwork(num_nodes=10, seed=seed, engine="vectorised")
+
+
+def test_runner_publishes_the_final_state():
+    model = build_model()
+    runner = BackgroundRunner(model, fps=1000, max_steps=200)
+    runner.start()
+    runner.thread.join(30)
+    assert not runner.is_running
+    assert runner.error is None
+
+    version, snapshot = runner.latest()
+    assert version >= 1
+    assert snapshot.steps == model.steps == 200
+    np.testing.assert_array_equal(snapshot.price_history, model.price_history)
+    np.testing.assert_array_equal(snapshot.agent_capital(), model.agent_capital())
+
+    # The same run stepped in the foreground reaches the same state
+    reference = build_model()
+    for _ in range(200):
+        reference.step()
+    np.testing.assert_array_equal(snapshot.agent_capital(), reference.agent_capital())
+
+
+def test_snapshot_is_a_read_only_copy():
+    model = build_model()
+    snapshot = ModelSnapshot(model)
+    with pytest.raises(ValueError):
+        snapshot.capital[0] = 0
+    with pytest.raises(ValueError):
+        snapshot.price_history[0] = 0
+    model.step()
+    assert len(snapshot.price_history) == 1
+    assert source_model(snapshot) is model
+    assert source_model(model) is model
+
+
+def test_stop_ends_an_unbounded_run():
+    model = build_model()
+    runner = BackgroundRunner(model, fps=1000)
+    runner.start()
+    runner.stop(timeout=30)
+    assert not runner.is_running
+    assert runner.latest()[1].steps == model.steps
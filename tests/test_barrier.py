@@ -0,0 +1,157 @@
+import os
+import numpy as np
+import pytest
+from test_src.model.barrier import (
+    BarrierIndex,
+    BatchBarrierIndex,
+    OHLCBarrierIndex
+)
+from test_src.model.model import (
+    TraderNetwork
+)
+
+
+SAMPLE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "BTCUSDT_kline_1h_bt=180d.csv")
+
+
+def linear_touch(highs, lows, up, down, start):
+    for index in range(start, len(highs)):
+        if highs[index] >= up or lows[index] <= down:
+            return index
+    return -1
+
+
+def random_path(rng, length):
+    return 100 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))
+
+
+@pytest.mark.parametrize("window", [None, 5, 40])
+def test_touch_matches_linear_scan(window):
+    rng = np.random.default_rng(0)
+    prices = random_path(rng, 600)
+    index = BarrierIndex(prices[:3], capacity=4, window=window)
+    capacity = index.capacity
+    for length in range(4, len(prices) + 1):
+        index.append(prices[length - 1])
+        assert len(index) == length
+        if window is not None:
+            assert index.capacity == capacity
+            np.testing.assert_array_equal(index.prices, prices[index.offset:length])
+        start = length - min(length, window or length) + int(rng.integers(0, min(length, window or length)))
+        up, down = prices[start] * (1 + rng.normal(0, 0.02, 2))
+        expected = linear_touch(prices[:length], prices[:length], up, down, start)
+        got, hit_up, price = index.touch(up, down, start)
+        assert got == expected
+        if expected >= 0:
+            assert price == prices[expected]
+            assert hit_up == (prices[expected] >= up)
+
+
+def test_window_rejects_dropped_prices():
+    index = BarrierIndex(np.arange(10.0), capacity=4, window=2)
+    index.extend(np.arange(10.0, 20.0))
+    assert index.offset > 0
+    with pytest.raises(IndexError):
+        index.first_hit(100, 0, start=0)
+
+
+@pytest.mark.parametrize("window", [None, 6])
+def test_ohlc_touch_matches_linear_scan(window):
+    rng = np.random.default_rng(1)
+    closes = random_path(rng, 300)
+    opens = np.r_[closes[0], closes[:-1]]
+    highs = np.maximum(opens, closes) * (1 + rng.uniform(0, 0.01, len(closes)))
+    lows = np.minimum(opens, closes) * (1 - rng.uniform(0, 0.01, len(closes)))
+    for tie in ("open", "up", "down"):
+        index = OHLCBarrierIndex(opens[:1], highs[:1], lows[:1], closes[:1], capacity=2, tie=tie, window=window)
+        for length in range(2, len(closes) + 1):
+            bar = length - 1
+            index.append_bar(opens[bar], highs[bar], lows[bar], closes[bar])
+            start = max(0, length - (window or length))
+            up, down = closes[start] * (1 + rng.normal(0, 0.01, 2))
+            expected = linear_touch(highs[:length], lows[:length], up, down, start)
+            got, hit_up, price = index.touch(up, down, start)
+            assert got == expected
+            if expected < 0:
+                continue
+            both = highs[expected] >= up and lows[expected] <= down
+            if both and tie == "open":
+                assert hit_up == (up - opens[expected] <= opens[expected] - down)
+            elif both:
+                assert hit_up == (tie == "up")
+            else:
+                assert hit_up == (highs[expected] >= up)
+            assert price == (max(up, opens[expected]) if hit_up else min(down, opens[expected]))
+        np.testing.assert_array_equal(index.prices, closes[len(closes) - len(index.prices):])
+
+
+@pytest.mark.parametrize("window", [None, 7])
+def test_batch_touch_matches_single_series(window):
+    rng = np.random.default_rng(2)
+    paths = np.stack([random_path(rng, 200) for _ in range(4)])
+    batch = BatchBarrierIndex(paths[:, :1], capacity=2, window=window)
+    singles = [BarrierIndex(path[:1], capacity=2, window=window) for path in paths]
+    for step in range(1, paths.shape[1]):
+        batch.append(paths[:, step])
+        for single, path in zip(singles, paths):
+            single.append(path[step])
+        start = max(0, len(batch) - (window or len(batch)))
+        up = paths[:, start] * (1 + rng.uniform(0, 0.03, 4))
+        down = paths[:, start] * (1 - rng.uniform(0, 0.03, 4))
+        index, hit_up, price = batch.touch(up, down, start)
+        expected = [single.touch(u, d, start) for single, u, d in zip(singles, up, down)]
+        assert index.tolist() == [e[0] for e in expected]
+        assert hit_up.tolist() == [e[1] for e in expected]
+        np.testing.assert_array_equal(price, [e[2] for e in expected])
+
+
+def test_windowed_model_barrier_stays_bounded():
+    windowed = TraderNetwork(num_nodes=4, seed=3, volatility=0.5, history_length=8)
+    unbounded = TraderNetwork(num_nodes=4, seed=3, volatility=0.5, history_length=8)
+    unbounded.barrier = BarrierIndex(unbounded.price_history)
+    for _ in range(2500):
+        windowed.step()
+        unbounded.step()
+
+    assert len(windowed.barrier) == len(unbounded.barrier) == 2501
+    assert windowed.barrier.capacity == 1024
+    assert len(windowed.barrier.prices) <= 1024
+    assert windowed.datacollector.get_model_vars_dataframe().equals(unbounded.datacollector.get_model_vars_dataframe())
+    np.testing.assert_array_equal(windowed.agent_capital(), unbounded.agent_capital())
+
+
+@pytest.mark.parametrize("history_length", [None, 12])
+def test_model_barrier_touch_matches_linear_scan(history_length):
+    model = TraderNetwork(num_nodes=3, seed=8, volatility=0.8, history_length=history_length)
+    for _ in range(300):
+        model.step()
+        history = np.asarray(model.price_history)
+        start = model.prices.start
+        price_memory = history[int(model.market_date) % len(history)]
+        up, down = price_memory * 1.001, price_memory * 0.0090
+        expected = linear_touch(history, history, up, down, 0)
+        index, hit_up, price = model.barrier_touch(price_memory, start)
+        assert index == (-1 if expected < 0 else start + expected)
+        if expected >= 0:
+            assert price == history[expected]
+            assert hit_up == (history[expected] >= up)
+
+
+@pytest.mark.parametrize("history_length", [None, 12])
+def test_model_ohlc_touch_matches_linear_scan(history_length):
+    model = TraderNetwork(num_nodes=3, seed=8, price_feed=SAMPLE, price_start=100, barrier_mode="ohlc", history_length=history_length)
+    highs = np.asarray(model.klines["high"])[100:]
+    lows = np.asarray(model.klines["low"])[100:]
+    for _ in range(200):
+        model.step()
+        length = len(model.barrier)
+        start = model.prices.start
+        price_memory = float(model.price_history[0])
+        up, down = price_memory * 1.001, price_memory * 0.0090
+        expected = linear_touch(highs[:length], lows[:length], up, down, start)
+        assert model.barrier_touch(price_memory, start)[0] == expected
+
+
+def test_ohlc_mode_needs_a_price_feed():
+    with pytest.raises(ValueError):
+        TraderNetwork(num_nodes=3, seed=8, barrier_mode="ohlc")
@@ -0,0 +1,95 @@
+import json
+import os
+import numpy as np
+import pytest
+from test_src.model.model import (
+    TraderNetwork
+)
+from test_src.model import (
+    checkpoint
+)
+from test_src.model.checkpoint import (
+    MANIFEST,
+    manifest_value
+)
+
+
+def run(model, steps):
+    for _ in range(steps):
+        model.step()
+    return model
+
+
+@pytest.mark.parametrize("engine", ["agents", "vectorised"])
+def test_resumed_run_matches_uninterrupted_run(tmp_path, engine):
+    params = dict(
+        num_nodes=10,
+        topology="configuration",
+        topology_params={"degrees": np.full(10, 2)},
+        volatility=0.3,
+        seed=11,
+        history_length=8,
+        price_chunk_size=7,
+        engine=engine,
+        record_every=3,
+        record_dtype=np.float32,
+    )
+    path = str(tmp_path / "checkpoint")
+    full = TraderNetwork(**params)
+    run(full, 12)
+    full.save_checkpoint(path)
+    run(full, 13)
+
+    with open(tmp_path / "checkpoint" / MANIFEST) as f:
+        saved = json.load(f)["params"]
+    assert saved["record_dtype"] == "<f4"
+    assert saved["topology_params"] == {"degrees": [2] * 10}
+
+    resumed = TraderNetwork.from_checkpoint(path)
+    assert resumed.recorder["capital"].dtype == np.float32
+    run(resumed, 13)
+    assert resumed.steps == full.steps
+    assert resumed.current_price == full.current_price
+    np.testing.assert_array_equal(resumed.agent_capital(), full.agent_capital())
+    np.testing.assert_array_equal(np.asarray(resumed.price_history), np.asarray(full.price_history))
+    assert resumed.datacollector.get_model_vars_dataframe().equals(full.datacollector.get_model_vars_dataframe())
+    np.testing.assert_array_equal(resumed.recorder["capital"], full.recorder["capital"])
+
+
+def test_manifest_values_are_encoded_exactly():
+    encoded = manifest_value({"dtype": np.float32, "array": np.arange(3), "scalar": np.int64(4), "nested": (np.dtype("int8"),)})
+    assert encoded == {"dtype": "<f4", "array": [0, 1, 2], "scalar": 4, "nested": ["|i1"]}
+    assert np.dtype(encoded["dtype"]) == np.float32
+    with pytest.raises(TypeError, match="params.callback"):
+        manifest_value({"params": {"callback": print}})
+    with pytest.raises(TypeError):
+        manifest_value({1: "not a string key"})
+
+
+def test_crash_while_swapping_keeps_the_last_checkpoint(tmp_path, monkeypatch):
+    path = str(tmp_path / "checkpoint")
+    model = TraderNetwork(num_nodes=10, seed=4, volatility=0.3)
+    run(model, 5)
+    model.save_checkpoint(path)
+    run(model, 5)
+    model.save_checkpoint(path)
+    assert sorted(os.listdir(tmp_path)) == ["checkpoint"]
+    run(model, 5)
+
+    # The next save stops right after moving the last checkpoint aside
+    replace = os.replace
+    def crash(source, target):
+        replace(source, target)
+        if target.endswith(".old"):
+            raise KeyboardInterrupt
+    monkeypatch.setattr(checkpoint.os, "replace", crash)
+    with pytest.raises(KeyboardInterrupt):
+        model.save_checkpoint(path)
+    monkeypatch.undo()
+    assert not os.path.exists(path)
+
+    resumed = TraderNetwork.from_checkpoint(path)
+    assert resumed.steps == 10
+    model.save_checkpoint(path)
+    assert sorted(os.listdir(tmp_path)) == ["checkpoint"]
+    assert TraderNetwork.from_checkpoint(path).steps == 15
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+from test_src.model.ensemble import (
+    TraderEnsemble
+)
+from test_src.model.model import (
+    TraderNetwork
+)
+from test_src.runner.headless import (
+    ensemble_seeds,
+    run_ensemble
+)
+
+SEEDS = [3, 11, 42]
+
+
+@pytest.mark.parametrize("params", [
+    dict(num_nodes=12, volatility=0.5),
+    dict(num_nodes=12, volatility=0.5, history_length=16, topology="watts_strogatz"),
+])
+def test_replicas_match_individual_runs(params):
+    ensemble = TraderEnsemble(SEEDS, **params).run(150)
+    for replica, seed in enumerate(SEEDS):
+        model = TraderNetwork(seed=seed, engine="vectorised", **params)
+        for _ in range(150):
+            model.step()
+        pd.testing.assert_frame_equal(ensemble.replica_dataframe(replica), model.datacollector.get_model_vars_dataframe(), check_dtype=False)
+        np.testing.assert_array_equal(ensemble.agent_capital()[replica], model.agent_capital())
+        np.testing.assert_array_equal(ensemble.current_price[replica], model.current_price)
+
+
+@pytest.mark.parametrize("params", [
+    dict(seed=1),
+    dict(engine="agent"),
+    dict(update="sequential"),
+    dict(strategy_type="sma"),
+])
+def test_unsupported_parameters(params):
+    with pytest.raises(ValueError):
+        TraderEnsemble(SEEDS, **params)
+
+
+def test_run_ensemble_writes_every_replica(tmp_path):
+    seeds = ensemble_seeds(7, 4)
+    assert seeds == ensemble_seeds(7, 4)
+    assert len(set(seeds)) == 4
+
+    output = tmp_path / "ensemble.csv"
+    result = run_ensemble({"seed": 7, "steps": 20, "num_nodes": 6, "volatility": 0.5}, 4, str(output))
+    table = pd.read_csv(output)
+    assert len(table) == 4 * 21
+    assert table["seed"].unique().tolist() == seeds
+    assert table[table["replica"] == 2].drop(columns=["replica", "seed", "step"]).reset_index(drop=True).equals(result["ensemble"].replica_dataframe(2))
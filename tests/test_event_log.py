@@ -0,0 +1,63 @@
+import json
+import numpy as np
+import pytest
+from test_src.model.event_log import (
+    EVENT_DTYPE,
+    EventLog,
+    EventType
+)
+from test_src.model.model import (
+    TraderNetwork
+)
+
+
+def test_levels_enable_event_types():
+    log = EventLog("info")
+    assert (log.trades, log.transfers, log.bankruptcies, log.enabled) == (False, True, True, True)
+    log.set_level("off")
+    assert not log.enabled
+
+
+def test_batches_match_single_records_and_ring_drops_oldest():
+    single, batched = EventLog("debug", capacity=8), EventLog("debug", capacity=8)
+    for step in range(3):
+        agents = np.arange(5) + 10 * step
+        for agent in agents:
+            single.record(EventType.TRADE, step, agent, amount=agent / 2, value=1.0)
+        batched.record_batch(EventType.TRADE, step, agents, amounts=agents / 2, values=1.0)
+
+    np.testing.assert_array_equal(batched.records(), single.records())
+    assert single.dropped == batched.dropped == 7
+    assert batched.records()["agent"].tolist() == [3, 4, 10, 11, 12, 13, 14, 20, 21, 22, 23, 24][-8:]
+
+
+@pytest.mark.parametrize("suffix", [".bin", ".ndjson"])
+def test_full_buffers_are_flushed_to_path(tmp_path, suffix):
+    path = str(tmp_path / f"events{suffix}")
+    log = EventLog("debug", capacity=4, path=path)
+    log.record_batch(EventType.TRANSFER, 1, np.arange(10), others=np.arange(10) + 1, amounts=0.5)
+    log.record(EventType.BANKRUPTCY, 2, 99)
+    log.flush()
+    assert log.dropped == 0
+
+    if suffix == ".bin":
+        events = np.fromfile(path, dtype=EVENT_DTYPE)
+        agents, types = events["agent"].tolist(), events["type"].tolist()
+    else:
+        with open(path) as f:
+            lines = [json.loads(line) for line in f]
+        agents, types = [line["agent"] for line in lines], [line["type"] for line in lines]
+    assert agents == list(range(10)) + [99]
+    assert types[-1] in (EventType.BANKRUPTCY.value, "bankruptcy")
+
+
+@pytest.mark.parametrize("engine", ["agents", "vectorised"])
+def test_model_logs_every_bankruptcy(engine):
+    model = TraderNetwork(num_nodes=40, seed=6, volatility=0.8, engine=engine, event_level="warning")
+    for _ in range(200):
+        model.step()
+    events = model.events.records()
+    assert set(events["type"].tolist()) <= {EventType.BANKRUPTCY.value}
+    zero_capital = model.datacollector.get_model_vars_dataframe()["Zero_Capital"]
+    assert len(events) == zero_capital.iloc[-1] - zero_capital.iloc[0] > 0
+    assert len(set(events["agent"].tolist())) == len(events)
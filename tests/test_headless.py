@@ -0,0 +1,53 @@
+import json
+import os
+import subprocess
+import sys
+import pandas as pd
+from test_src.runner.headless import (
+    load_params,
+    run
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_config_file_and_overrides(tmp_path):
+    config = tmp_path / "config.json"
+    config.write_text(json.dumps({"num_nodes": 7, "volatility": 0.2}))
+    params = load_params(str(config), {"volatility": 0.3, "seed": None})
+    assert params["num_nodes"] == 7
+    assert params["volatility"] == 0.3
+    assert params["seed"] == 1
+
+
+def test_run_writes_one_row_per_step(tmp_path):
+    params = load_params(overrides={"num_nodes": 10, "steps": 30, "seed": 4, "volatility": 0.3})
+    first, second = tmp_path / "first.csv", tmp_path / "second.csv"
+    summary = run(params, str(first))
+    run(params, str(second))
+
+    data = pd.read_csv(first)
+    assert summary["steps"] == 30
+    assert data["step"].tolist() == list(range(31))
+    assert (data["Zero_Capital"] + data["With_Capital"] == 10).all()
+    assert first.read_text() == second.read_text()
+
+
+def test_resumed_run_only_does_the_remaining_steps(tmp_path):
+    checkpoint = str(tmp_path / "checkpoint")
+    params = load_params(overrides={"num_nodes": 10, "steps": 20, "seed": 4, "volatility": 0.3, "checkpoint_every": 10, "checkpoint_path": checkpoint})
+    full = run(dict(params, steps=30), str(tmp_path / "full.csv"))
+    run(params)
+    resumed = run(dict(params, steps=30, resume=checkpoint), str(tmp_path / "resumed.csv"))
+    assert resumed["steps"] == 10
+    assert (tmp_path / "resumed.csv").read_text() == (tmp_path / "full.csv").read_text()
+    assert full["model"].current_price == resumed["model"].current_price
+
+
+def test_command_line_entry_point(tmp_path):
+    output = tmp_path / "run.csv"
+    subprocess.run(
+        [sys.executable, "main.py", "--num_nodes", "5", "--steps", "12", "--seed", "2", "--output", str(output)],
+        cwd=ROOT, check=True, capture_output=True,
+    )
+    assert len(pd.read_csv(output)) == 13
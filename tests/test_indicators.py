@@ -0,0 +1,99 @@
+import numpy as np
+import pytest
+from test_src.model.indicators import (
+    RollingIndicators
+)
+from test_src.model.model import (
+    TraderNetwork
+)
+from test_src.model.price_buffer import (
+    PriceBuffer
+)
+
+
+def naive_rsi(prices, period, smoothing):
+    deltas = np.diff(prices)
+    gains, losses = np.maximum(deltas, 0), np.maximum(-deltas, 0)
+    if smoothing == "wilder":
+        avg_gain, avg_loss = gains[:period].mean(), losses[:period].mean()
+        for gain, loss in zip(gains[period:], losses[period:]):
+            avg_gain = (avg_gain * (period - 1) + gain) / period
+            avg_loss = (avg_loss * (period - 1) + loss) / period
+    else:
+        avg_gain, avg_loss = gains[-period:].mean(), losses[-period:].mean()
+    if avg_loss <= 0:
+        return 100
+    return 100 - 100 / (1 + avg_gain / avg_loss)
+
+
+@pytest.mark.parametrize("history", ["list", "ring"])
+def test_rolling_indicators_match_naive_formulas(history):
+    rng = np.random.default_rng(4)
+    path = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 400)))
+    prices = [path[0]] if history == "list" else PriceBuffer([path[0]], max_length=64)
+    indicators = RollingIndicators(prices, resync_every=37)
+
+    for count in range(2, len(path) + 1):
+        prices.append(path[count - 1])
+        indicators.update()
+        seen = path[:count]
+        if count == 50:
+            indicators.window(9)  # A window created mid-run is backfilled from the history
+
+        sma = indicators.sma(28)
+        assert sma is None if count < 29 else sma == pytest.approx(seen[-29:-1].mean(), rel=1e-10)
+
+        bands = indicators.bollinger(20, 2)
+        if count < 20:
+            assert bands is None
+        else:
+            recent = seen[-20:]
+            np.testing.assert_allclose(bands, (recent.mean() - 2 * recent.std(), recent.mean() + 2 * recent.std()), rtol=1e-9)
+
+        rsi = indicators.rsi(14)
+        assert rsi is None if count < 15 else rsi == pytest.approx(naive_rsi(seen[-15:], 14, "simple"), rel=1e-8)
+        if count >= 50:
+            assert indicators.rsi(9, "wilder") == pytest.approx(naive_rsi(seen, 9, "wilder"), rel=1e-8)
+
+
+@pytest.mark.parametrize("period", [5, 14])
+@pytest.mark.parametrize("extra", [0, 1])
+def test_indicators_on_a_ring_no_longer_than_the_period(period, extra):
+    rng = np.random.default_rng(period + extra)
+    path = 100 * np.exp(np.cumsum(rng.normal(0, 0.02, 200)))
+    prices = PriceBuffer([path[0]], max_length=period + extra)
+    indicators = RollingIndicators(prices, resync_every=17)
+    for count in range(2, len(path) + 1):
+        prices.append(path[count - 1])
+        indicators.update()
+        visible = path[max(0, count - period - extra):count]
+
+        bands = indicators.bollinger(period, 2)
+        if len(visible) < period:
+            assert bands is None
+        else:
+            recent = visible[-period:]
+            np.testing.assert_allclose(bands, (recent.mean() - 2 * recent.std(), recent.mean() + 2 * recent.std()), rtol=1e-9)
+
+        rsi, sma = indicators.rsi(period), indicators.sma(period)
+        if len(visible) < period + 1:
+            assert rsi is None and sma is None
+        else:
+            assert rsi == pytest.approx(naive_rsi(visible[-period - 1:], period, "simple"), rel=1e-8)
+            assert sma == pytest.approx(visible[-period - 1:-1].mean(), rel=1e-10)
+
+
+@pytest.mark.parametrize("strategy_type, period, history_length", [
+    ("rsi", 14, 15),
+    ("sma", 28, 29),
+    ("bollinger", 20, 20),
+])
+def test_strategies_run_on_a_tight_ring(strategy_type, period, history_length):
+    runs = []
+    for engine in ("agents", "vectorised"):
+        model = TraderNetwork(num_nodes=10, seed=1, strategy_type=strategy_type, strategy_params={"period": period}, generocity_rate=0.0, history_length=history_length, engine=engine)
+        for _ in range(60):
+            model.step()
+        assert len(model.price_history) == history_length
+        runs.append(model.agent_capital())
+    np.testing.assert_array_equal(*runs)
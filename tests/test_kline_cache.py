@@ -0,0 +1,64 @@
+import os
+import numpy as np
+import pandas as pd
+import pytest
+from test_src.data_gathering.kline_cache import (
+    KLINE_COLUMNS,
+    KlineReplayFeed,
+    cache_is_valid,
+    open_klines
+)
+from test_src.model.model import (
+    TraderNetwork
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE = os.path.join(ROOT, "data", "BTCUSDT_kline_1h_bt=180d.csv")
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "klines.csv"
+    pd.read_csv(SAMPLE, nrows=300).to_csv(path, index=False)
+    return str(path)
+
+
+def test_cache_matches_pandas(csv_path, tmp_path):
+    klines = open_klines(csv_path, str(tmp_path / "cache"))
+    expected = pd.read_csv(csv_path)
+    assert len(klines) == 300
+    for name in KLINE_COLUMNS:
+        if name == "timestamp":
+            np.testing.assert_array_equal(klines.timestamps(), pd.to_datetime(expected["timestamp"]).to_numpy("datetime64[ns]"))
+        else:
+            np.testing.assert_array_equal(klines[name], expected[name].to_numpy(KLINE_COLUMNS[name]))
+
+
+def test_cache_is_rebuilt_only_when_the_csv_changes(csv_path, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    open_klines(csv_path, cache_dir)
+
+    os.utime(csv_path, ns=(1, 1))  # Touched but unchanged: the hash still matches
+    assert cache_is_valid(csv_path, cache_dir)
+
+    data = pd.read_csv(csv_path)
+    data.loc[0, "close"] = 1.0
+    data.to_csv(csv_path, index=False)
+    assert not cache_is_valid(csv_path, cache_dir)
+    assert open_klines(csv_path, cache_dir)["close"][0] == 1.0
+
+
+def test_replay_feed_and_model(csv_path, tmp_path):
+    klines = open_klines(csv_path, str(tmp_path / "cache"))
+    closes = np.asarray(klines["close"])
+    feed = KlineReplayFeed(klines, start=10, chunk_size=7)
+    assert feed.current_price == closes[10]
+    assert [feed.next_price() for _ in range(289)] == closes[11:].tolist()
+    assert feed.exhausted
+    with pytest.raises(IndexError):
+        feed.next_price()
+
+    model = TraderNetwork(num_nodes=5, seed=1, price_feed=csv_path, price_start=20)
+    for _ in range(50):
+        model.step()
+    np.testing.assert_array_equal(np.asarray(model.price_history), closes[20:71])
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from src.model.order_book import (
+    BUY,
+    SELL
+)
+from src.model.simulated_market import (
+    Simulated_Market
+)
+
+
+def auction_market(**params):
+    return Simulated_Market(**dict(dict(num_traders=4, initial_shares=100, clearing="auction", seed=1), **params))
+
+
+def test_auction_impact_is_symmetric():
+    up = auction_market(initial_cash=10000)
+    up.submit_orders(BUY, 0, 25, np.arange(4))
+    up.execute_orders()
+    down = auction_market(initial_cash=10000)
+    down.submit_orders(SELL, 0, 25, np.arange(4))
+    down.execute_orders()
+    assert up.price > 100 > down.price
+    assert up.price - 100 == pytest.approx(100 - down.price)
+    assert up.volume == down.volume == 100
+
+
+def test_auction_fills_are_capped_by_cash_and_shares():
+    market = auction_market(initial_cash=150, initial_shares=2)
+    filled = market.submit_orders([BUY, SELL, SELL], 0, [5, 1, 5], [0, 1, 2])
+    assert filled.all()
+    filled = market.execute_orders()
+    assert filled.tolist() == [1, 1, 2]
+    assert market.shares.tolist() == [3, 1, 0, 2]
+    np.testing.assert_allclose(market.cash, [150 - market.price, 150 + market.price, 150 + 2*market.price, 150])
+
+
+def test_auction_run_stays_finite_and_solvent():
+    market = auction_market(num_traders=50, initial_shares=10, seed=3)
+    for _ in range(300):
+        market.step()
+        assert np.isfinite(market.price) and market.price > 0
+        assert np.all(market.cash >= -1e-9)
+        assert np.all(market.shares >= 0)
+    assert len(market.order_batch) == 0
+
+
+def test_book_run_conserves_cash_and_shares():
+    market = Simulated_Market(num_traders=30, seed=4)
+    cash, shares = market.cash.sum(), market.shares.sum()
+    for _ in range(200):
+        market.step()
+        book = market.order_book
+        open_orders = np.flatnonzero(book.remaining[:book.count])
+        buy = book.side[open_orders] == BUY
+        held_cash = (book.ticks[open_orders][buy] * book.tick_size * book.remaining[open_orders][buy]).sum()
+        held_shares = book.remaining[open_orders][~buy].sum()
+        assert market.cash.sum() + held_cash == pytest.approx(cash)
+        assert market.shares.sum() + held_shares == shares
+        assert np.all(market.cash >= -1e-9) and np.all(market.shares >= 0)
+
+
+def test_unknown_clearing_mode():
+    with pytest.raises(ValueError):
+        Simulated_Market(clearing="dealer")
@@ -0,0 +1,56 @@
+import numpy as np
+from test_src.model.topology import (
+    CSRGraph,
+    gnp_random_graph,
+    pair_from_index,
+    sample_pairs
+)
+
+
+def check_simple_undirected(graph):
+    sources = np.repeat(np.arange(graph.num_nodes), graph.degree())
+    assert not np.any(sources == graph.indices)
+    keys = sources * graph.num_nodes + graph.indices
+    assert len(np.unique(keys)) == len(keys)
+    np.testing.assert_array_equal(np.sort(keys), np.sort(graph.indices * graph.num_nodes + sources))
+
+
+def test_pair_index_is_a_bijection():
+    n = 3000
+    i, j = pair_from_index(np.arange(n * (n - 1) // 2, dtype=np.int64))
+    assert np.all(j < i) and np.all(i < n)
+    np.testing.assert_array_equal(i * (i - 1) // 2 + j, np.arange(n * (n - 1) // 2))
+
+    # Near the largest pair indices of a million-node graph
+    n = 10**6
+    k = np.arange(n * (n - 1) // 2 - 1000, n * (n - 1) // 2, dtype=np.int64)
+    i, j = pair_from_index(k)
+    np.testing.assert_array_equal(i * (i - 1) // 2 + j, k)
+    assert np.all(i == n - 1)
+
+
+def test_sampled_pairs_are_sorted_and_binomial():
+    rng = np.random.default_rng(0)
+    num_pairs, prob = 10**7, 1e-3
+    pairs = sample_pairs(num_pairs, prob, rng)
+    assert np.all(np.diff(pairs) > 0)
+    assert pairs[0] >= 0 and pairs[-1] < num_pairs
+    assert abs(len(pairs) - num_pairs * prob) < 5 * np.sqrt(num_pairs * prob)
+    assert len(sample_pairs(10, 0.0, rng)) == 0
+    np.testing.assert_array_equal(sample_pairs(10, 1.0, rng), np.arange(10))
+
+
+def test_gnp_graph_is_simple_with_expected_degree():
+    n, avg_degree = 200_000, 6
+    graph = gnp_random_graph(n, avg_degree / (n - 1), np.random.default_rng(1))
+    check_simple_undirected(graph)
+    assert abs(graph.degree().mean() - avg_degree) < 0.05
+    assert all(np.all(np.diff(graph.neighbours(node)) > 0) for node in range(100))
+
+
+def test_csr_from_edges_round_trips():
+    graph = CSRGraph.from_edges(5, [0, 1, 3, 3, 2], [1, 2, 4, 3, 1], simple=True)
+    assert graph.num_edges == 3
+    sources, targets = graph.edges()
+    assert sorted(zip(sources.tolist(), targets.tolist())) == [(0, 1), (1, 2), (3, 4)]
+    assert sorted(graph.to_networkx().edges()) == [(0, 1), (1, 2), (3, 4)]
@@ -0,0 +1,136 @@
+import numpy as np
+import pytest
+from src.model.order_book import (
+    BUY,
+    SELL,
+    ID_MASK,
+    LimitOrderBook,
+    OrderBatch
+)
+
+
+def naive_match(orders):
+    # Reference matcher: walks both sides one order at a time in price-time priority.
+    # orders maps id -> [side, ticks, remaining]; remaining quantities are updated in place.
+    bids = sorted((i for i, o in orders.items() if o[0] == BUY and o[2] > 0), key=lambda i: (-orders[i][1], i))
+    asks = sorted((i for i, o in orders.items() if o[0] == SELL and o[2] > 0), key=lambda i: (orders[i][1], i))
+    fills = []
+    b = a = 0
+    while b < len(bids) and a < len(asks) and orders[bids[b]][1] >= orders[asks[a]][1]:
+        bid, ask = orders[bids[b]], orders[asks[a]]
+        quantity = min(bid[2], ask[2])
+        price = bid[1] if bids[b] < asks[a] else ask[1]
+        fills.append((bids[b], asks[a], price, quantity))
+        bid[2] -= quantity
+        ask[2] -= quantity
+        b += bid[2] == 0
+        a += ask[2] == 0
+    return fills
+
+
+def book_fills(fills):
+    return [(int(f["buy_id"]), int(f["sell_id"]), int(round(f["price"])), int(f["quantity"])) for f in fills]
+
+
+def resting_ids(book):
+    return {int(key) & ID_MASK for keys in book.books.values() for key in keys}
+
+
+def test_cancelled_best_bid_then_match():
+    book = LimitOrderBook(tick_size=1)
+    bid, = book.submit(BUY, 100, 1, 0)
+    book.submit(SELL, 101, 1, 1)
+    assert len(book.match()) == 0
+
+    book.cancel([bid])
+    book.submit(SELL, 99, 1, 2)
+    assert len(book.match()) == 0
+    assert book.best_bid is None
+    assert book.best_ask == 99
+    assert book.cancelled == 0
+
+
+def test_best_quotes_skip_cancelled_orders():
+    book = LimitOrderBook(tick_size=1)
+    first, second = book.submit([BUY, BUY], [101, 100], [1, 2], [0, 1])
+    book.match()
+    book.cancel([first])
+    assert book.best_bid == 100
+    assert book.cancelled == 0
+    assert resting_ids(book) == {int(second)}
+
+
+def test_cancelled_queued_orders_are_not_counted():
+    book = LimitOrderBook(tick_size=1)
+    ids = book.submit([BUY, SELL], [100, 105], [1, 1], [0, 1])
+    book.cancel(ids)
+    book.match()
+    assert len(book) == 0
+    assert book.cancelled == 0
+
+
+def test_match_against_naive_matcher_with_cancels():
+    rng = np.random.default_rng(1)
+    for _ in range(200):
+        book = LimitOrderBook(tick_size=1, capacity=4)
+        orders = {}
+        for _ in range(6):
+            num_orders = int(rng.integers(0, 30))
+            sides = rng.choice([BUY, SELL], num_orders)
+            ticks = rng.integers(95, 106, num_orders)
+            quantities = rng.integers(1, 5, num_orders)
+            ids = book.submit(sides, ticks, quantities, rng.integers(0, 5, num_orders))
+            for i, side, price, quantity in zip(ids.tolist(), sides.tolist(), ticks.tolist(), quantities.tolist()):
+                orders[i] = [side, price, quantity]
+
+            # Cancel resting and queued orders, favouring the best quotes
+            live = [i for i, o in orders.items() if o[2] > 0]
+            if live and rng.random() < 0.7:
+                live.sort(key=lambda i: -orders[i][1] * orders[i][0])
+                cancel = live[:int(rng.integers(1, 4))] + rng.choice(live, min(2, len(live)), replace=False).tolist()
+                open_quantity = book.cancel(cancel)
+                assert open_quantity[0] == orders[cancel[0]][2]
+                for i in cancel:
+                    orders[i][2] = 0
+
+            expected = naive_match(orders)
+            assert book_fills(book.match()) == expected
+            assert all(book.remaining[i] == o[2] for i, o in orders.items())
+            assert {i for i in resting_ids(book) if book.remaining[i] > 0} == {i for i, o in orders.items() if o[2] > 0}
+            assert book.cancelled == sum(book.remaining[i] == 0 for i in resting_ids(book))
+
+            bids = [o[1] for o in orders.values() if o[0] == BUY and o[2] > 0]
+            asks = [o[1] for o in orders.values() if o[0] == SELL and o[2] > 0]
+            assert book.best_bid == (max(bids) if bids else None)
+            assert book.best_ask == (min(asks) if asks else None)
+
+
+def test_depth_aggregates_live_orders():
+    book = LimitOrderBook(tick_size=1)
+    ids = book.submit([SELL, SELL, SELL, SELL], [101, 101, 102, 103], [1, 2, 3, 4], 0)
+    book.cancel(ids[3:])
+    book.match()
+    prices, quantities = book.depth(SELL, levels=5)
+    assert prices.tolist() == [101, 102]
+    assert quantities.tolist() == [3, 3]
+
+
+def test_submit_grows_and_rejects_exhausted_ids():
+    book = LimitOrderBook(capacity=1)
+    book.submit(np.full(10, BUY), np.full(10, 1.0), 1, 0)
+    assert book.capacity >= 10
+    book.count = ID_MASK
+    with pytest.raises(OverflowError):
+        book.submit(BUY, 1.0, 1, 0)
+
+
+def test_order_batch_grows():
+    batch = OrderBatch(capacity=2)
+    batch.add([BUY, SELL, BUY], [1, 2, 3], [0, 1, 2])
+    batch.add(SELL, 4, 3)
+    sides, quantities, traders = batch.orders()
+    assert sides.tolist() == [BUY, SELL, BUY, SELL]
+    assert quantities.tolist() == [1, 2, 3, 4]
+    assert traders.tolist() == [0, 1, 2, 3]
+    batch.clear()
+    assert len(batch) == 0
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+from test_src.model.price_buffer import (
+    PriceBuffer
+)
+
+
+@pytest.mark.parametrize("max_length", [None, 1, 5])
+def test_buffer_matches_list(max_length):
+    buffer = PriceBuffer(capacity=2, max_length=max_length)
+    reference = []
+    for price in np.linspace(1, 50, 50):
+        buffer.append(price)
+        reference.append(price)
+        visible = reference[-max_length:] if max_length else reference
+        np.testing.assert_array_equal(buffer.view(), visible)
+        assert len(buffer) == len(visible)
+        assert buffer.latest() == price
+        assert buffer[-1] == price
+        assert buffer.start == len(reference) - len(visible)
+        assert buffer.total == len(reference)
+    assert not buffer.view().flags.writeable
+    np.testing.assert_array_equal(np.asarray(buffer, dtype=np.float32), np.float32(visible))
+
+
+@pytest.mark.parametrize("max_length", [None, 4])
+def test_restore_continues_the_series(max_length):
+    buffer = PriceBuffer(np.arange(10.0), max_length=max_length)
+    restored = PriceBuffer(max_length=max_length)
+    restored.restore(np.asarray(buffer), buffer.total)
+    assert restored.start == buffer.start
+    for price in (10.0, 11.0):
+        buffer.append(price)
+        restored.append(price)
+    np.testing.assert_array_equal(restored.view(), buffer.view())
+    assert restored.total == buffer.total
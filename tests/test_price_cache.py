@@ -0,0 +1,29 @@
+import pandas as pd
+from src.data_gathering.price_cache import (
+    PriceDataCache
+)
+
+
+def write_klines(path, closes):
+    pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=len(closes), freq="h").astype(str),
+        "open": closes,
+        "close": closes,
+    }).to_csv(path, index=False)
+
+
+def test_csv_is_parsed_once_until_invalidated(tmp_path):
+    path = tmp_path / "klines.csv"
+    write_klines(path, [1.0, 2.0, 3.0])
+    cache = PriceDataCache()
+
+    first = cache.get(str(path))
+    assert first.index.name == "date"
+    assert first["close"].tolist() == [1.0, 2.0, 3.0]
+
+    write_klines(path, [4.0])
+    assert cache.get(str(path)) is first
+    assert cache.window(1, 3, str(path))["close"].tolist() == [2.0, 3.0]
+
+    cache.invalidate(str(path))
+    assert cache.get(str(path))["close"].tolist() == [4.0]
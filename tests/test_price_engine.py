@@ -0,0 +1,36 @@
+import numpy as np
+from test_src.model.price_engine import (
+    GBMPriceEngine
+)
+
+
+def test_chunk_size_does_not_change_the_path():
+    small = GBMPriceEngine(100, 0.3, rng=np.random.default_rng(1), chunk_size=7)
+    large = GBMPriceEngine(100, 0.3, rng=np.random.default_rng(1), chunk_size=1000)
+    np.testing.assert_allclose([small.next_price() for _ in range(100)], large.paths(100)[0, 1:], rtol=1e-12)
+
+
+def test_path_follows_gbm_returns():
+    volatility, drift, dt = 0.2, 0.1, 1 / 252
+    engine = GBMPriceEngine(50, volatility, drift, rng=np.random.default_rng(3), chunk_size=16)
+    path = engine.paths(40)[0]
+    shocks = np.random.default_rng(3).normal(0, np.sqrt(dt), 40)
+    expected = 50 * np.exp(np.cumsum((drift - 0.5 * volatility ** 2) * dt + volatility * shocks))
+    np.testing.assert_allclose(path, np.r_[50, expected], rtol=1e-12)
+
+
+def test_paths_and_next_prices_continue_each_other():
+    engine = GBMPriceEngine(100, 0.3, rng=np.random.default_rng(5), chunk_size=9, num_paths=3)
+    reference = GBMPriceEngine(100, 0.3, rng=np.random.default_rng(5), chunk_size=9, num_paths=3)
+    first = engine.paths(20)
+    steps = np.stack([reference.next_prices().copy() for _ in range(25)], axis=1)
+    np.testing.assert_array_equal(first[:, 1:], steps[:, :20])
+    second = engine.paths(5)
+    np.testing.assert_array_equal(second[:, 0], first[:, -1])
+    np.testing.assert_array_equal(second[:, 1:], steps[:, 20:])
+
+
+def test_one_generator_per_path_is_reproducible_alone():
+    batch = GBMPriceEngine(100, 0.3, rng=[np.random.default_rng(seed) for seed in (1, 2)], chunk_size=8)
+    single = GBMPriceEngine(100, 0.3, rng=[np.random.default_rng(2)], chunk_size=8)
+    np.testing.assert_array_equal(batch.paths(30)[1], single.paths(30)[0])
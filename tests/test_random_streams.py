@@ -0,0 +1,39 @@
+import numpy as np
+from test_src.model.random_streams import (
+    BLOCK_BYTES,
+    RandomStreams
+)
+
+
+def test_draws_do_not_depend_on_access_order():
+    ordered = RandomStreams(3, num_agents=5, block_bytes=8 * 5 * 4)
+    jumping = RandomStreams(3, num_agents=5, block_bytes=8 * 5 * 4)
+    steps = list(range(12))
+    expected = {step: ordered.uniforms("sharing", step).copy() for step in steps}
+    for step in reversed(steps):
+        np.testing.assert_array_equal(jumping.uniforms("sharing", step), expected[step])
+
+
+def test_streams_are_distinct_and_seeded():
+    streams = RandomStreams(3, num_agents=100)
+    strategy, sharing = streams.uniforms("strategy", 0), streams.uniforms("sharing", 0)
+    assert not np.array_equal(strategy, sharing)
+    assert np.all((strategy >= 0) & (strategy < 1))
+    np.testing.assert_array_equal(RandomStreams(3, num_agents=100).uniforms("strategy", 0), strategy)
+    assert not np.array_equal(RandomStreams(4, num_agents=100).uniforms("strategy", 0), strategy)
+
+
+def test_block_size_follows_byte_budget():
+    assert RandomStreams(0, num_agents=1000).block_steps == BLOCK_BYTES // 8000
+    assert RandomStreams(0, num_agents=10**7).block_steps == 1
+    streams = RandomStreams(0, num_agents=10**6, block_bytes=16 * 10**6)
+    streams.start_step(5)
+    assert streams.blocks["strategy"][1].nbytes <= 16 * 10**6
+
+
+def test_current_step_lookups():
+    streams = RandomStreams(1, num_agents=4)
+    streams.start_step(2)
+    values = streams.uniforms("strategy", 2)
+    assert [streams.uniform("strategy", i) for i in range(4)] == values.tolist()
+    assert [streams.boolean("strategy", i) for i in range(4)] == (values < 0.5).tolist()
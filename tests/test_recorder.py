@@ -0,0 +1,80 @@
+import os
+import weakref
+import numpy as np
+import pytest
+from test_src.model.model import (
+    TraderNetwork
+)
+from test_src.model import (
+    recorder as recorder_module
+)
+from test_src.model.recorder import (
+    AgentRecorder
+)
+
+
+@pytest.mark.parametrize("on_disk", [False, True])
+def test_recorder_grows_and_reads_back(tmp_path, on_disk):
+    path = str(tmp_path / "history") if on_disk else None
+    recorder = AgentRecorder(3, capacity=2, every=2, dtype=np.float32, path=path)
+    rows = []
+    for step in range(11):
+        capital = np.array([step, step + 0.5, -step], dtype=float)
+        if recorder.record(step, capital, capital / 10, capital > 0):
+            rows.append((step, capital))
+
+    assert len(recorder) == 6
+    assert recorder.capacity >= 6
+    np.testing.assert_array_equal(recorder.recorded_steps, [step for step, _ in rows])
+    np.testing.assert_array_equal(recorder["capital"], np.float32([capital for _, capital in rows]))
+    assert recorder["capital"].dtype == np.float32
+    assert recorder["state"].dtype == np.int8
+    np.testing.assert_array_equal(recorder.agent("capital", 1), np.float32([capital[1] for _, capital in rows]))
+    steps, values = recorder.between("win_rate", 3, 8)
+    assert steps.tolist() == [4, 6]
+    np.testing.assert_array_equal(values, np.float32([rows[2][1] / 10, rows[3][1] / 10]))
+
+    if on_disk:
+        recorder.flush()
+        loaded = AgentRecorder.load(path)
+        np.testing.assert_array_equal(loaded["steps"], recorder.recorded_steps)
+        np.testing.assert_array_equal(loaded["capital"], recorder["capital"])
+
+
+def test_growing_on_disk_releases_the_maps_before_replacing(tmp_path, monkeypatch):
+    # Windows refuses to replace a mapped file, so no map of either file may be alive at the swap
+    path = str(tmp_path / "history")
+    recorder = AgentRecorder(2, capacity=2, path=path)
+    for step in range(2):
+        recorder.record(step, [step, step], [0, 0], [1, 1])
+
+    maps = {recorder.field_path(field): weakref.ref(values) for field, values in recorder.data.items()}
+    allocate, replace = recorder.allocate, os.replace
+    def tracked_allocate(field, capacity, path=None):
+        values = allocate(field, capacity, path)
+        maps[path] = weakref.ref(values)
+        return values
+    def checked_replace(source, target):
+        assert maps[source]() is None and maps[target]() is None
+        replace(source, target)
+    monkeypatch.setattr(recorder, "allocate", tracked_allocate)
+    monkeypatch.setattr(recorder_module.os, "replace", checked_replace)
+    recorder.record(2, [2, 2], [0, 0], [1, 1])
+    monkeypatch.undo()
+
+    assert sorted(os.listdir(path)) == ["capital.npy", "state.npy", "win_rate.npy"]
+    assert isinstance(recorder.data["capital"], np.memmap)
+    np.testing.assert_array_equal(recorder["capital"], [[0, 0], [1, 1], [2, 2]])
+
+
+def test_model_records_agent_history():
+    model = TraderNetwork(num_nodes=8, seed=2, volatility=0.5, record_every=5, record_capacity=2)
+    snapshots = {0: model.agent_capital()}
+    for _ in range(30):
+        model.step()
+        snapshots[model.market_date] = model.agent_capital()
+
+    recorder = model.recorder
+    assert recorder.recorded_steps.tolist() == list(range(0, 31, 5))
+    for row, step in enumerate(recorder.recorded_steps.tolist()):
+        np.testing.assert_array_equal(recorder["capital"][row], snapshots[step])
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+from test_src.model.event_log import (
+    EventType
+)
+from test_src.model.model import (
+    TraderNetwork
+)
+from test_src.model.redistribution import (
+    best_neighbours,
+    csr_from_neighbours,
+    redistribute_simultaneous
+)
+
+
+def random_neighbours(rng, num_agents):
+    return [sorted(rng.choice(num_agents, int(rng.integers(0, 5)), replace=False).tolist()) for _ in range(num_agents)]
+
+
+def naive_best(neighbours, win_rate):
+    # As TraderAgent.try_to_share_capital: the first neighbour with the highest positive win rate
+    best = []
+    for nbrs in neighbours:
+        choice, highest = -1, 0
+        for j in nbrs:
+            if win_rate[j] > highest:
+                choice, highest = j, win_rate[j]
+        best.append(choice)
+    return best
+
+
+def test_best_neighbours_matches_loop():
+    rng = np.random.default_rng(0)
+    for _ in range(20):
+        neighbours = random_neighbours(rng, 30)
+        win_rate = rng.integers(0, 3, 30).astype(float)  # Small values so ties are common
+        indptr, indices = csr_from_neighbours(neighbours)
+        assert best_neighbours(indptr, indices, win_rate[indices]).tolist() == naive_best(neighbours, win_rate)
+
+
+def test_simultaneous_transfers_use_capital_before_the_step():
+    rng = np.random.default_rng(1)
+    capital = rng.uniform(0, 3, 50)
+    donors = np.flatnonzero(rng.random(50) < 0.5)
+    recipients = rng.integers(0, 50, len(donors))
+
+    expected = capital.copy()
+    for donor, recipient in zip(donors, recipients):
+        amount = capital[donor] if capital[donor] <= 1 else capital[donor] * 0.01
+        expected[donor] -= amount
+        expected[recipient] += amount
+
+    total = capital.sum()
+    amounts = redistribute_simultaneous(capital, donors, recipients)
+    np.testing.assert_allclose(capital, expected, rtol=1e-12, atol=1e-12)
+    assert np.isclose(capital.sum(), total, rtol=1e-12)
+    assert len(amounts) == len(donors)
+
+
+@pytest.mark.parametrize("seed", [1, 4])
+def test_sequential_transfers_match_agent_engine(seed):
+    # redistribute_sequential against the real TraderAgent.try_to_share_capital path: both engines
+    # log the same transfers (donor, recipient, amount, donor capital) in the same order
+    runs = []
+    for engine in ("agents", "vectorised"):
+        model = TraderNetwork(num_nodes=40, seed=seed, volatility=0.5, generocity_rate=0.8, event_level="info", engine=engine, update="sequential")
+        for _ in range(100):
+            model.step()
+        events = model.events.records()
+        runs.append(events[events["type"] == EventType.TRANSFER.value])
+    assert len(runs[0]) > 100
+    np.testing.assert_array_equal(runs[1], runs[0])
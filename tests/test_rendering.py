@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("matplotlib")
+from test_src.app.rendering import (
+    LayoutCache,
+    SeriesBuffer,
+    minmax_downsample,
+    smooth_layout
+)
+from test_src.model.topology import (
+    CSRGraph
+)
+
+
+def test_series_always_ends_at_latest_sample():
+    buffer = SeriesBuffer(num_agents=2, capacity=8)
+    for step in range(100):
+        buffer.append(step, [step, -step])
+        steps, values = buffer.series()
+        assert steps[-1] == step
+        assert values[:, -1].tolist() == [step, -step]
+        assert len(steps) <= 9
+        assert steps[0] == 0
+        assert np.all(np.diff(steps) > 0)
+    assert buffer.stride > 1
+
+
+def test_kept_samples_are_evenly_strided():
+    buffer = SeriesBuffer(num_agents=1, capacity=8)
+    for step in range(40):
+        buffer.append(step, [step])
+    steps, _ = buffer.series()
+    kept = steps[:buffer.length]
+    assert np.all(np.diff(kept) == buffer.stride)
+
+
+def test_minmax_downsample_keeps_envelope():
+    rng = np.random.default_rng(0)
+    y = rng.normal(size=(3, 1001))
+    x = np.arange(1001.0)
+    down_x, down_y = minmax_downsample(x, y, 50)
+    assert down_y.shape[1] <= 101
+    np.testing.assert_array_equal(down_y.max(axis=1), y.max(axis=1))
+    np.testing.assert_array_equal(down_y.min(axis=1), y.min(axis=1))
+    assert np.all(np.diff(down_x, axis=1) >= 0)
+    assert np.all(down_x[:, -1] == 1000)
+
+
+def ring(num_nodes):
+    sources = np.arange(num_nodes)
+    return CSRGraph.from_edges(num_nodes, sources, (sources + 1) % num_nodes, simple=True)
+
+
+def test_smooth_layout_is_deterministic_and_bounded():
+    graph = ring(1000)
+    sources, targets = graph.edges()
+    positions = smooth_layout(graph.num_nodes, sources, targets, seed=4)
+    assert positions.shape == (1000, 2)
+    assert np.abs(positions).max() == pytest.approx(1)
+    np.testing.assert_array_equal(positions, smooth_layout(graph.num_nodes, sources, targets, seed=4))
+    # Neighbours end up closer together than random pairs of nodes
+    neighbour_distance = np.linalg.norm(positions[sources] - positions[targets], axis=1).mean()
+    random_distance = np.linalg.norm(positions - positions[np.random.default_rng(0).permutation(1000)], axis=1).mean()
+    assert neighbour_distance < random_distance
+
+
+@pytest.mark.parametrize("num_nodes", [20, 600])
+def test_layout_cache_computes_each_topology_once(num_nodes):
+    cache = LayoutCache(spring_limit=500)
+    graph = ring(num_nodes)
+    positions = cache.layout(graph)
+    assert positions.shape == (num_nodes, 2)
+    assert cache.layout(graph) is positions
+    assert cache.layout(ring(num_nodes)) is not positions
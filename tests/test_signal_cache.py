@@ -0,0 +1,31 @@
+from test_src.agent.trader import (
+    trader_strategy
+)
+from test_src.model.model import (
+    TraderNetwork
+)
+from test_src.model.signal_cache import (
+    freeze_params
+)
+
+
+def test_cached_signals_match_direct_strategy():
+    params = {"period": 10, "lower_threshold": 40, "upper_threshold": 60}
+    model = TraderNetwork(num_nodes=25, seed=1, volatility=0.4, strategy_type="rsi", strategy_params=params)
+    for _ in range(60):
+        model.step()
+        model.signal_cache.start_step(model.market_date)
+        expected = trader_strategy(list(model.price_history), "rsi", **params)
+        assert model.signal_cache.get("rsi", dict(params)) == expected
+
+    # The signal is computed once per step and shared by every agent of the group
+    stats = model.signal_cache.stats()
+    assert stats["groups"] == 1
+    assert stats["misses"] <= 61
+    assert stats["hits"] > stats["misses"]
+
+
+def test_freeze_params_is_order_independent():
+    assert freeze_params({"b": [1, 2], "a": {"y": 1, "x": 2}}) == freeze_params({"a": {"x": 2, "y": 1}, "b": [1, 2]})
+    assert freeze_params(None) == ()
+    hash(freeze_params({"levels": [1, 2]}))
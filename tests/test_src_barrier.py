@@ -0,0 +1,26 @@
+import numpy as np
+from src.model.barrier import (
+    BarrierIndex
+)
+
+
+def linear_first_hit(prices, up, down, start):
+    for index in range(start, len(prices)):
+        if prices[index] >= up:
+            return index, True
+        if prices[index] <= down:
+            return index, False
+    return -1, False
+
+
+def test_first_hit_matches_linear_scan():
+    rng = np.random.default_rng(0)
+    for length in (1, 2, 7, 64, 100):
+        prices = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, length)))
+        index = BarrierIndex(prices)
+        assert len(index) == length
+        np.testing.assert_array_equal(index.prices, prices)
+        for _ in range(50):
+            start = int(rng.integers(0, length + 1))
+            up, down = prices.mean() * (1 + rng.normal(0, 0.02, 2))
+            assert index.first_hit(up, down, start) == linear_first_hit(prices, up, down, start)
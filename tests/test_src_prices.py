@@ -0,0 +1,19 @@
+import numpy as np
+from src.model.model import (
+    generate_prices
+)
+
+
+def test_generate_prices_compounds_gbm_returns():
+    volatility, drift, dt = 0.3, 0.05, 1 / 252
+    prices = generate_prices(100, 50, volatility, drift, rng=np.random.default_rng(7))
+
+    shocks = np.random.default_rng(7).normal(0, np.sqrt(dt), 50)
+    expected = [100.0]
+    for shock in shocks:
+        expected.append(expected[-1] * np.exp((drift - 0.5 * volatility ** 2) * dt + volatility * shock))
+    np.testing.assert_allclose(prices, expected, rtol=1e-12)
+
+
+def test_generate_prices_without_steps():
+    np.testing.assert_array_equal(generate_prices(100, 0, 0.1), [100.0])
@@ -0,0 +1,44 @@
+import pandas as pd
+from test_src.runner.sweep import (
+    expand_grid,
+    make_tasks,
+    random_design,
+    run_sweep,
+    run_task,
+    tasks_from_config
+)
+
+
+def test_designs():
+    assert expand_grid({"a": [1, 2], "b": ["x"]}) == [{"a": 1, "b": "x"}, {"a": 2, "b": "x"}]
+    design = random_design({"volatility": (0.0, 0.1), "num_nodes": {"low": 2, "high": 4}, "engine": ["agents", "vectorised"]}, 20, seed=3)
+    assert design == random_design({"volatility": (0.0, 0.1), "num_nodes": {"low": 2, "high": 4}, "engine": ["agents", "vectorised"]}, 20, seed=3)
+    assert all(0.0 <= point["volatility"] < 0.1 for point in design)
+    assert {point["num_nodes"] for point in design} <= {2, 3, 4}
+    assert {point["engine"] for point in design} <= {"agents", "vectorised"}
+
+
+def test_tasks_get_distinct_reproducible_seeds():
+    tasks = make_tasks([{"num_nodes": 3}, {"num_nodes": 4, "seed": 9}], steps=5, base_seed=1, replicates=2)
+    assert [task["task_id"] for task in tasks] == [0, 1, 2, 3]
+    assert tasks[0]["params"]["seed"] != tasks[1]["params"]["seed"]
+    assert tasks == make_tasks([{"num_nodes": 3}, {"num_nodes": 4, "seed": 9}], steps=5, base_seed=1, replicates=2)
+
+    # An explicit seed is kept for a single run and derives one distinct seed per replicate otherwise
+    assert make_tasks([{"seed": 9}], steps=5)[0]["params"]["seed"] == 9
+    explicit = make_tasks([{"seed": 1}, {"seed": 2}], steps=5, replicates=3)
+    seeds = [task["params"]["seed"] for task in explicit]
+    assert len(set(seeds)) == 6
+    assert seeds == [task["params"]["seed"] for task in make_tasks([{"seed": 1}, {"seed": 2}], steps=5, base_seed=7, replicates=3)]
+
+
+def test_sweep_output_matches_in_process_runs(tmp_path):
+    tasks = tasks_from_config({"grid": {"num_nodes": [3, 5], "volatility": [0.2]}, "steps": 8, "replicates": 2})
+    output = tmp_path / "sweep.csv"
+    run_sweep(tasks, str(output), max_workers=2, progress=False)
+    expected = pd.concat([run_task(task)[0] for task in tasks], ignore_index=True)
+
+    results = pd.read_csv(output).sort_values(["task_id", "agent_id", "variable", "step"], ignore_index=True)
+    expected = expected.sort_values(["task_id", "agent_id", "variable", "step"], ignore_index=True)
+    assert sorted(results["task_id"].unique()) == [0, 1, 2, 3]
+    pd.testing.assert_frame_equal(results, expected, check_dtype=False)
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from test_src.model.model import (
+    TraderNetwork
+)
+from test_src.model.topology import (
+    TOPOLOGIES,
+    build_topology,
+    configuration_graph,
+    stochastic_block_graph,
+    watts_strogatz_graph
+)
+
+
+def is_simple(graph):
+    sources = np.repeat(np.arange(graph.num_nodes), graph.degree())
+    keys = sources * graph.num_nodes + graph.indices
+    symmetric = np.array_equal(np.sort(keys), np.sort(graph.indices * graph.num_nodes + sources))
+    return symmetric and not np.any(sources == graph.indices) and len(np.unique(keys)) == len(keys)
+
+
+@pytest.mark.parametrize("name", sorted(TOPOLOGIES))
+def test_topologies_are_simple_with_the_requested_degree(name):
+    graph = build_topology(name, 20_000, 8, np.random.default_rng(3))
+    assert graph.num_nodes == 20_000
+    assert is_simple(graph)
+    assert abs(graph.degree().mean() - 8) < 0.5
+
+    same = build_topology(name, 20_000, 8, np.random.default_rng(3))
+    np.testing.assert_array_equal(same.indices, graph.indices)
+
+
+def test_unknown_topology():
+    with pytest.raises(ValueError):
+        build_topology("lattice", 10, 2)
+
+
+def test_watts_strogatz_without_rewiring_is_a_ring_lattice():
+    graph = watts_strogatz_graph(10, 4, rewire_prob=0.0, rng=np.random.default_rng(0))
+    assert graph.neighbours(0).tolist() == [1, 2, 8, 9]
+    assert np.all(graph.degree() == 4)
+
+
+def test_stochastic_blocks_follow_their_probabilities():
+    graph = stochastic_block_graph([500, 500], [[0.02, 0.0], [0.0, 0.02]], np.random.default_rng(1))
+    sources, targets = graph.edges()
+    assert np.all((sources < 500) == (targets < 500))
+    assert abs(graph.num_edges / (2 * 500 * 499 / 2) - 0.02) < 0.002
+
+
+def test_configuration_graph_keeps_degrees_up_to_erased_edges():
+    degrees = np.random.default_rng(2).integers(1, 6, 1000)
+    degrees[0] += degrees.sum() % 2
+    graph = configuration_graph(degrees, np.random.default_rng(2))
+    assert is_simple(graph)
+    assert np.all(graph.degree() <= degrees)
+    assert graph.degree().sum() > 0.95 * degrees.sum()
+    with pytest.raises(ValueError):
+        configuration_graph([1, 2], np.random.default_rng(0))
+
+
+def test_model_uses_the_topology_parameters():
+    model = TraderNetwork(num_nodes=12, topology="watts_strogatz", topology_params={"k": 4, "rewire_prob": 0.0}, seed=1)
+    assert np.all(model.network.csr.degree() == 4)
+    assert len(model.agents) == 12
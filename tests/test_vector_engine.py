@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from test_src.model.model import (
+    TraderNetwork
+)
+from test_src.model.vector_engine import (
+    VectorisedEngine
+)
+
+
+def run(model, steps):
+    for _ in range(steps):
+        model.step()
+    return model
+
+
+@pytest.mark.parametrize("strategy_type", ["sma", "rsi", "bollinger"])
+def test_vectorised_engine_matches_agent_engine(strategy_type):
+    # Without sharing and with a deterministic strategy the update order cannot matter,
+    # so both engines must produce exactly the same run
+    params = dict(num_nodes=30, seed=5, volatility=0.5, strategy_type=strategy_type, generocity_rate=0.0)
+    agents = run(TraderNetwork(**params), 300)
+    vectorised = run(TraderNetwork(engine="vectorised", **params), 300)
+
+    assert not np.allclose(agents.agent_capital(), 100)
+    np.testing.assert_array_equal(vectorised.agent_capital(), agents.agent_capital())
+    np.testing.assert_array_equal(vectorised.agent_win_rate(), agents.agent_win_rate())
+    assert vectorised.current_price == agents.current_price
+    assert vectorised.datacollector.get_model_vars_dataframe().equals(agents.datacollector.get_model_vars_dataframe())
+
+
+@pytest.mark.parametrize("seed", [0, 3, 7])
+@pytest.mark.parametrize("strategy_type", ["random", "rsi"])
+def test_sequential_engine_matches_agent_engine_with_sharing(seed, strategy_type):
+    # With sharing on (and the random strategy) both engines read the model's random streams and
+    # the sequential engine follows the same shuffle as shuffle_do, so the runs are identical
+    params = dict(num_nodes=50, seed=seed, volatility=0.5, strategy_type=strategy_type)
+    agents = run(TraderNetwork(**params), 150)
+    vectorised = run(TraderNetwork(engine="vectorised", update="sequential", **params), 150)
+
+    np.testing.assert_array_equal(vectorised.agent_capital(), agents.agent_capital())
+    np.testing.assert_array_equal(vectorised.agent_win_rate(), agents.agent_win_rate())
+    np.testing.assert_array_equal(vectorised.agent_states(), agents.agent_states())
+    assert vectorised.datacollector.get_model_vars_dataframe().equals(agents.datacollector.get_model_vars_dataframe())
+
+
+@pytest.mark.parametrize("update", ["simultaneous", "sequential"])
+def test_vectorised_state_follows_capital(update):
+    model = TraderNetwork(num_nodes=200, seed=2, volatility=0.5, engine="vectorised", update=update)
+    for _ in range(20):
+        state_before = model.engine.state.copy()
+        run(model, 1)
+        engine = model.engine
+        # Bankrupt agents never come back, and an agent's state matches its capital once it acted
+        assert not np.any((state_before == 0) & (engine.state == 1))
+        acted = state_before == 1
+        np.testing.assert_array_equal(engine.state[acted], engine.capital[acted] > 0)
+        counts = model.datacollector.get_model_vars_dataframe().iloc[-1]
+        assert counts["With_Capital"] == np.count_nonzero(engine.state == 1)
+        assert counts["Zero_Capital"] == np.count_nonzero(engine.state == 0)
+
+
+def test_unknown_update_mode():
+    with pytest.raises(ValueError):
+        VectorisedEngine(np.array([0, 0]), np.array([], dtype=np.int64), 100, 0, 0.5, update="parallel")